@@ -1,2 +1,2 @@
 DATASETURL = 'https://raw.githubusercontent.com/Nixtla/transfer-learning-time-series/main/datasets/electricity-short.csv'
-DIRSAVEPLOTPATH = r"C:\Users\yotam\SDatta\timegpt\electricity_example\save_plot"
\ No newline at end of file
+DIRSAVEPLOTPATH = "electircity_example/save_plot"
\ No newline at end of file
@@ -2,6 +2,9 @@ import pandas as pd
 from nixtla import NixtlaClient
 from config import DATASETURL, DIRSAVEPLOTPATH
 from utils import load_environment_variables, create_directory, load_and_prepare_data, split_data, plot_and_save_forecast
+from more_examples.tracing import Tracer
+from more_examples.panel_index import PanelIndex
+from more_examples.payload_shaping import TrimmedClient
 
 
 def forecast_with_nixtla(client: NixtlaClient, train_df: pd.DataFrame, horizon: int = 24) -> pd.DataFrame:
@@ -28,37 +31,47 @@ def merge_forecast_with_test(fcst_df: pd.DataFrame, test_df: pd.DataFrame) -> pd
     Returns:
         DataFrame that combines both test data and forecasted data.
     """
-    test_df = test_df.reset_index(drop=True)
-    fcst_df = fcst_df.reset_index(drop=True)
-    test_df["TimeGPT"] = fcst_df["TimeGPT"]
-    return test_df
+    # Align by (unique_id, ds) rather than by position
+    return PanelIndex(fcst_df).join(test_df.reset_index(drop=True), ["TimeGPT"])
 
 
 def main() -> None:
     """Main function to execute the workflow."""
+    tracer = Tracer('electricity')
     # Load API Key and set up paths
     api_key = load_environment_variables()
-    nixtla_client = NixtlaClient(api_key=api_key)
+    nixtla_client = TrimmedClient(tracer.client(NixtlaClient(api_key=api_key)))
 
     create_directory(DIRSAVEPLOTPATH)
 
     # Load and prepare data
-    df = load_and_prepare_data(DATASETURL)
+    with tracer.stage('load_data') as stage:
+        df = load_and_prepare_data(DATASETURL)
+        stage.rows_out = df
 
     # Split the data into train and test sets
-    train_df, test_df = split_data(df)
+    with tracer.stage('split_data', rows_in=df) as stage:
+        train_df, test_df = split_data(df)
+        stage.rows_out = len(train_df) + len(test_df)
     print(f"Training set: {train_df.shape[0]} samples")
     print(f"Test set: {test_df.shape[0]} samples")
 
     # Perform forecasting
-    fcst_df = forecast_with_nixtla(nixtla_client, train_df, horizon=24)
+    with tracer.stage('forecast', rows_in=train_df) as stage:
+        fcst_df = forecast_with_nixtla(nixtla_client, train_df, horizon=24)
+        stage.rows_out = fcst_df
 
     # Merge forecast with test set
-    test_df = merge_forecast_with_test(fcst_df, test_df)
+    with tracer.stage('merge_forecast_with_test', rows_in=test_df) as stage:
+        test_df = merge_forecast_with_test(fcst_df, test_df)
+        stage.rows_out = test_df
     print(f"Final test_df: {test_df.head()}")
 
     # Plot and save forecast
-    plot_and_save_forecast(test_df, DIRSAVEPLOTPATH)
+    with tracer.stage('plot', rows_in=test_df):
+        plot_and_save_forecast(test_df, DIRSAVEPLOTPATH)
+
+    print(f"Payload shaping: {nixtla_client.stats()}")
 
 
 if __name__ == "__main__":
@@ -2,7 +2,8 @@ import os
 import pandas as pd
 from typing import Tuple
 from dotenv import load_dotenv
-import matplotlib.pyplot as plt
+from more_examples.plotting import render_charts
+from more_examples.panel_index import PanelIndex
 
 def load_environment_variables() -> str:
     """Load environment variables from a .env file."""
@@ -25,29 +26,18 @@ def split_data(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
     Returns:
         Tuple containing the training dataframe and the testing dataframe.
     """
-    train_dfs, test_dfs = [], []
-    for _, group in df.groupby('unique_id'):
-        train, test = group[:-24], group[-24:]
-        train_dfs.append(train)
-        test_dfs.append(test)
-    return pd.concat(train_dfs), pd.concat(test_dfs)
+    # The last 24 rows of every series, from the per-series offsets in one pass
+    return PanelIndex(df).tail_split(24)
 
 def plot_and_save_forecast(test_df: pd.DataFrame, save_dir: str) -> None:
     """Plot and save the actual vs forecasted values for each unique_id.
 
     Args:
-        test_df: DataFrame containing the test data and forecasted values.
-        save_dir: Directory path where plots should be saved.
+        test_df: Test data with ``unique_id``, ``ds``, the actual ``y`` and the ``TimeGPT`` forecast.
+        save_dir: Directory path where plots should be saved, one ``forecast_<unique_id>.png`` per series.
     """
-    for unique_id in test_df['unique_id'].unique():
-        plt.figure(figsize=(10, 6))
-        unique_data = test_df[test_df['unique_id'] == unique_id]
-        plt.plot(unique_data['ds'], unique_data['y'], label='Actual data')
-        plt.plot(unique_data['ds'], unique_data['TimeGPT'], label='Forecast')
-        plt.xlabel('Date')
-        plt.ylabel('Value')
-        plt.title(f'Forecast for the next 24 hours for {unique_id}')
-        plt.legend()
-        save_path = os.path.join(save_dir, f'forecast_{unique_id}.png')
-        plt.savefig(save_path)
-        plt.show()
\ No newline at end of file
+    render_charts(
+        test_df, save_dir,
+        lines={'y': 'Actual data', 'TimeGPT': 'Forecast'},
+        title_template='Forecast for the next 24 hours for {unique_id}',
+    )
\ No newline at end of file
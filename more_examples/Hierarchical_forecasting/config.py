@@ -2,3 +2,8 @@ DATASETTRAINAGGPATH = 'dataset\after_preprocess\train_agg.csv'
 DATASETTESTPATH = 'dataset\after_preprocess\test.csv'
 DATASETSDFPATH = 'dataset\after_preprocess\train_sdf.csv'
 TAGSPICKELPATH = 'before_preprocess\tags.pkl'
+# Optional bottom-level training data; when set, levels, S and tags are built from it in memory
+DATASETTRAINBOTTOMPATH = None
+HIERARCHYCOLUMNS = []
+# Tidy evaluation report per series, level and overall; .parquet or .csv
+EVALUATIONREPORTPATH = 'more_examples/Hierarchical_forecasting/save_results/evaluation_report.csv'
@@ -0,0 +1,124 @@
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from more_examples.metrics import mape, smape, absolute_error, squared_error
+from more_examples.panel_index import PanelIndex
+from more_examples.pipeline import export_csv
+
+# Per-element error of every metric; 'rmse' is averaged as squared error and rooted at the end
+_KERNELS = {'mape': mape, 'smape': smape, 'mae': absolute_error, 'rmse': squared_error}
+SCOPES = ['series', 'level', 'overall']
+
+
+def group_matrix(codes: np.ndarray, n_groups: int) -> sparse.csr_matrix:
+    """Sparse (groups x rows) indicator matrix, so ``G @ values`` sums the rows of every group."""
+    return sparse.csr_matrix((np.ones(len(codes)), (codes, np.arange(len(codes)))), shape=(n_groups, len(codes)))
+
+
+def level_matrix(tags: Dict[str, np.ndarray], series_ids: pd.Index) -> Tuple[sparse.csr_matrix, List[str], np.ndarray]:
+    """Sparse (levels x series) membership matrix built from the hierarchy ``tags``.
+
+    Returns:
+        Tuple of (matrix, level names, level code of every series with -1 where it is in no level).
+    """
+    level_names = list(tags)
+    series_level = np.full(len(series_ids), -1)
+    rows, cols = [], []
+    for level_code, level in enumerate(level_names):
+        positions = series_ids.get_indexer(pd.Index(np.asarray(tags[level])).astype(str))
+        positions = positions[positions >= 0]
+        rows.append(np.full(len(positions), level_code))
+        cols.append(positions)
+        unassigned = positions[series_level[positions] < 0]
+        series_level[unassigned] = level_code
+    rows, cols = (np.concatenate(parts) if parts else np.zeros(0, dtype=int) for parts in (rows, cols))
+    matrix = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(len(level_names), len(series_ids)))
+    return matrix, level_names, series_level
+
+
+def evaluation_report(Y_rec_df: pd.DataFrame, df_test: pd.DataFrame, tags: Optional[Dict[str, np.ndarray]] = None,
+                      models: Optional[List[str]] = None, metrics: Sequence[str] = ('mape',),
+                      exclude_zero_forecasts: bool = True) -> pd.DataFrame:
+    """Errors of every model per series, per hierarchy level and overall, as one tidy table.
+
+    Forecasts are matched to actuals on (``unique_id``, ``ds``), or on ``unique_id`` alone
+    when ``df_test`` has no ``ds``. The errors of all models and metrics form one 2-D
+    array, and a single sparse product per scope sums them per series, per level (from
+    ``tags``) and overall. Level and overall values pool the rows of their series, so
+    they are row-weighted means. Rows without an actual value are left out, and so are
+    rows where a model forecasts exactly 0 when ``exclude_zero_forecasts`` is set.
+
+    Args:
+        Y_rec_df: Reconciled forecasts with ``unique_id``, ``ds`` and one column per model.
+        df_test: Actual values with ``unique_id``, ``y`` and usually ``ds``.
+        tags: Hierarchy level name -> ids of its series; without it only series and overall are reported.
+        models: Model columns to evaluate, default all but ``unique_id``, ``ds``, ``y`` and ``cutoff``.
+        metrics: Any of ``'mape'``, ``'smape'``, ``'mae'`` and ``'rmse'``.
+        exclude_zero_forecasts: Leave out rows where a model forecasts exactly 0.
+
+    Returns:
+        DataFrame with columns ``scope`` (series, level or overall), ``level``, ``unique_id``,
+        ``model``, ``metric``, ``value`` and ``n_obs``, with categorical labels.
+    """
+    unknown = [metric for metric in metrics if metric not in _KERNELS]
+    if unknown:
+        raise ValueError(f"Unknown metrics: {unknown}, supported: {list(_KERNELS)}")
+    forecasts = Y_rec_df.drop(columns=['y'], errors='ignore')
+    if 'ds' in df_test.columns and 'ds' in forecasts.columns:
+        df = PanelIndex(df_test).join(forecasts, ['y'])
+    else:
+        df = forecasts.merge(df_test[['unique_id', 'y']], on='unique_id', how='left')
+    models = models or [col for col in df.columns if col not in ('unique_id', 'ds', 'y', 'cutoff')]
+
+    y_true = df['y'].to_numpy(dtype=np.float64)
+    y_pred = df[models].to_numpy(dtype=np.float64)
+    # Columns are metric-major: all models of the first metric, then of the next one
+    errors = np.hstack([_KERNELS[metric](y_true, y_pred) for metric in metrics])
+    valid = ~np.isnan(errors)
+    if exclude_zero_forecasts:
+        valid &= np.tile(y_pred != 0, len(metrics))
+    errors = np.where(valid, errors, 0.0)
+
+    codes, uniques = pd.factorize(df['unique_id'], sort=True)
+    series_ids = pd.Index(uniques).astype(str)
+    grouping = group_matrix(codes, len(series_ids))
+    sums = [grouping @ errors]
+    counts = [grouping @ valid.astype(np.float64)]
+    level_names, series_level = [], np.full(len(series_ids), -1)
+    if tags:
+        levels, level_names, series_level = level_matrix(tags, series_ids)
+        sums.append(levels @ sums[0])
+        counts.append(levels @ counts[0])
+    sums.append(sums[0].sum(axis=0, keepdims=True))
+    counts.append(counts[0].sum(axis=0, keepdims=True))
+    sums, counts = np.vstack(sums), np.vstack(counts)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = sums / counts
+    rmse_columns = np.repeat(np.asarray(metrics) == 'rmse', len(models))
+    values[:, rmse_columns] = np.sqrt(values[:, rmse_columns])
+
+    n_series, n_levels, n_columns = len(series_ids), len(level_names), errors.shape[1]
+    scope_codes = np.repeat([0, 1, 2], [n_series, n_levels, 1])
+    level_codes = np.concatenate([series_level, np.arange(n_levels), [-1]])
+    id_codes = np.concatenate([np.arange(n_series), np.full(n_levels + 1, -1)])
+    n_keys = len(scope_codes)
+    return pd.DataFrame({
+        'scope': pd.Categorical.from_codes(np.repeat(scope_codes, n_columns), SCOPES),
+        'level': pd.Categorical.from_codes(np.repeat(level_codes, n_columns), level_names),
+        'unique_id': pd.Categorical.from_codes(np.repeat(id_codes, n_columns), series_ids),
+        'model': pd.Categorical.from_codes(np.tile(np.arange(len(models)), len(metrics) * n_keys), models),
+        'metric': pd.Categorical.from_codes(np.tile(np.repeat(np.arange(len(metrics)), len(models)), n_keys), list(metrics)),
+        'value': values.ravel(),
+        'n_obs': counts.ravel().astype(np.int64),
+    })
+
+
+def write_report(report: pd.DataFrame, path: str) -> None:
+    """Write the report as Parquet when ``path`` ends with ``.parquet``, as CSV otherwise."""
+    if path.endswith('.parquet'):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        report.to_parquet(path, index=False)
+    else:
+        export_csv(report, path)
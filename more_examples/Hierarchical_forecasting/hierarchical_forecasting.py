@@ -1,13 +1,30 @@
+import os
 import pandas as pd
+from typing import Optional
 from nixtla import NixtlaClient
 from hierarchicalforecast.core import HierarchicalReconciliation
-from more_examples.Hierarchical_forecasting.utils import load_data, load_pickle, mape, get_reconcilers
-from more_examples.Hierarchical_forecasting.config import DATASETTRAINAGGPATH, DATASETTESTPATH, DATASETSDFPATH, TAGSPICKELPATH
+from more_examples.Hierarchical_forecasting.utils import load_data, load_pickle, get_reconcilers, split_fitted_and_forecast
+from more_examples.Hierarchical_forecasting.reconciliation_runner import ReconciliationRunner
+from more_examples.Hierarchical_forecasting.evaluation import evaluation_report, write_report
+from more_examples.Hierarchical_forecasting.hierarchy_builder import build_hierarchy
+from more_examples.Hierarchical_forecasting.config import DATASETTRAINAGGPATH, DATASETTESTPATH, DATASETSDFPATH, TAGSPICKELPATH, DATASETTRAINBOTTOMPATH, HIERARCHYCOLUMNS, EVALUATIONREPORTPATH
 from more_examples.utils import load_environment_variables
-
-
-def perform_forecast(client: NixtlaClient, df_train: pd.DataFrame, h: int = 1) -> pd.DataFrame:
-    """Perform forecast using Nixtla TimeGPT."""
+from more_examples.config import RESPONSECACHEDIR
+from more_examples.dispatcher import BatchedDispatcher
+from more_examples.response_cache import CachedClient, ResponseCache
+from more_examples.payload_shaping import TrimmedClient
+from more_examples.incremental import IncrementalForecaster
+from more_examples.tracing import Tracer
+
+
+def perform_forecast(client: NixtlaClient, df_train: pd.DataFrame, h: int = 1, state_dir: Optional[str] = None) -> pd.DataFrame:
+    """Perform forecast using Nixtla TimeGPT.
+
+    If ``state_dir`` is given, only series whose history changed since the last run are
+    re-forecast and merged into the forecast table persisted there.
+    """
+    if state_dir is not None:
+        client = IncrementalForecaster(client, state_dir)
     timegpt_fcst = client.forecast(df=df_train, h=h, freq='ME', add_history=True)
     timegpt_fcst["ds"] = pd.to_datetime(timegpt_fcst["ds"])
     return timegpt_fcst
@@ -19,45 +36,41 @@ def reconcile_forecasts(timegpt_fcst: pd.DataFrame, df_train: pd.DataFrame, s_df
     reconcilers = get_reconcilers(selected_methods)
     hrec = HierarchicalReconciliation(reconcilers=reconcilers)
     
-    timegpt_fcst = timegpt_fcst.set_index('unique_id')
-    df_train = df_train.set_index('unique_id')
+    Y_hat_df, Y_df = split_fitted_and_forecast(timegpt_fcst, df_train)
 
     Y_rec_df = hrec.reconcile(
-        Y_hat_df=timegpt_fcst, 
-        Y_df=df_train, 
-        S=s_df, 
+        Y_hat_df=Y_hat_df, 
+        Y_df=Y_df, 
+        S_df=s_df, 
         tags=tags
     )
-    return Y_rec_df.reset_index()
+    return Y_rec_df
 
 
-def evaluate_forecasts(Y_rec_df: pd.DataFrame, df_test: pd.DataFrame) -> None:
-    """Evaluate forecasts by calculating MAPE."""
-    Y_rec_df = pd.merge(Y_rec_df, df_test, on=['unique_id'], how='left')
-    
-    models_names = Y_rec_df.drop(columns=["unique_id", "ds", "y"]).columns
-    for model in models_names:
-        Y_rec_df["mape"] = Y_rec_df.apply(lambda x: mape(x["y"], x[model]), axis=1)
-        print(f"Mean MAPE for {model}: {Y_rec_df['mape'].mean()}")
-
-    for unique_id in Y_rec_df['unique_id'].unique():
-        print(f"Unique ID: {unique_id}")
-        for model in models_names:
-            mape_value = Y_rec_df[(Y_rec_df['unique_id'] == unique_id) & (Y_rec_df[model] != 0)]['mape'].mean()
-            print(f"Model: {model}, MAPE: {mape_value}")
-        print("*********************************************************************")
+def evaluate_forecasts(Y_rec_df: pd.DataFrame, df_test: pd.DataFrame, tags: Optional[dict] = None,
+                       report_path: Optional[str] = None) -> pd.DataFrame:
+    """Evaluate the MAPE of every model per series, per hierarchy level and overall.
 
+    Returns the tidy report of ``evaluation_report`` and writes it to ``report_path`` if given.
+    """
+    report = evaluation_report(Y_rec_df, df_test, tags)
+    if report_path is not None:
+        write_report(report, report_path)
+    return report
 
-def main() -> None:
-    """Main function to perform hierarchical forecasting."""
-    api_key = load_environment_variables()
-    nixtla_client = NixtlaClient(api_key=api_key)
 
+def run_experiment(nixtla_client, tracer: Tracer, report_path: str = EVALUATIONREPORTPATH) -> pd.DataFrame:
+    """Forecast the hierarchy, reconcile it with every method and write the evaluation report to ``report_path``."""
     # Load datasets
-    df_train_agg = load_data(DATASETTRAINAGGPATH)
-    df_test = load_data(DATASETTESTPATH)
-    s_df = load_data(DATASETSDFPATH)
-    tags = load_pickle(TAGSPICKELPATH)
+    with tracer.stage('load_data') as stage:
+        if DATASETTRAINBOTTOMPATH:
+            df_train_agg, s_df, tags = build_hierarchy(load_data(DATASETTRAINBOTTOMPATH), HIERARCHYCOLUMNS)
+        else:
+            df_train_agg = load_data(DATASETTRAINAGGPATH)
+            s_df = load_data(DATASETSDFPATH)
+            tags = load_pickle(TAGSPICKELPATH)
+        df_test = load_data(DATASETTESTPATH)
+        stage.rows_out = len(df_train_agg) + len(df_test)
 
     # Select reconciliation methods dynamically
     selected_methods = [
@@ -69,16 +82,40 @@ def main() -> None:
     ]
 
     # Perform forecast
-    timegpt_fcst = perform_forecast(nixtla_client, df_train_agg)
+    with tracer.stage('forecast', rows_in=df_train_agg) as stage:
+        timegpt_fcst = perform_forecast(nixtla_client, df_train_agg)
+        stage.rows_out = timegpt_fcst
 
-    # Reconcile forecasts
-    Y_rec_df = reconcile_forecasts(timegpt_fcst, df_train_agg, s_df, tags, selected_methods)
+    # Reconcile forecasts, one process per method
+    with tracer.stage('reconcile', rows_in=timegpt_fcst) as stage:
+        runner = ReconciliationRunner(selected_methods, cache_dir=os.path.join(RESPONSECACHEDIR, 'reconciliation'))
+        Y_rec_df = runner.run(timegpt_fcst, df_train_agg, s_df, tags)
+        stage.rows_out = Y_rec_df
 
     # Filter reconciliation output and evaluate
-    Y_rec_df = Y_rec_df.drop(columns=["y"])
+    Y_rec_df = Y_rec_df.drop(columns=["y"], errors="ignore")
 
     # Evaluate the forecasts
-    evaluate_forecasts(Y_rec_df, df_test)
+    with tracer.stage('evaluate', rows_in=Y_rec_df) as stage:
+        report = evaluate_forecasts(Y_rec_df, df_test, tags, report_path=report_path)
+        stage.rows_out = report
+    return report
+
+
+def main() -> None:
+    """Main function to perform hierarchical forecasting."""
+    tracer = Tracer('hierarchical_forecasting')
+    api_key = load_environment_variables()
+    cached_client = CachedClient(BatchedDispatcher(tracer.client(NixtlaClient(api_key=api_key))), ResponseCache(RESPONSECACHEDIR))
+    nixtla_client = TrimmedClient(cached_client)
+
+    report = run_experiment(nixtla_client, tracer)
+    overall = report[report['scope'] == 'overall']
+    print(f"Evaluation report saved to {EVALUATIONREPORTPATH}")
+    print(overall.pivot_table(index='model', columns='metric', values='value', observed=True))
+
+    print(f"Response cache: {cached_client.cache.stats()}")
+    print(f"Payload shaping: {nixtla_client.stats()}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,85 @@
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from more_examples.Hierarchical_forecasting.reconciliation_runner import sparse_s_frame
+
+
+def _prefix_codes(df: pd.DataFrame, hierarchy_cols: List[str]) -> List[np.ndarray]:
+    """Sorted integer codes of every hierarchy prefix for every row.
+
+    Each level's code is the factorized pair (parent code, column code), so codes stay
+    dense and ordered by the hierarchy path without building string keys per row.
+    """
+    codes = np.zeros(len(df), dtype=np.int64)
+    prefix_codes = []
+    for col in hierarchy_cols:
+        col_codes, col_values = pd.factorize(df[col], sort=True)
+        _, codes = np.unique(codes * len(col_values) + col_codes, return_inverse=True)
+        prefix_codes.append(codes.ravel())
+    return prefix_codes
+
+
+def build_hierarchy(df: pd.DataFrame, hierarchy_cols: List[str], include_total: bool = True) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, np.ndarray]]:
+    """Aggregate bottom-level data into every level of a strict hierarchy.
+
+    Levels are the prefixes of ``hierarchy_cols`` (plus a ``'total'`` level), e.g.
+    ``['country', 'state', 'store']`` gives total, country, country/state and
+    country/state/store. Each level is summed from the bottom-level aggregates with
+    integer group codes, and the summing matrix is built directly in sparse form.
+
+    Args:
+        df: Bottom-level data with the hierarchy columns, ``ds`` and ``y``.
+        hierarchy_cols: Hierarchy columns from the top level to the bottom level.
+        include_total: Whether to add a ``'total'`` level on top.
+
+    Returns:
+        Tuple of (``Y_df`` with ``unique_id``, ``ds``, ``y`` for every node, sparse-dtype
+        ``S_df`` with one row per node and one column per bottom series, ``tags`` dict).
+    """
+    prefix_codes = _prefix_codes(df, hierarchy_cols)
+    bottom_codes = prefix_codes[-1]
+    _, first_rows = np.unique(bottom_codes, return_index=True)
+    n_bottoms = len(first_rows)
+    date_codes, dates = pd.factorize(df['ds'], sort=True)
+    n_dates = len(dates)
+
+    # Bottom-level aggregation of duplicates: one sort over (bottom, date) keys
+    keys, inverse = np.unique(bottom_codes * n_dates + date_codes, return_inverse=True)
+    bottom_y = np.bincount(inverse.ravel(), weights=df['y'].to_numpy(dtype=np.float64))
+    bottom_of_key, date_of_key = keys // n_dates, keys % n_dates
+
+    # Node names are '/'-joined paths, built once per bottom series rather than per row
+    levels = [(['total'], np.zeros(n_bottoms, dtype=np.int64), np.array(['total'], dtype=object))] if include_total else []
+    paths = None
+    for depth, col in enumerate(hierarchy_cols, start=1):
+        values = df[col].to_numpy()[first_rows].astype(str).astype(object)
+        paths = values if paths is None else paths + '/' + values
+        codes = prefix_codes[depth - 1][first_rows]
+        _, node_first = np.unique(codes, return_index=True)
+        levels.append((hierarchy_cols[:depth], codes, paths[node_first]))
+
+    tags: Dict[str, np.ndarray] = {}
+    frames, rows, columns = [], [], []
+    offset = 0
+    for cols, codes, names in levels:
+        tags['/'.join(cols)] = names
+        rows.append(offset + codes)
+        columns.append(np.arange(n_bottoms))
+        # Sum the bottom aggregates of every (node, date) pair of this level
+        level_keys, level_inverse = np.unique(codes[bottom_of_key] * n_dates + date_of_key, return_inverse=True)
+        frames.append(pd.DataFrame({
+            'unique_id': names[level_keys // n_dates],
+            'ds': dates[level_keys % n_dates],
+            'y': np.bincount(level_inverse, weights=bottom_y),
+        }))
+        offset += len(names)
+
+    node_ids = np.concatenate([names for _, _, names in levels])
+    matrix = sparse.csr_matrix(
+        (np.ones(n_bottoms * len(levels)), (np.concatenate(rows), np.concatenate(columns))),
+        shape=(len(node_ids), n_bottoms),
+    )
+    S_df = sparse_s_frame(matrix, node_ids, levels[-1][2])
+    Y_df = pd.concat(frames, ignore_index=True)
+    return Y_df, S_df, tags
@@ -1,4 +1,4 @@
-from hierarchicalforecast.methods import MinTrace, BottomUp, OptimalCombination, ERM
+from hierarchicalforecast.methods import MinTrace, BottomUp, OptimalCombination, ERM, MinTraceSparse, BottomUpSparse
 
 class ReconcilerFactory:
     """Factory class to create reconciliation methods based on user selection."""
@@ -23,5 +23,13 @@ class ReconcilerFactory:
             return MinTrace(method='wls_struct')
         elif method == 'MinTraceWLSVar':
             return MinTrace(method='wls_var')
+        elif method == 'BottomUpSparse':
+            return BottomUpSparse()
+        elif method == 'MinTraceSparseOLS':
+            return MinTraceSparse(method='ols')
+        elif method == 'MinTraceSparseWLSStruct':
+            return MinTraceSparse(method='wls_struct')
+        elif method == 'MinTraceSparseWLSVar':
+            return MinTraceSparse(method='wls_var')
         else:
             raise ValueError(f"Unknown reconciliation method: {method}")
@@ -0,0 +1,157 @@
+import os
+import pickle as pkl
+import hashlib
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from more_examples.dataset_store import read_store, write_store
+from more_examples.response_cache import series_fingerprints
+from more_examples.Hierarchical_forecasting.utils import get_reconcilers, split_fitted_and_forecast
+
+
+def to_sparse_summing_matrix(s_df) -> Tuple[sparse.csr_matrix, np.ndarray, np.ndarray]:
+    """Convert a summing matrix to CSR.
+
+    Args:
+        s_df: Frame with ``unique_id`` and one column per bottom series, or the
+            ``SMatrix`` returned by ``aggregate(..., sparse_s=True)``.
+
+    Returns:
+        Tuple of (CSR matrix, row ids, bottom ids).
+    """
+    if hasattr(s_df, 'to_csr'):
+        return s_df.to_csr(), np.asarray(s_df.row_labels).astype(str), np.asarray(s_df.col_labels).astype(str)
+    bottom_ids = np.asarray([col for col in s_df.columns if col != 'unique_id'])
+    values = s_df[bottom_ids]
+    if all(isinstance(dtype, pd.SparseDtype) for dtype in values.dtypes):
+        matrix = sparse.csr_matrix(values.sparse.to_coo())
+    else:
+        matrix = sparse.csr_matrix(values.to_numpy(dtype=np.float64))
+    return matrix, s_df['unique_id'].astype(str).to_numpy(), bottom_ids
+
+
+def sparse_s_frame(matrix: sparse.spmatrix, row_ids: np.ndarray, bottom_ids: np.ndarray) -> pd.DataFrame:
+    """Wrap a sparse summing matrix as a sparse-dtype frame accepted by ``HierarchicalReconciliation``."""
+    s_df = pd.DataFrame.sparse.from_spmatrix(sparse.csc_matrix(matrix, dtype=np.float64), columns=list(bottom_ids))
+    s_df.insert(0, 'unique_id', row_ids)
+    return s_df
+
+
+def _write_shared_inputs(shared_dir: str, Y_hat_df: pd.DataFrame, Y_df: pd.DataFrame, matrix: sparse.csr_matrix,
+                         row_ids: np.ndarray, bottom_ids: np.ndarray, tags: dict) -> None:
+    """Write the method-independent inputs once, in formats workers can memory map."""
+    write_store(Y_hat_df, os.path.join(shared_dir, 'Y_hat.arrow'))
+    write_store(Y_df, os.path.join(shared_dir, 'Y.arrow'))
+    for name in ('data', 'indices', 'indptr'):
+        np.save(os.path.join(shared_dir, f'S_{name}.npy'), getattr(matrix, name))
+    with open(os.path.join(shared_dir, 'meta.pkl'), 'wb') as f:
+        pkl.dump({'shape': matrix.shape, 'row_ids': row_ids, 'bottom_ids': bottom_ids, 'tags': tags}, f)
+
+
+def _reconcile_method(method: str, shared_dir: str) -> pd.DataFrame:
+    """Worker: reconcile with a single method from the memory-mapped shared inputs.
+
+    The summing matrix is passed as an ``SMatrix``, so ``*Sparse`` methods use the CSR
+    matrix as is, and only dense methods materialize S, once, in their own worker.
+    """
+    from hierarchicalforecast.core import HierarchicalReconciliation
+    from hierarchicalforecast.utils import SMatrix
+
+    with open(os.path.join(shared_dir, 'meta.pkl'), 'rb') as f:
+        meta = pkl.load(f)
+    arrays = [np.load(os.path.join(shared_dir, f'S_{name}.npy'), mmap_mode='r') for name in ('data', 'indices', 'indptr')]
+    matrix = sparse.csr_matrix(tuple(arrays), shape=meta['shape'])
+    Y_hat_df = read_store(os.path.join(shared_dir, 'Y_hat.arrow'))
+    Y_df = read_store(os.path.join(shared_dir, 'Y.arrow'))
+    for frame in (Y_hat_df, Y_df):
+        frame['unique_id'] = frame['unique_id'].astype(str)
+
+    hrec = HierarchicalReconciliation(reconcilers=get_reconcilers([method]))
+    return hrec.reconcile(
+        Y_hat_df=Y_hat_df,
+        Y_df=Y_df,
+        S_df=SMatrix(matrix, meta['row_ids'], meta['bottom_ids']),
+        tags=meta['tags'],
+    )
+
+
+class ReconciliationRunner:
+    """Run several reconciliation methods concurrently, one process per method.
+
+    The summing matrix is converted to CSR once and stays sparse end to end: pick the
+    ``*Sparse`` methods of ``ReconcilerFactory`` for large hierarchies, as the dense
+    methods need S as a dense array. The matrix is written with the forecasts, the
+    training data with fitted values and the tags to a shared directory that every
+    worker memory maps read-only. Each method's output is cached on disk by method and
+    input fingerprint, so re-runs with unchanged inputs skip the work.
+
+    Args:
+        selected_methods: Names understood by ``ReconcilerFactory``.
+        max_workers: Number of worker processes, default is one per method.
+        cache_dir: Optional directory for per-method results.
+    """
+
+    def __init__(self, selected_methods: List[str], max_workers: Optional[int] = None, cache_dir: Optional[str] = None):
+        self.selected_methods = selected_methods
+        self.max_workers = max_workers or len(selected_methods)
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def _inputs_fingerprint(Y_hat_df: pd.DataFrame, Y_df: pd.DataFrame, matrix: sparse.csr_matrix, row_ids: np.ndarray, tags: dict) -> str:
+        digest = hashlib.sha256()
+        for frame in (Y_hat_df, Y_df):
+            fingerprints = series_fingerprints(frame)
+            digest.update(''.join(fingerprints.index.astype(str) + fingerprints.to_numpy()).encode())
+        for array in (matrix.data, matrix.indices, matrix.indptr):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        digest.update(''.join(row_ids).encode())
+        digest.update(repr(sorted((level, list(map(str, ids))) for level, ids in tags.items())).encode())
+        return digest.hexdigest()[:24]
+
+    def _cache_path(self, method: str, key: str) -> Optional[str]:
+        return os.path.join(self.cache_dir, f'{method}-{key}.arrow') if self.cache_dir else None
+
+    def run(self, timegpt_fcst: pd.DataFrame, df_train: pd.DataFrame, s_df: pd.DataFrame, tags: dict) -> pd.DataFrame:
+        """Reconcile ``timegpt_fcst`` (forecast with ``add_history=True``) with every selected method.
+
+        Returns:
+            DataFrame with ``unique_id``, ``ds``, the base forecasts and one column per reconciled model.
+        """
+        Y_hat_df, Y_df = split_fitted_and_forecast(timegpt_fcst, df_train)
+        matrix, row_ids, bottom_ids = to_sparse_summing_matrix(s_df)
+        key = self._inputs_fingerprint(Y_hat_df, Y_df, matrix, row_ids, tags)
+
+        results = {}
+        for method in self.selected_methods:
+            path = self._cache_path(method, key)
+            if path and os.path.exists(path):
+                results[method] = read_store(path)
+        pending = [method for method in self.selected_methods if method not in results]
+
+        if pending:
+            with tempfile.TemporaryDirectory() as shared_dir:
+                _write_shared_inputs(shared_dir, Y_hat_df, Y_df, matrix, row_ids, bottom_ids, tags)
+                with ProcessPoolExecutor(max_workers=min(self.max_workers, len(pending))) as executor:
+                    outputs = list(executor.map(_reconcile_method, pending, [shared_dir] * len(pending)))
+            for method, output in zip(pending, outputs):
+                results[method] = output
+                if self.cache_dir:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    write_store(output, self._cache_path(method, key))
+
+        # Keep the base columns once and add each method's reconciled columns
+        keys = ['unique_id', 'ds']
+        Y_rec_df = None
+        for method in self.selected_methods:
+            output = results[method].astype({'unique_id': str})
+            if Y_rec_df is None:
+                Y_rec_df = output
+            else:
+                new_cols = [col for col in output.columns if col not in Y_rec_df.columns]
+                Y_rec_df = Y_rec_df.merge(output[keys + new_cols], on=keys, how='left')
+        # Cached outputs are stored sorted by id, so restore the summing matrix row order
+        Y_rec_df['_row'] = pd.Index(row_ids).get_indexer(Y_rec_df['unique_id'])
+        return Y_rec_df.sort_values(['_row', 'ds'], kind='stable').drop(columns=['_row']).reset_index(drop=True)
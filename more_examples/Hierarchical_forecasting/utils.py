@@ -1,33 +1,33 @@
 import pandas as pd
 import pickle as pkl
-import numpy as np
-from more_examples.Hierarchical_forecasting.reconciler_factory import ReconcilerFactory
+from more_examples.dataset_store import load_dataset
+from more_examples.Hierarchical_forecasting.reconcile_factory import ReconcilerFactory
 
 def load_data(file_path: str) -> pd.DataFrame:
-    """Load data from a CSV file."""
-    df = pd.read_csv(file_path)
-    df["ds"] = pd.to_datetime(df["ds"])
-    return df
+    """Load data from its dataset store, or from the CSV file if none was converted."""
+    return load_dataset(file_path)
 
 def load_pickle(file_path: str):
     """Load a pickled file."""
     with open(file_path, 'rb') as f:
         return pkl.load(f)
 
-def mape(y_true, y_pred):
-    """Mean Absolute Percentage Error (MAPE)."""
-    if y_true == 0 and y_pred == 0:
-        return 0
-    elif y_true == 0:
-        return 100
-    else:
-        return np.mean(np.abs((y_true - y_pred) / y_true)) * 100
-    
-
 def get_reconcilers(selected_methods: list) -> list:
     """Return a list of reconciler objects based on the selected methods."""
     factory = ReconcilerFactory()
     reconcilers = []
     for method in selected_methods:
         reconcilers.append(factory.create_reconciler(method))
-    return reconcilers
\ No newline at end of file
+    return reconcilers
+
+def split_fitted_and_forecast(timegpt_fcst: pd.DataFrame, df_train: pd.DataFrame):
+    """Split an ``add_history=True`` forecast into future forecasts and training data with fitted values.
+
+    Returns:
+        Tuple of (``Y_hat_df`` with the future rows, ``Y_df`` with ``y`` and the in-sample model columns).
+    """
+    last_ds = df_train.groupby('unique_id', observed=True)['ds'].max()
+    is_history = timegpt_fcst['ds'] <= timegpt_fcst['unique_id'].map(last_ds)
+    Y_hat_df = timegpt_fcst[~is_history].reset_index(drop=True)
+    Y_df = df_train.merge(timegpt_fcst[is_history], on=['unique_id', 'ds'], how='left')
+    return Y_hat_df, Y_df
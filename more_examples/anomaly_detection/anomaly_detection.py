@@ -1,9 +1,20 @@
+import os
+import functools
 import pandas as pd
-import matplotlib.pyplot as plt
+from typing import Callable, Optional
 from nixtla import NixtlaClient
-from more_examples.config import DATASETTRAINPATH
-from utils import load_and_prepare_data
+from more_examples.config import DATASETTRAINPATH, RESPONSECACHEDIR, CHECKPOINTDIR
+from more_examples.anomaly_detection.utils import load_and_prepare_data
 from more_examples.utils import load_environment_variables
+from more_examples.dispatcher import BatchedDispatcher
+from more_examples.response_cache import CachedClient, ResponseCache
+from more_examples.payload_shaping import TrimmedClient
+from more_examples.plotting import MANIFEST_NAME, render_charts
+from more_examples.tracing import Tracer
+from more_examples.pipeline import Pipeline, export_csv
+from more_examples.dataset_store import store_path_for
+from more_examples.anomaly_detection.config import DIRSAVEPLOTPATH
+from more_examples.dtype_policy import DTYPE_POLICY, unify_ids
 
 
 def detect_anomalies(client: NixtlaClient, df: pd.DataFrame) -> pd.DataFrame:
@@ -17,48 +28,71 @@ def detect_anomalies(client: NixtlaClient, df: pd.DataFrame) -> pd.DataFrame:
     return anomalies_df
 
 
-def plot_anomalies(anomalies_df: pd.DataFrame, df_train: pd.DataFrame) -> None:
-    """Plot the actual data and anomalies for each unique_id."""
-    for unique_id in anomalies_df['unique_id'].unique():
-        df_temp = anomalies_df[anomalies_df['unique_id'] == unique_id]
-        df_temp_train = df_train[df_train['unique_id'] == unique_id]
-        df_temp_train = pd.merge(
-            df_temp_train, df_temp[['ds', 'unique_id', 'anomaly']],
-            on=['ds', 'unique_id'], how='left'
-        )
-        df_temp_train["ds"] = pd.to_datetime(df_temp_train["ds"])
-        df_temp_train['anomaly'] = df_temp_train['anomaly'].fillna(0)
-        anomaly_filter = df_temp_train[df_temp_train['anomaly'] == 1]
-
-        plt.figure(figsize=(10, 6))
-        plt.plot(df_temp_train['ds'], df_temp_train['y'], label='Actual data')
-        plt.scatter(
-            anomaly_filter['ds'], anomaly_filter['y'],
-            label='Anomaly', color='red', marker='*'
-        )
-        plt.xlabel('Date')
-        plt.ylabel('Value')
-        plt.legend()
-        plt.title(f"Anomaly detection for unique_id: {unique_id}")
-        plt.show()
+def plot_anomalies(anomalies_df: pd.DataFrame, df_train: pd.DataFrame, save_dir: str) -> None:
+    """Plot and save the actual data and anomalies for each unique_id.
+
+    Only series with rows in ``anomalies_df`` are plotted, as ``anomalies_<unique_id>.png``.
+
+    Args:
+        anomalies_df: Output of ``detect_anomalies`` with ``unique_id``, ``ds`` and an ``anomaly`` flag.
+        df_train: Data the anomalies were detected on; its ``y`` is drawn as a line and marked where flagged.
+        save_dir: Directory path to save the plots.
+    """
+    df_train, anomalies_df = unify_ids(df_train, anomalies_df)
+    df_plot = pd.merge(
+        df_train, anomalies_df[['ds', 'unique_id', 'anomaly']],
+        on=['ds', 'unique_id'], how='left'
+    )
+    df_plot["ds"] = pd.to_datetime(df_plot["ds"])
+    df_plot['anomaly'] = df_plot['anomaly'].fillna(0)
+    df_plot['anomaly_y'] = df_plot['y'].where(df_plot['anomaly'] == 1)
+    df_plot = df_plot[df_plot['unique_id'].isin(anomalies_df['unique_id'].unique())]
+
+    render_charts(
+        df_plot, save_dir,
+        lines={'y': 'Actual data'}, markers={'anomaly_y': 'Anomaly'},
+        title_template='Anomaly detection for unique_id: {unique_id}',
+        filename_template='anomalies_{unique_id}.png',
+    )
+
+
+def build_pipeline(nixtla_client, tracer=None, save_dir: str = DIRSAVEPLOTPATH,
+                   load: Optional[Callable[[str], pd.DataFrame]] = None, checkpoint_dir: str = CHECKPOINTDIR) -> Pipeline:
+    """Stage graph of the anomaly detection experiment, with its plots and anomalies saved under ``save_dir``.
+
+    ``load`` replaces the dataset store as the loader of the data by path, e.g.
+    ``SharedDatasets.load``; data it serves is already in memory, so it is not checkpointed.
+    """
+    pipeline = Pipeline(os.path.join(checkpoint_dir, 'anomaly_detection'), tracer=tracer)
+    # Load and prepare data
+    pipeline.add('load_data', functools.partial(load_and_prepare_data, load=load), params={'file_path': DATASETTRAINPATH},
+                 files=[DATASETTRAINPATH, store_path_for(DATASETTRAINPATH)], checkpoint=load is None)
+    # Detect anomalies
+    pipeline.add('detect_anomalies', functools.partial(detect_anomalies, nixtla_client), inputs=['load_data'])
+    # Plot and save anomalies, and export them, concurrently
+    pipeline.add('plot', plot_anomalies, inputs=['detect_anomalies', 'load_data'], params={'save_dir': save_dir},
+                 outputs=[os.path.join(save_dir, MANIFEST_NAME)])
+    results_path = os.path.join(save_dir, 'anomalies.csv')
+    pipeline.add('export', export_csv, inputs=['detect_anomalies'], params={'path': results_path}, outputs=[results_path])
+    return pipeline
 
 
 def main() -> None:
     """Main function to load data, detect anomalies, and visualize results."""
+    tracer = Tracer('anomaly_detection')
     # Initialize NixtlaClient
     api_key = load_environment_variables()
-    nixtla_client = NixtlaClient(api_key=api_key)
+    cached_client = CachedClient(BatchedDispatcher(tracer.client(NixtlaClient(api_key=api_key))), ResponseCache(RESPONSECACHEDIR))
+    nixtla_client = TrimmedClient(cached_client)
 
-    # Load and prepare data
-    df_train = load_and_prepare_data(
-        DATASETTRAINPATH
-    )
-
-    # Detect anomalies
-    anomalies_df = detect_anomalies(nixtla_client, df_train)
+    pipeline = build_pipeline(nixtla_client, tracer)
+    pipeline.run()
+    pipeline.prune()
+    print(f"Stages: {pipeline.last_run}")
+    print(f"Memory footprint:\n{DTYPE_POLICY.report()}")
 
-    # Plot anomalies (but not saving)
-    plot_anomalies(anomalies_df, df_train)
+    print(f"Response cache: {cached_client.cache.stats()}")
+    print(f"Payload shaping: {nixtla_client.stats()}")
 
 
 if __name__ == "__main__":
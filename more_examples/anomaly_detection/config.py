@@ -0,0 +1 @@
+DIRSAVEPLOTPATH = "more_examples/anomaly_detection/save_plot"
\ No newline at end of file
@@ -0,0 +1,184 @@
+import time
+from typing import Optional
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+from more_examples.payload_shaping import CONTEXT_LENGTHS, DEFAULT_CONTEXT_LENGTH, freq_family
+
+
+class StreamingAnomalyDetector:
+    """Score newly arriving points against the last TimeGPT intervals and re-detect only when needed.
+
+    ``fit`` runs one full ``detect_anomalies`` call and keeps, per series, the last
+    ``TimeGPT``/lo/hi values returned by the API. ``update`` scores a batch of new points
+    with the same rule as the API's ``anomaly`` column (outside the interval) and keeps
+    O(1) running sums of the residuals since the last detection. Every new point is
+    scored against the interval of the last point of the last detection, not against a
+    forecast for its own timestamp, so the scores are only as fresh as that detection:
+    a series is sent back to the API when it drifts (the mean residual since detection
+    is ``drift_threshold`` standard errors away from zero), when ``max_points`` points
+    arrived since its detection, or when its state is older than ``max_age`` seconds.
+    Lower ``max_points`` to refit more often. Unseen series are buffered until they have
+    ``min_rows`` rows.
+
+    Each series keeps its last ``history_length`` points in a ring buffer, which is all a
+    re-detection sends, so an update costs O(new points) and memory stays bounded
+    however long the stream runs.
+
+    Args:
+        client: A ``NixtlaClient`` or any object with the same ``detect_anomalies`` method.
+        level: Prediction interval level passed to ``detect_anomalies``.
+        drift_threshold: Standard errors of the mean residual that count as drift.
+        max_points: Points scored locally before a series is re-detected.
+        max_age: Seconds after which a series' state expires, ``None`` for no limit.
+        min_rows: Rows a new series needs before its first detection.
+        history_length: Points kept per series, default is the model context length of
+            ``detect_kwargs['freq']`` (see ``payload_shaping.CONTEXT_LENGTHS``), and at least ``min_rows``.
+        **detect_kwargs: Passed to every ``detect_anomalies`` call (e.g. ``freq='ME'``).
+    """
+
+    def __init__(self, client, level: int = 99, drift_threshold: float = 4.0, max_points: int = 24,
+                 max_age: Optional[float] = None, min_rows: int = 48, history_length: Optional[int] = None, **detect_kwargs):
+        self.client = client
+        self.level = level
+        self.drift_threshold = drift_threshold
+        self.max_points = max_points
+        self.max_age = max_age
+        self.min_rows = min_rows
+        if history_length is None:
+            history_length = CONTEXT_LENGTHS.get(freq_family(detect_kwargs.get('freq')), DEFAULT_CONTEXT_LENGTH)
+        self.history_length = max(history_length, min_rows)
+        self.detect_kwargs = detect_kwargs
+        self.lo_col, self.hi_col = f'TimeGPT-lo-{level}', f'TimeGPT-hi-{level}'
+        self.redetections = 0
+        self._anomaly_dtype = np.dtype(int)
+        # Per-series state, indexed by position in ``_ids`` (every series seen, detected or buffered)
+        self._ids = pd.Index([], dtype=object)
+        self._fitted = np.zeros(0, dtype=bool)
+        self._ds = np.zeros((0, self.history_length), dtype=np.int64)
+        self._y = np.zeros((0, self.history_length))
+        self._written = np.zeros(0, dtype=np.int64)
+        self._center, self._lo, self._hi = np.zeros(0), np.zeros(0), np.zeros(0)
+        self._count, self._sum, self._detected_at = np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0)
+
+    def _add_series(self, ids: pd.Index) -> None:
+        """Append empty buffers and state slots for series seen for the first time."""
+        grow = len(ids)
+        self._ids = self._ids.append(ids)
+        self._fitted = np.r_[self._fitted, np.zeros(grow, dtype=bool)]
+        self._ds = np.vstack([self._ds, np.zeros((grow, self.history_length), dtype=np.int64)])
+        self._y = np.vstack([self._y, np.zeros((grow, self.history_length))])
+        self._written = np.r_[self._written, np.zeros(grow, dtype=np.int64)]
+        self._center, self._lo, self._hi = (np.r_[array, np.zeros(grow)] for array in (self._center, self._lo, self._hi))
+        self._count = np.r_[self._count, np.zeros(grow, dtype=np.int64)]
+        self._sum, self._detected_at = np.r_[self._sum, np.zeros(grow)], np.r_[self._detected_at, np.zeros(grow)]
+
+    def _append(self, df: pd.DataFrame) -> np.ndarray:
+        """Write the rows of ``df`` (in time order within each series) into the ring buffers.
+
+        Returns:
+            Series position of every row of ``df``.
+        """
+        new_ids = pd.Index(df['unique_id'].unique()).difference(self._ids)
+        if len(new_ids):
+            self._add_series(new_ids)
+        codes = self._ids.get_indexer(df['unique_id'])
+        order = np.argsort(codes, kind='stable')
+        sizes = np.bincount(codes, minlength=len(self._ids))
+        ranks = np.empty(len(codes), dtype=np.int64)
+        ranks[order] = np.arange(len(codes)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        # Of a batch longer than the buffer, only the last ``history_length`` rows are kept
+        keep = ranks >= sizes[codes] - self.history_length
+        slots = (self._written[codes[keep]] + ranks[keep]) % self.history_length
+        self._ds[codes[keep], slots] = pd.to_datetime(df['ds']).to_numpy(dtype='datetime64[ns]').view('int64')[keep]
+        self._y[codes[keep], slots] = df['y'].to_numpy(dtype=float)[keep]
+        self._written += sizes
+        return codes
+
+    def _buffered(self, codes: np.ndarray) -> pd.DataFrame:
+        """Buffered points of the series at ``codes``, oldest first."""
+        filled = np.minimum(self._written[codes], self.history_length)
+        rows = np.repeat(codes, filled)
+        steps = np.arange(filled.sum()) - np.repeat(np.cumsum(filled) - filled, filled)
+        slots = (np.repeat(self._written[codes] - filled, filled) + steps) % self.history_length
+        return pd.DataFrame({
+            'unique_id': self._ids[rows],
+            'ds': self._ds[rows, slots].view('datetime64[ns]'),
+            'y': self._y[rows, slots],
+        })
+
+    def history(self) -> pd.DataFrame:
+        """The buffered points of every series, as one ``unique_id``, ``ds``, ``y`` frame."""
+        return self._buffered(np.arange(len(self._ids)))
+
+    def _detect(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Full detection of every series in ``df`` and reset of their state."""
+        anomalies_df = self.client.detect_anomalies(df=df, level=self.level, **self.detect_kwargs)
+        anomalies_df['unique_id'] = anomalies_df['unique_id'].astype(str)
+        self._anomaly_dtype = anomalies_df['anomaly'].dtype
+        last = anomalies_df.sort_values(['unique_id', 'ds'], kind='stable').groupby('unique_id', sort=False).tail(1)
+
+        codes = self._ids.get_indexer(last['unique_id'])
+        self._fitted[codes] = True
+        self._center[codes] = last['TimeGPT'].to_numpy(dtype=float)
+        self._lo[codes] = last[self.lo_col].to_numpy(dtype=float)
+        self._hi[codes] = last[self.hi_col].to_numpy(dtype=float)
+        self._count[codes] = 0
+        self._sum[codes] = 0.0
+        self._detected_at[codes] = time.monotonic()
+        self.redetections += 1
+        return anomalies_df
+
+    def fit(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Run the initial full detection on ``df`` and keep its last points in the buffers."""
+        df = df[['unique_id', 'ds', 'y']].astype({'unique_id': str}).sort_values(['unique_id', 'ds'], kind='stable')
+        self._append(df)
+        return self._detect(df)
+
+    def update(self, new_df: pd.DataFrame) -> pd.DataFrame:
+        """Score a batch of new points.
+
+        Returns:
+            The new points with ``TimeGPT``, the interval columns and ``anomaly``. Points of
+            re-detected series carry the API's values; buffered new series are omitted.
+        """
+        new_df = new_df[['unique_id', 'ds', 'y']].astype({'unique_id': str}).reset_index(drop=True)
+        new_df['ds'] = pd.to_datetime(new_df['ds'])
+        codes = self._append(new_df)
+        known = self._fitted[codes]
+        codes_known = codes[known]
+
+        scored = new_df[known].copy()
+        y = scored['y'].to_numpy(dtype=float)
+        scored['TimeGPT'] = self._center[codes_known]
+        scored[self.lo_col] = self._lo[codes_known]
+        scored[self.hi_col] = self._hi[codes_known]
+        scored['anomaly'] = ((y < self._lo[codes_known]) | (y > self._hi[codes_known])).astype(self._anomaly_dtype)
+
+        # O(1) per point: running count and residual sum since the last detection
+        n_ids = len(self._ids)
+        self._count += np.bincount(codes_known, minlength=n_ids)
+        self._sum += np.bincount(codes_known, weights=y - self._center[codes_known], minlength=n_ids)
+
+        # The interval half-width is z * sigma, so the standard error of the mean residual follows from it
+        sigma = np.maximum((self._hi - self._lo) / 2 / norm.ppf(0.5 + self.level / 200), 1e-12)
+        mean_residual = self._sum / np.maximum(self._count, 1)
+        drifted = np.abs(mean_residual) * np.sqrt(self._count) > self.drift_threshold * sigma
+        expired = self._count >= self.max_points
+        if self.max_age is not None:
+            expired |= time.monotonic() - self._detected_at > self.max_age
+        stale = (drifted | expired) & (self._count > 0)
+
+        # Unseen series become ready once they have enough rows
+        ready = np.zeros(n_ids, dtype=bool)
+        ready[codes[~known]] = True
+        ready &= self._written >= self.min_rows
+
+        redetect = np.flatnonzero(stale | ready)
+        if not len(redetect):
+            return scored.reset_index(drop=True)
+        redetect_ids = self._ids[redetect]
+        detected = self._detect(self._buffered(redetect))
+        fresh = detected.merge(new_df[new_df['unique_id'].isin(redetect_ids)][['unique_id', 'ds']], on=['unique_id', 'ds'])
+        scored = pd.concat([scored[~scored['unique_id'].isin(redetect_ids)], fresh[scored.columns]], ignore_index=True)
+        return scored
@@ -1,7 +1,14 @@
 import pandas as pd
+from typing import Callable, Optional
+from more_examples.dataset_store import load_dataset
+from more_examples.dtype_policy import DTYPE_POLICY
+from more_examples.panel_index import PanelIndex
 
-def load_and_prepare_data(file_path: str,number_of_rows_treshold:int=48) -> pd.DataFrame:
-    """Loads the dataset and filters out groups with less than 48 rows."""
-    df = pd.read_csv(file_path)
-    df = df.groupby('unique_id').filter(lambda x: len(x) >= number_of_rows_treshold)
+def load_and_prepare_data(file_path: str,number_of_rows_treshold:int=48, load: Optional[Callable[[str], pd.DataFrame]] = None) -> pd.DataFrame:
+    """Loads the dataset and filters out groups with less than 48 rows.
+
+    ``load`` replaces the dataset store as the loader, e.g. ``SharedDatasets.load``.
+    """
+    df = load(file_path) if load is not None else load_dataset(file_path, dtype_policy=DTYPE_POLICY)
+    df = PanelIndex(df).filter_min_length(number_of_rows_treshold)
     return df
\ No newline at end of file
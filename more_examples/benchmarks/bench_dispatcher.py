@@ -0,0 +1,49 @@
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from more_examples.dispatcher import BatchedDispatcher
+from more_examples.fake_client import FakeNixtlaClient
+
+
+def make_monthly_panel(n_series: int, n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Create a monthly panel with ``n_rows`` observations per series."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'unique_id': np.repeat([f'id_{i}' for i in range(n_series)], n_rows),
+        'ds': np.tile(pd.date_range('2015-01-31', periods=n_rows, freq='ME'), n_series),
+        'y': rng.gamma(2.0, 10.0, size=n_series * n_rows),
+    })
+
+
+def main() -> None:
+    """Compare one blocking forecast call with the batched dispatcher on the fake client."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--n-series', type=int, default=5000)
+    parser.add_argument('--n-rows', type=int, default=60)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--latency-per-row', type=float, default=1e-5)
+    parser.add_argument('--max-rows-per-batch', type=int, default=30_000)
+    parser.add_argument('--max-workers', type=int, default=8)
+    args = parser.parse_args()
+
+    df = make_monthly_panel(args.n_series, args.n_rows)
+    client = FakeNixtlaClient(latency=args.latency, latency_per_row=args.latency_per_row)
+
+    start = time.perf_counter()
+    expected = client.forecast(df=df, h=1, freq='ME')
+    serial_time = time.perf_counter() - start
+
+    dispatcher = BatchedDispatcher(client, max_rows_per_batch=args.max_rows_per_batch, max_workers=args.max_workers)
+    start = time.perf_counter()
+    result = dispatcher.forecast(df=df, h=1, freq='ME')
+    batched_time = time.perf_counter() - start
+
+    pd.testing.assert_frame_equal(result, expected)
+    print(f"Rows: {len(df)}, series: {args.n_series}")
+    print(f"Single call: {serial_time:.3f}s ({len(df) / serial_time:,.0f} rows/s)")
+    print(f"Dispatcher:  {batched_time:.3f}s ({len(df) / batched_time:,.0f} rows/s), {client.calls - 1} requests")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from more_examples.preprocess_data.useful_functions import expand_data_with_zeros
+
+
+def legacy_expand_data_with_zeros(df, end_date, freq="D"):
+    """The previous per-unique_id loop with a growing ``pd.concat``."""
+    new_df = pd.DataFrame()
+    copy_df = df.copy()
+    for unique_id_value in copy_df["unique_id"].unique():
+        subset = copy_df[copy_df["unique_id"] == unique_id_value].copy()
+        subset["ds"] = pd.to_datetime(subset["ds"], format="%d/%m/%Y")
+        subset = subset.groupby("ds").sum().reset_index()
+        max_date = subset["ds"].max()
+        full_range = pd.date_range(start=subset["ds"].min(), end=max(max_date, end_date), freq=freq)
+        subset = subset.set_index("ds").reindex(full_range).reset_index()
+        subset = subset.rename(columns={"index": "ds"})
+        subset = subset[subset["ds"] <= end_date]
+        subset["unique_id"] = unique_id_value
+        subset["y"] = subset["y"].fillna(0)
+        new_df = pd.concat([new_df, subset])
+    new_df = new_df.sort_values(by=["unique_id", "ds"])
+    return new_df
+
+
+def make_transactions(n_series: int, n_rows: int, n_days: int = 365, seed: int = 0) -> pd.DataFrame:
+    """Create sparse daily transactions with duplicate dates, formatted like the raw exports."""
+    rng = np.random.default_rng(seed)
+    size = n_series * n_rows
+    ds = pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, n_days, size=size), unit='D')
+    return pd.DataFrame({
+        'unique_id': rng.integers(0, n_series, size=size).astype(str),
+        'ds': ds.strftime('%d/%m/%Y'),
+        'y': rng.integers(1, 10, size=size),
+    })
+
+
+def main() -> None:
+    """Compare the legacy and vectorized zero-filling and report rows/second."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--n-series', type=int, default=1000)
+    parser.add_argument('--n-rows', type=int, default=50)
+    parser.add_argument('--skip-legacy', action='store_true')
+    args = parser.parse_args()
+
+    df = make_transactions(args.n_series, args.n_rows)
+    end_date = pd.Timestamp('2023-12-31')
+
+    start = time.perf_counter()
+    result = expand_data_with_zeros(df, end_date)
+    vectorized_time = time.perf_counter() - start
+    print(f"Input rows: {len(df)}, output rows: {len(result)}, series: {args.n_series}")
+    print(f"Vectorized: {vectorized_time:.3f}s ({len(df) / vectorized_time:,.0f} input rows/s)")
+
+    if not args.skip_legacy:
+        start = time.perf_counter()
+        expected = legacy_expand_data_with_zeros(df, end_date)
+        legacy_time = time.perf_counter() - start
+        pd.testing.assert_frame_equal(result, expected)
+        print(f"Legacy:     {legacy_time:.3f}s ({len(df) / legacy_time:,.0f} input rows/s)")
+        print(f"Speedup: {legacy_time / vectorized_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from more_examples.metrics import evaluate
+
+
+def legacy_mape(y_true, y_pred):
+    """Row-wise MAPE as previously copied into the example utils modules."""
+    if y_true == 0 and y_pred == 0:
+        return 0
+    elif y_true == 0:
+        return 100
+    else:
+        return np.mean(np.abs((y_true - y_pred) / y_true)) * 100
+
+
+def legacy_mape_per_unique_id(df: pd.DataFrame) -> pd.DataFrame:
+    """The previous ``apply`` + per-id ``pd.concat`` implementation."""
+    df = df.copy()
+    df["mape"] = df.apply(lambda x: legacy_mape(x["y"], x["TimeGPT"]), axis=1)
+    df_res = pd.DataFrame(columns=['unique_id', 'mape'])
+    for unique_id in df['unique_id'].unique():
+        mean_mape = df[df['unique_id'] == unique_id]['mape'].mean()
+        df_res = pd.concat([df_res, pd.DataFrame({'unique_id': [unique_id], 'mape': [mean_mape]})], ignore_index=True)
+    return df_res
+
+
+def make_panel(n_series: int, n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Create a random panel with actuals, forecasts and some exact zeros."""
+    rng = np.random.default_rng(seed)
+    y = rng.integers(0, 20, size=n_series * n_rows).astype(float)
+    return pd.DataFrame({
+        'unique_id': np.repeat([f'id_{i}' for i in range(n_series)], n_rows),
+        'y': y,
+        'TimeGPT': np.round(y + rng.normal(0, 2, size=y.size)).clip(min=0),
+    })
+
+
+def main() -> None:
+    """Time the legacy and vectorized MAPE evaluators on the same panel."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--n-series', type=int, default=2000)
+    parser.add_argument('--n-rows', type=int, default=24)
+    args = parser.parse_args()
+
+    df = make_panel(args.n_series, args.n_rows)
+
+    start = time.perf_counter()
+    expected = legacy_mape_per_unique_id(df)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = evaluate(df, ['TimeGPT'], metrics=['mape'])
+    vectorized_time = time.perf_counter() - start
+
+    np.testing.assert_allclose(result['TimeGPT'].to_numpy(), expected['mape'].to_numpy(dtype=float))
+    print(f"Rows: {len(df)}, series: {args.n_series}")
+    print(f"Legacy apply-based:  {legacy_time:.3f}s ({len(df) / legacy_time:,.0f} rows/s)")
+    print(f"Vectorized:          {vectorized_time:.3f}s ({len(df) / vectorized_time:,.0f} rows/s)")
+    print(f"Speedup: {legacy_time / vectorized_time:.1f}x")
+
+    start = time.perf_counter()
+    evaluate(df, ['TimeGPT'], df_train=df)
+    print(f"All metrics (mape, smape, mae, rmse, mase): {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+from typing import Callable, Dict, List
+import pandas as pd
+from more_examples.config import BENCHMARKDIR
+from more_examples.benchmarks.synthetic import make_panel, hierarchy_columns
+from more_examples.benchmarks.bench_expand import make_transactions
+from more_examples.fake_client import FakeNixtlaClient
+from more_examples.dispatcher import BatchedDispatcher
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BASELINE_PATH = os.path.join(BENCHMARKDIR, 'baseline.json')
+
+
+def children_peak_mb() -> float:
+    """Peak RSS of the largest child process waited for so far, 0 where ``resource`` is unavailable."""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+def measure(name: str, stage: Callable[[], int]) -> dict:
+    """Run one stage twice: once timed, once with ``tracemalloc`` for its peak memory.
+
+    ``stage`` returns the number of rows it processed and must be safe to run again.
+    Tracing slows Python-heavy code down, so wall time and rows/s come from the untraced
+    run. ``tracemalloc`` sees NumPy and pandas buffers of this process only; stages that
+    work in worker processes (reconciliation, plotting) are measured by the peak RSS of
+    their children. The OS only reports the largest child so far, so ``child_peak_mb`` is
+    0 for a stage whose children stayed below those of earlier stages; run the stage
+    alone with ``--stages`` for its own figure.
+    """
+    children_before = children_peak_mb()
+    start = time.perf_counter()
+    rows = stage()
+    wall = time.perf_counter() - start
+    children_after = children_peak_mb()
+
+    tracemalloc.start()
+    stage()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        'stage': name, 'wall_s': wall, 'peak_mb': peak / 1024 ** 2,
+        'child_peak_mb': children_after if children_after > children_before else 0.0,
+        'rows': rows, 'rows_per_s': rows / wall if wall else float('inf'),
+    }
+
+
+def build_stages(args: argparse.Namespace, work_dir: str) -> Dict[str, Callable[[], int]]:
+    """Create the pipeline stages over one synthetic panel; stages share results through ``state``."""
+    from electircity_example.utils import split_data
+    from more_examples.preprocess_data.useful_functions import expand_data_with_zeros
+    from more_examples.fine_tune.fine_tune import calculate_mape_per_unique_id
+    from more_examples.cross_validation.cv_engine import CrossValidationEngine, ClientForecaster, Naive
+    from more_examples.Hierarchical_forecasting.hierarchy_builder import build_hierarchy
+    from more_examples.Hierarchical_forecasting.reconciliation_runner import ReconciliationRunner
+    from more_examples.Hierarchical_forecasting.hierarchical_forecasting import evaluate_forecasts
+    from more_examples.plotting import render_charts
+
+    client = BatchedDispatcher(
+        FakeNixtlaClient(latency=args.latency, latency_per_row=args.latency_per_row),
+        max_rows_per_batch=args.max_rows_per_batch, max_workers=args.max_workers,
+    )
+    state = {'panel': make_panel(args.n_series, args.n_rows, args.freq, args.hierarchy_depth, seed=args.seed)}
+
+    def split() -> int:
+        state['train'], state['test'] = split_data(state['panel'])
+        return len(state['panel'])
+
+    def expand() -> int:
+        transactions = make_transactions(args.n_series, 10, seed=args.seed)
+        return len(expand_data_with_zeros(transactions, pd.Timestamp('2023-12-31')))
+
+    def forecast() -> int:
+        h = state['test'].groupby('unique_id', observed=True).size().max()
+        state['forecast'] = client.forecast(df=state['train'][['unique_id', 'ds', 'y']], h=int(h), freq=args.freq)
+        return len(state['train'])
+
+    def evaluate_mape() -> int:
+        calculate_mape_per_unique_id(state['test'], state['forecast'])
+        return len(state['test'])
+
+    def cross_validation() -> int:
+        engine = CrossValidationEngine([Naive(), ClientForecaster(client, freq=args.freq)])
+        return len(engine.cross_validation(state['train'][['unique_id', 'ds', 'y']], h=1, n_windows=3))
+
+    def detect_anomalies() -> int:
+        return len(client.detect_anomalies(df=state['train'][['unique_id', 'ds', 'y']], freq=args.freq))
+
+    def hierarchy() -> int:
+        state['Y_df'], state['S_df'], state['tags'] = build_hierarchy(state['train'], hierarchy_columns(args.hierarchy_depth))
+        return len(state['train'])
+
+    def reconcile() -> int:
+        fcst = client.forecast(df=state['Y_df'], h=1, freq=args.freq, add_history=True)
+        runner = ReconciliationRunner(['BottomUp'])
+        state['Y_rec_df'] = runner.run(fcst, state['Y_df'], state['S_df'], state['tags']).drop(columns=['y'], errors='ignore')
+        return len(state['Y_df'])
+
+    def evaluate_hierarchy() -> int:
+        test_df = build_hierarchy(state['test'], hierarchy_columns(args.hierarchy_depth))[0]
+        evaluate_forecasts(state['Y_rec_df'], test_df, state['tags'])
+        return len(state['Y_rec_df'])
+
+    def plot() -> int:
+        ids = state['test']['unique_id'].drop_duplicates().iloc[:args.plot_series]
+        test_df = state['test'][state['test']['unique_id'].isin(ids)].merge(state['forecast'], on=['unique_id', 'ds'], how='left')
+        render_charts(test_df, os.path.join(work_dir, 'plots'), lines={'y': 'Actual data', 'TimeGPT': 'Forecast'}, skip_unchanged=False)
+        return len(test_df)
+
+    stages = {
+        'split_data': split,
+        'expand_data_with_zeros': expand,
+        'forecast': forecast,
+        'calculate_mape_per_unique_id': evaluate_mape,
+        'cross_validation': cross_validation,
+        'detect_anomalies': detect_anomalies,
+    }
+    if args.hierarchy_depth:
+        stages.update({'build_hierarchy': hierarchy, 'reconcile': reconcile, 'evaluate_forecasts': evaluate_hierarchy})
+    stages['plot'] = plot
+    return stages
+
+
+def compare(results: List[dict], baseline: List[dict], tolerance: float, min_seconds: float) -> List[str]:
+    """Return a message for every stage that is slower or uses more memory than its baseline beyond the tolerance."""
+    previous = {row['stage']: row for row in baseline}
+    regressions = []
+    for row in results:
+        base = previous.get(row['stage'])
+        if base is None:
+            continue
+        if row['wall_s'] > base['wall_s'] * (1 + tolerance) and row['wall_s'] - base['wall_s'] > min_seconds:
+            regressions.append(f"{row['stage']}: wall {base['wall_s']:.3f}s -> {row['wall_s']:.3f}s")
+        if row['peak_mb'] > base['peak_mb'] * (1 + tolerance) and row['peak_mb'] - base['peak_mb'] > 1:
+            regressions.append(f"{row['stage']}: peak memory {base['peak_mb']:.1f}MB -> {row['peak_mb']:.1f}MB")
+        # Only comparable when both runs saw the stage's children, see ``measure``
+        base_child, child = base.get('child_peak_mb', 0.0), row.get('child_peak_mb', 0.0)
+        if base_child and child and child > base_child * (1 + tolerance) and child - base_child > 1:
+            regressions.append(f"{row['stage']}: child peak RSS {base_child:.1f}MB -> {child:.1f}MB")
+    return regressions
+
+
+def main() -> None:
+    """Run every pipeline stage on a synthetic panel against the fake client and compare with the stored baseline."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--n-series', type=int, default=1000)
+    parser.add_argument('--n-rows', type=int, default=60)
+    parser.add_argument('--freq', default='ME')
+    parser.add_argument('--hierarchy-depth', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--latency-per-row', type=float, default=1e-6)
+    parser.add_argument('--max-rows-per-batch', type=int, default=100_000)
+    parser.add_argument('--max-workers', type=int, default=4)
+    parser.add_argument('--plot-series', type=int, default=20, help='Series rendered by the plot stage')
+    parser.add_argument('--stages', nargs='*', help='Subset of stages to run, default all')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the baseline of its configuration')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed relative slowdown before a regression is reported')
+    parser.add_argument('--min-seconds', type=float, default=0.05, help='Ignore slowdowns smaller than this')
+    args = parser.parse_args()
+
+    config_key = f'{args.n_series}x{args.n_rows}-{args.freq}-depth{args.hierarchy_depth}'
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for name, stage in build_stages(args, work_dir).items():
+            if args.stages and name not in args.stages:
+                continue
+            row = measure(name, stage)
+            results.append(row)
+            print(f"{name:<30} {row['wall_s']:>9.3f}s {row['peak_mb']:>9.1f}MB {row['child_peak_mb']:>9.1f}MB children "
+                  f"{row['rows_per_s']:>14,.0f} rows/s")
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baselines = json.load(f)
+    if args.save_baseline:
+        baselines[config_key] = results
+        os.makedirs(os.path.dirname(args.baseline) or '.', exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(baselines, f, indent=2)
+        print(f"Baseline saved for {config_key}")
+        return
+    if config_key not in baselines:
+        print(f"No baseline for {config_key}; run with --save-baseline to store one")
+        return
+    regressions = compare(results, baselines[config_key], args.tolerance, args.min_seconds)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    if regressions:
+        sys.exit(1)
+    print(f"No regressions against the {config_key} baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+from typing import List
+import numpy as np
+import pandas as pd
+
+
+def hierarchy_columns(depth: int) -> List[str]:
+    """Names of the hierarchy columns of a synthetic panel, top level first."""
+    return [f'level_{level}' for level in range(1, depth + 1)]
+
+
+def make_panel(n_series: int, n_rows: int, freq: str = 'ME', hierarchy_depth: int = 0, branching: int = 10,
+               seed: int = 0) -> pd.DataFrame:
+    """Create a synthetic panel of positive, seasonal series, built without per-series loops.
+
+    Every series has ``n_rows`` observations ending on the same date. With
+    ``hierarchy_depth > 0`` the series are the bottom level of a tree with ``branching``
+    children per node (the top levels are capped by ``n_series``), described by the
+    ``level_1`` ... ``level_<depth>`` columns; ``unique_id`` is the bottom-level path.
+
+    Args:
+        n_series: Number of (bottom-level) series, e.g. 1_000 to 1_000_000.
+        n_rows: Observations per series.
+        freq: Pandas frequency of ``ds``.
+        hierarchy_depth: Number of hierarchy columns, 0 for a flat panel.
+        branching: Children per hierarchy node above the bottom level.
+        seed: Seed of the random draws.
+
+    Returns:
+        DataFrame sorted by ``unique_id`` and ``ds``.
+    """
+    rng = np.random.default_rng(seed)
+    series = np.arange(n_series)
+    dates = pd.date_range(end='2024-12-31', periods=n_rows, freq=freq)
+    level = rng.gamma(2.0, 50.0, size=n_series)
+    season = 1 + 0.2 * np.sin(2 * np.pi * np.arange(n_rows) / 12)
+    y = np.outer(level, season) * rng.lognormal(0.0, 0.1, size=(n_series, n_rows))
+
+    df = pd.DataFrame({'ds': np.tile(dates, n_series), 'y': y.ravel()})
+    if hierarchy_depth:
+        # Node of every series at each level, from the top: series // branching ** (levels below)
+        paths = None
+        for depth, col in enumerate(hierarchy_columns(hierarchy_depth), start=1):
+            nodes = (series // branching ** (hierarchy_depth - depth)).astype(str)
+            df[col] = np.repeat(nodes, n_rows)
+            paths = nodes if paths is None else np.char.add(np.char.add(paths, '/'), nodes)
+        ids = paths
+    else:
+        ids = np.char.add('id_', series.astype(str))
+    df.insert(0, 'unique_id', np.repeat(ids, n_rows))
+    return df.sort_values(['unique_id', 'ds'], kind='stable').reset_index(drop=True)
@@ -1,2 +1,10 @@
+import os
+
 DATASETTRAINPATH = 'dataset\after_preprocess\train.csv'
-DATASETTESTPATH = 'dataset\after_preprocess\test.csv'
\ No newline at end of file
+DATASETTESTPATH = 'dataset\after_preprocess\test.csv'
+RESPONSECACHEDIR = '.timegpt_cache'
+CHECKPOINTDIR = '.timegpt_checkpoints'
+# Every launcher run gets a timestamped directory here with the outputs of all experiments
+RUNDIR = 'runs'
+# Benchmark baselines are machine specific, so they live with the local outputs rather than in the package
+BENCHMARKDIR = os.path.join(RUNDIR, 'benchmarks')
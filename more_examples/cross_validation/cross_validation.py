@@ -1,10 +1,21 @@
 import os
+import functools
 import pandas as pd
-import matplotlib.pyplot as plt
 from nixtla import NixtlaClient
-from more_examples.cross_validation.utils import load_and_prepare_data, mape
+from typing import Callable, List, Optional
+from more_examples.cross_validation.utils import load_and_prepare_data
+from more_examples.cross_validation.cv_engine import CrossValidationEngine, ClientForecaster
+from more_examples.metrics import mape
+from more_examples.plotting import MANIFEST_NAME, render_charts
+from more_examples.tracing import Tracer
+from more_examples.pipeline import Pipeline, export_csv
+from more_examples.dataset_store import store_path_for
 from more_examples.utils import load_environment_variables
-from more_examples.config import DATASETTRAINPATH
+from more_examples.dispatcher import BatchedDispatcher
+from more_examples.response_cache import CachedClient, ResponseCache
+from more_examples.payload_shaping import TrimmedClient
+from more_examples.dtype_policy import DTYPE_POLICY
+from more_examples.config import DATASETTRAINPATH, RESPONSECACHEDIR, CHECKPOINTDIR
 from more_examples.cross_validation.config import DIRSAVEPLOTPATH
 
 
@@ -32,6 +43,25 @@ def perform_cross_validation(client: NixtlaClient, df_train: pd.DataFrame, h: in
     return cv_df
 
 
+def perform_local_cross_validation(client: NixtlaClient, df_train: pd.DataFrame, h: int = 1, n_windows: int = 12,
+                                   baselines: Optional[List] = None, engine: Optional[CrossValidationEngine] = None) -> pd.DataFrame:
+    """Perform cross-validation locally, forecasting each window with TimeGPT and optional baselines.
+
+    Args:
+        client: An instance of NixtlaClient.
+        df_train: Training DataFrame.
+        h: Forecast horizon, default is 1.
+        n_windows: Number of cross-validation windows, default is 12.
+        baselines: Local forecasters from ``cv_engine`` to evaluate alongside TimeGPT.
+        engine: Engine to reuse, so windows cached by an earlier call are not recomputed.
+
+    Returns:
+        DataFrame with the same columns as ``perform_cross_validation`` plus one per baseline.
+    """
+    engine = engine or CrossValidationEngine([ClientForecaster(client, freq='ME')] + (baselines or []))
+    return engine.cross_validation(df_train, h=h, n_windows=n_windows)
+
+
 def calculate_mape(cv_df: pd.DataFrame) -> pd.DataFrame:
     """Calculate MAPE (Mean Absolute Percentage Error) for each row in the DataFrame.
 
@@ -41,7 +71,7 @@ def calculate_mape(cv_df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with MAPE calculated for each row.
     """
-    cv_df["mape"] = cv_df.apply(lambda x: mape(x["y"], x["TimeGPT"]), axis=1)
+    cv_df["mape"] = mape(cv_df["y"], cv_df["TimeGPT"])
     return cv_df
 
 
@@ -49,42 +79,55 @@ def plot_and_save_cross_validation(cv_df: pd.DataFrame, save_dir: str) -> None:
     """Plot and save the cross-validation forecast results for each unique_id.
 
     Args:
-        cv_df: DataFrame containing cross-validation results.
+        cv_df: Cross-validation results with ``unique_id``, ``ds``, ``y``, ``TimeGPT`` and the
+            per-row ``mape`` of ``calculate_mape``, whose per-series mean goes in the title.
         save_dir: Directory path to save the plots.
     """
-    if not os.path.exists(save_dir):
-        os.makedirs(save_dir)
-
-    for unique_id in cv_df['unique_id'].unique():
-        mean_mape = cv_df[cv_df['unique_id'] == unique_id]['mape'].mean()
-        plt.figure(figsize=(10, 6))
-        plt.plot(cv_df[cv_df['unique_id'] == unique_id]['ds'], cv_df[cv_df['unique_id'] == unique_id]['y'], label='Actual data')
-        plt.plot(cv_df[cv_df['unique_id'] == unique_id]['ds'], cv_df[cv_df['unique_id'] == unique_id]['TimeGPT'], label='Forecast')
-        plt.xlabel('Date')
-        plt.ylabel('Value')
-        plt.title(f'Forecast for the 12 cross-val windows for {unique_id} and mean MAPE: {mean_mape}')
-        plt.legend()
-        plt.savefig(os.path.join(save_dir, f'forecast_{unique_id}.png'))
-        plt.close()
+    mean_mape = cv_df.groupby('unique_id', observed=True)['mape'].mean()
+    titles = 'Forecast for the 12 cross-val windows for ' + mean_mape.index.astype(str) + ' and mean MAPE: ' + mean_mape.astype(str)
+    render_charts(cv_df, save_dir, lines={'y': 'Actual data', 'TimeGPT': 'Forecast'}, titles=titles)
+
+
+def build_pipeline(nixtla_client, tracer=None, save_dir: str = DIRSAVEPLOTPATH,
+                   load: Optional[Callable[[str], pd.DataFrame]] = None, checkpoint_dir: str = CHECKPOINTDIR) -> Pipeline:
+    """Stage graph of the cross-validation experiment, with its plots and results saved under ``save_dir``.
+
+    ``load`` replaces ``load_and_prepare_data`` as the loader of the data by path, e.g.
+    ``SharedDatasets.load``; data it serves is already in memory, so it is not checkpointed.
+    """
+    pipeline = Pipeline(os.path.join(checkpoint_dir, 'cross_validation'), tracer=tracer)
+    # Load and prepare data
+    pipeline.add('load_data', load or load_and_prepare_data, params={'path': DATASETTRAINPATH},
+                 files=[DATASETTRAINPATH, store_path_for(DATASETTRAINPATH)], checkpoint=load is None)
+    # Perform cross-validation
+    pipeline.add('cross_validation', functools.partial(perform_cross_validation, nixtla_client), inputs=['load_data'],
+                 params={'h': 1, 'n_windows': 12})
+    # Calculate MAPE
+    pipeline.add('calculate_mape', calculate_mape, inputs=['cross_validation'])
+    # Plot and save cross-validation results, and export them, concurrently
+    pipeline.add('plot', plot_and_save_cross_validation, inputs=['calculate_mape'], params={'save_dir': save_dir},
+                 outputs=[os.path.join(save_dir, MANIFEST_NAME)])
+    results_path = os.path.join(save_dir, 'cv_results.csv')
+    pipeline.add('export', export_csv, inputs=['calculate_mape'], params={'path': results_path}, outputs=[results_path])
+    return pipeline
 
 
 def main() -> None:
     """Main function to perform cross-validation, calculate MAPE, and visualize results."""
+    tracer = Tracer('cross_validation')
     # Load API key and initialize NixtlaClient
     api_key = load_environment_variables()
-    nixtla_client = NixtlaClient(api_key=api_key)
+    cached_client = CachedClient(BatchedDispatcher(tracer.client(NixtlaClient(api_key=api_key))), ResponseCache(RESPONSECACHEDIR))
+    nixtla_client = TrimmedClient(cached_client)
 
-    # Load and prepare data
-    df_train = load_and_prepare_data(DATASETTRAINPATH)
-
-    # Perform cross-validation
-    imegpt_cv_df = perform_cross_validation(nixtla_client, df_train, h=1, n_windows=12)
-
-    # Calculate MAPE
-    imegpt_cv_df = calculate_mape(imegpt_cv_df)
+    pipeline = build_pipeline(nixtla_client, tracer)
+    pipeline.run()
+    pipeline.prune()
+    print(f"Stages: {pipeline.last_run}")
+    print(f"Memory footprint:\n{DTYPE_POLICY.report()}")
 
-    # Plot and save cross-validation results
-    plot_and_save_cross_validation(imegpt_cv_df, DIRSAVEPLOTPATH)
+    print(f"Response cache: {cached_client.cache.stats()}")
+    print(f"Payload shaping: {nixtla_client.stats()}")
 
 
 if __name__ == "__main__":
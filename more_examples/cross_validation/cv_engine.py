@@ -0,0 +1,193 @@
+import os
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from more_examples.dataset_store import read_store, write_store
+from more_examples.response_cache import series_fingerprints
+from more_examples.panel_index import PanelIndex
+from more_examples.tracing import propagate_context
+
+
+class SortedPanel:
+    """A panel sorted once by (unique_id, ds) with the start offset and length of every series.
+
+    Windows are described by per-series end offsets into the shared ``y`` array, so local
+    forecasters read their training data as slices of that array without copying it.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        index = PanelIndex(df)
+        self.df = index.df
+        self.unique_ids = index.unique_ids
+        self.ds = self.df['ds'].to_numpy()
+        self.y = self.df['y'].to_numpy(dtype=np.float64)
+        self.sizes, self.starts, self.ends = index.sizes, index.starts, index.ends
+
+    def fingerprint(self) -> str:
+        """Hash of the whole panel content, used to key cached windows."""
+        fingerprints = series_fingerprints(self.df[['unique_id', 'ds', 'y']])
+        payload = ''.join(fingerprints.index.astype(str) + fingerprints.to_numpy())
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+    def ids_at(self, series: np.ndarray) -> pd.api.extensions.ExtensionArray:
+        """Ids of the series at positions ``series``, with the dtype of the panel's ``unique_id``."""
+        return self.df['unique_id'].array.take(self.starts[series])
+
+    def train_frame(self, train_ends: np.ndarray, valid: np.ndarray) -> pd.DataFrame:
+        """Materialize a window's training rows as a DataFrame, for forecasters that need one."""
+        lengths = train_ends[valid] - self.starts[valid]
+        rows = np.repeat(self.starts[valid] - (np.cumsum(lengths) - lengths), lengths) + np.arange(lengths.sum())
+        return self.df.iloc[rows]
+
+
+class Naive:
+    """Repeat the last observed value."""
+
+    name = 'Naive'
+
+    def forecast_offsets(self, y: np.ndarray, starts: np.ndarray, ends: np.ndarray, h: int) -> np.ndarray:
+        return np.repeat(y[ends - 1][:, None], h, axis=1)
+
+
+class SeasonalNaive:
+    """Repeat the last observed season."""
+
+    def __init__(self, season_length: int = 12):
+        self.season_length = season_length
+        self.name = f'SeasonalNaive{season_length}'
+
+    def forecast_offsets(self, y: np.ndarray, starts: np.ndarray, ends: np.ndarray, h: int) -> np.ndarray:
+        steps = np.arange(h) % self.season_length
+        positions = ends[:, None] - self.season_length + steps
+        # Series shorter than one season fall back to their first value
+        positions = np.maximum(positions, starts[:, None])
+        return y[positions]
+
+
+class HistoricAverage:
+    """Mean of the whole training history, from a cumulative sum in O(1) per series."""
+
+    name = 'HistoricAverage'
+
+    def forecast_offsets(self, y: np.ndarray, starts: np.ndarray, ends: np.ndarray, h: int) -> np.ndarray:
+        cumulative = np.r_[0.0, np.cumsum(y)]
+        means = (cumulative[ends] - cumulative[starts]) / np.maximum(ends - starts, 1)
+        return np.repeat(means[:, None], h, axis=1)
+
+
+class ClientForecaster:
+    """Adapter that forecasts a window with ``client.forecast`` (TimeGPT or the fake client)."""
+
+    def __init__(self, client, freq: Optional[str] = None, name: str = 'TimeGPT', **forecast_kwargs):
+        self.client = client
+        self.freq = freq
+        self.name = name
+        self.forecast_kwargs = forecast_kwargs
+
+    def forecast_frame(self, train_df: pd.DataFrame, h: int) -> pd.DataFrame:
+        fcst_df = self.client.forecast(df=train_df, h=h, freq=self.freq, **self.forecast_kwargs)
+        return fcst_df.rename(columns={'TimeGPT': self.name})
+
+
+class CrossValidationEngine:
+    """Local rolling-origin cross-validation over any mix of forecasters.
+
+    Cutoffs are computed from the per-series offsets of a ``SortedPanel``: window ``w`` of
+    ``n_windows`` holds out ``h + (n_windows - 1 - w) * step_size`` rows of every series.
+    Windows run in parallel on a thread pool, and each finished (forecaster, window) is
+    cached by its held-out offset and the panel fingerprint, so growing ``n_windows``
+    only computes the new windows.
+
+    Args:
+        forecasters: Local baselines and/or ``ClientForecaster`` instances.
+        max_workers: Number of windows forecast concurrently.
+        cache_dir: Optional directory where finished windows are also stored on disk.
+    """
+
+    def __init__(self, forecasters: List, max_workers: int = 4, cache_dir: Optional[str] = None):
+        self.forecasters = forecasters
+        self.max_workers = max_workers
+        self.cache_dir = cache_dir
+        self._cache: Dict[Tuple, pd.DataFrame] = {}
+
+    @staticmethod
+    def _window_cutoffs(panel: SortedPanel, holdout: int) -> Tuple[np.ndarray, np.ndarray]:
+        train_ends = panel.ends - holdout
+        # A series needs at least one training row to take part in a window
+        return train_ends, train_ends > panel.starts
+
+    def _forecast_window(self, forecaster, panel: SortedPanel, holdout: int, h: int) -> pd.DataFrame:
+        train_ends, valid = self._window_cutoffs(panel, holdout)
+        starts, ends = panel.starts[valid], train_ends[valid]
+        rows = (ends[:, None] + np.arange(h)).ravel()
+        window = pd.DataFrame({
+            'unique_id': panel.ids_at(np.repeat(np.flatnonzero(valid), h)),
+            'ds': panel.ds[rows],
+            'cutoff': np.repeat(panel.ds[ends - 1], h),
+        })
+        if hasattr(forecaster, 'forecast_offsets'):
+            window[forecaster.name] = forecaster.forecast_offsets(panel.y, starts, ends, h).ravel()
+        else:
+            fcst_df = forecaster.forecast_frame(panel.train_frame(train_ends, valid), h)
+            # Joined on (id, date) rather than by position, as the client may reorder or drop rows;
+            # ids are compared as strings because the client may not return them with the panel's dtype
+            fcst_df = pd.DataFrame({
+                '_id': fcst_df['unique_id'].astype(str).to_numpy(),
+                'ds': pd.to_datetime(fcst_df['ds']).to_numpy(),
+                forecaster.name: fcst_df[forecaster.name].to_numpy(),
+            })
+            window = (window.assign(_id=window['unique_id'].astype(str).to_numpy())
+                      .merge(fcst_df, on=['_id', 'ds'], how='left')
+                      .drop(columns='_id'))
+        return window
+
+    def _cached_window(self, forecaster, panel: SortedPanel, panel_key: str, holdout: int, h: int) -> pd.DataFrame:
+        key = (forecaster.name, panel_key, h, holdout)
+        if key in self._cache:
+            return self._cache[key]
+        path = None
+        if self.cache_dir:
+            name = hashlib.sha256(repr(key).encode()).hexdigest()[:24]
+            path = os.path.join(self.cache_dir, f'{name}.arrow')
+            if os.path.exists(path):
+                window = read_store(path)
+                # The store keeps ids as strings: restore the panel's ids
+                series = pd.Index(panel.unique_ids.astype(str)).get_indexer(window['unique_id'].astype(str))
+                window['unique_id'] = panel.ids_at(series)
+                self._cache[key] = window
+                return window
+        window = self._forecast_window(forecaster, panel, holdout, h)
+        if path:
+            write_store(window, path)
+        self._cache[key] = window
+        return window
+
+    def cross_validation(self, df: pd.DataFrame, h: int = 1, n_windows: int = 1, step_size: Optional[int] = None) -> pd.DataFrame:
+        """Run every forecaster on every window.
+
+        Returns:
+            DataFrame with ``unique_id``, ``ds``, ``cutoff``, ``y`` and one column per forecaster.
+        """
+        panel = SortedPanel(df)
+        panel_key = panel.fingerprint()
+        step_size = step_size or h
+        holdouts = [h + (n_windows - 1 - window) * step_size for window in range(n_windows)]
+        jobs = [(forecaster, holdout) for holdout in holdouts for forecaster in self.forecasters]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            windows = list(executor.map(propagate_context(lambda job: self._cached_window(job[0], panel, panel_key, job[1], h)), jobs))
+
+        keys = ['unique_id', 'ds', 'cutoff']
+        frames = []
+        for window_index in range(n_windows):
+            per_forecaster = windows[window_index * len(self.forecasters):(window_index + 1) * len(self.forecasters)]
+            merged = per_forecaster[0]
+            for other in per_forecaster[1:]:
+                merged = merged.merge(other, on=keys, how='outer')
+            frames.append(merged)
+        cv_df = pd.concat(frames, ignore_index=True)
+        cv_df = cv_df.merge(panel.df[['unique_id', 'ds', 'y']], on=['unique_id', 'ds'], how='left')
+        models = [forecaster.name for forecaster in self.forecasters]
+        cv_df = cv_df[keys + ['y'] + models]
+        return cv_df.sort_values(['unique_id', 'cutoff', 'ds'], kind='stable').reset_index(drop=True)
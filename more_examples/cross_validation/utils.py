@@ -1,16 +1,7 @@
 import pandas as pd
-import numpy as np
+from more_examples.dataset_store import load_dataset
+from more_examples.dtype_policy import DTYPE_POLICY
 
 def load_and_prepare_data(path: str) -> pd.DataFrame:
     """Load the dataset and prepare the datetime column."""
-    df = pd.read_csv(path)
-    df["ds"] = pd.to_datetime(df["ds"])
-    return df
-
-def mape(y_true, y_pred):
-    if y_true ==0 and y_pred == 0:
-        return 0
-    elif y_true == 0:
-        return 100
-    else:
-        return np.mean(np.abs((y_true - y_pred) / y_true)) * 100
\ No newline at end of file
+    return load_dataset(path, dtype_policy=DTYPE_POLICY)
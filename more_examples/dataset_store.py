@@ -0,0 +1,179 @@
+import os
+import json
+import argparse
+from typing import Iterable, List, Optional
+import numpy as np
+import pandas as pd
+
+STORE_EXTENSION = '.arrow'
+_METADATA_KEY = b'timegpt_check'
+
+
+def store_path_for(csv_path: str) -> str:
+    """Return the dataset store path that sits next to a CSV file."""
+    return os.path.splitext(csv_path)[0] + STORE_EXTENSION
+
+
+def source_fingerprint(path: str) -> dict:
+    """Size and modification time of the file a store was converted from."""
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Give a frame the layout and dtypes of the dataset store.
+
+    ``ds`` becomes a timestamp and ``unique_id`` a categorical of strings with a sorted
+    dictionary. Panels (frames with ``unique_id`` and ``ds``) are sorted by
+    (unique_id, ds) so every series is one contiguous row range; other frames, such as
+    the summing matrix, keep their row order.
+    """
+    df = df.copy()
+    if 'ds' in df.columns:
+        df['ds'] = pd.to_datetime(df['ds'])
+    if 'unique_id' in df.columns:
+        ids = df['unique_id'].astype(str)
+        df['unique_id'] = pd.Categorical(ids, categories=np.sort(ids.unique()))
+    if 'unique_id' in df.columns and 'ds' in df.columns:
+        df = df.sort_values(['unique_id', 'ds'], kind='stable')
+    return df.reset_index(drop=True)
+
+
+def write_store(df: pd.DataFrame, store_path: str, source: Optional[dict] = None) -> None:
+    """Write a DataFrame as an uncompressed Arrow IPC file that can be memory mapped.
+
+    The frame is laid out by ``normalize_frame`` first.
+
+    Args:
+        df: DataFrame to store.
+        store_path: Destination path of the ``.arrow`` file.
+        source: ``source_fingerprint`` of the file the frame was read from, checked by
+            ``load_dataset`` to rebuild stores whose source changed.
+    """
+    import pyarrow as pa
+
+    is_panel = 'unique_id' in df.columns and 'ds' in df.columns
+    df = normalize_frame(df)
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_METADATA_KEY] = json.dumps({'sorted_by_unique_id': is_panel, 'source': source}).encode()
+    table = table.replace_schema_metadata(metadata).combine_chunks()
+
+    os.makedirs(os.path.dirname(store_path) or '.', exist_ok=True)
+    with pa.OSFile(store_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=max(table.num_rows, 1))
+
+
+def read_store(store_path: str, columns: Optional[List[str]] = None, unique_ids: Optional[Iterable] = None) -> pd.DataFrame:
+    """Read a dataset store through a memory map, with column and series-subset pushdown.
+
+    Only the requested columns are converted, and for panels only the row ranges of the
+    requested series are touched, located by binary search on the sorted id codes.
+
+    Args:
+        store_path: Path of the ``.arrow`` file.
+        columns: Columns to read, default is all of them.
+        unique_ids: Series to read, default is all of them.
+
+    Returns:
+        DataFrame with ``ds`` as timestamps and ``unique_id`` as a categorical.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    table = pa.ipc.open_file(pa.memory_map(store_path, 'r')).read_all()
+    store_metadata = json.loads((table.schema.metadata or {}).get(_METADATA_KEY, b'{}'))
+
+    if unique_ids is not None:
+        ids = table.column('unique_id')
+        if store_metadata.get('sorted_by_unique_id') and ids.num_chunks == 1:
+            chunk = ids.chunk(0)
+            dictionary = np.asarray(chunk.dictionary.to_pylist(), dtype=object)
+            codes = chunk.indices.to_numpy(zero_copy_only=False)
+            requested = np.asarray([str(uid) for uid in unique_ids], dtype=object)
+            positions = np.searchsorted(dictionary, requested)
+            found = positions < len(dictionary)
+            found[found] = dictionary[positions[found]] == requested[found]
+            wanted = np.unique(positions[found])
+            starts = np.searchsorted(codes, wanted, side='left')
+            ends = np.searchsorted(codes, wanted, side='right')
+            table = pa.concat_tables([table.slice(start, end - start) for start, end in zip(starts, ends) if end > start] or [table.slice(0, 0)])
+        else:
+            mask = pc.is_in(pc.cast(ids, pa.string()), value_set=pa.array([str(uid) for uid in unique_ids]))
+            table = table.filter(mask)
+
+    if columns is not None:
+        table = table.select(columns)
+    return table.to_pandas()
+
+
+def store_is_current(store_path: str, csv_path: str) -> bool:
+    """Whether a store was converted from the current version of ``csv_path``.
+
+    A store without a CSV next to it is current; one whose recorded source size or
+    modification time differs from the CSV (or that recorded none) is stale.
+    """
+    import pyarrow as pa
+
+    if not os.path.exists(csv_path):
+        return True
+    with pa.memory_map(store_path, 'r') as source:
+        schema_metadata = pa.ipc.open_file(source).schema.metadata or {}
+    store_metadata = json.loads(schema_metadata.get(_METADATA_KEY, b'{}'))
+    return store_metadata.get('source') == source_fingerprint(csv_path)
+
+
+def load_dataset(path: str, columns: Optional[List[str]] = None, unique_ids: Optional[Iterable] = None,
+                 dtype_policy=None) -> pd.DataFrame:
+    """Load a dataset from its store if one exists, falling back to the CSV file.
+
+    A store older than its CSV is converted again first, so edited data is never
+    ignored. Both paths return the layout of ``normalize_frame``: ``ds`` as timestamps,
+    ``unique_id`` as a categorical of strings, and panels sorted by (unique_id, ds).
+
+    Args:
+        path: Path of a ``.csv`` file or of a ``.arrow`` store.
+        columns: Columns to read, default is all of them.
+        unique_ids: Series to read, default is all of them.
+        dtype_policy: Optional ``DtypePolicy`` applied to the loaded frame.
+
+    Returns:
+        DataFrame with ``ds`` parsed as datetime when present.
+    """
+    if path.endswith(STORE_EXTENSION):
+        store_path = path
+    else:
+        store_path = store_path_for(path)
+        if os.path.exists(store_path) and not store_is_current(store_path, path):
+            convert_csv_to_store(path, store_path)
+    if os.path.exists(store_path):
+        df = read_store(store_path, columns=columns, unique_ids=unique_ids)
+    else:
+        df = normalize_frame(pd.read_csv(path, usecols=columns))
+        if unique_ids is not None:
+            df = df[df['unique_id'].isin([str(uid) for uid in unique_ids])].reset_index(drop=True)
+    if dtype_policy is not None:
+        df = dtype_policy.apply(df, name=os.path.basename(path))
+    return df
+
+
+def convert_csv_to_store(csv_path: str, store_path: Optional[str] = None) -> str:
+    """Convert a CSV file into a dataset store once, returning the store path."""
+    store_path = store_path or store_path_for(csv_path)
+    write_store(pd.read_csv(csv_path), store_path, source=source_fingerprint(csv_path))
+    return store_path
+
+
+def main() -> None:
+    """Convert the example CSV files into memory-mappable Arrow IPC stores."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('csv_paths', nargs='+')
+    args = parser.parse_args()
+    for csv_path in args.csv_paths:
+        print(f"{csv_path} -> {convert_csv_to_store(csv_path)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional
+import numpy as np
+import pandas as pd
+from more_examples.response_cache import params_fingerprint
+from more_examples.tracing import propagate_context
+
+
+def split_into_batches(df: pd.DataFrame, max_rows: Optional[int] = None, max_bytes: Optional[int] = None) -> List[pd.DataFrame]:
+    """Split a panel into batches of whole series bounded by rows and estimated bytes.
+
+    Series are packed greedily in sorted ``unique_id`` order, so concatenating per-batch
+    results gives the same order as one call over the whole panel. A batch is closed when
+    the next series would take it over the bound, so no batch exceeds it; only a single
+    series larger than the bound gets a batch of its own.
+
+    Args:
+        df: Panel with a ``unique_id`` column.
+        max_rows: Maximum number of rows per batch.
+        max_bytes: Maximum estimated in-memory bytes per batch.
+
+    Returns:
+        List of DataFrames, one per batch.
+    """
+    if len(df) == 0:
+        return []
+    limits = [max_rows] if max_rows else []
+    if max_bytes:
+        bytes_per_row = max(df.memory_usage(index=False, deep=True).sum() / len(df), 1)
+        limits.append(int(max_bytes // bytes_per_row))
+    if not limits:
+        return [df]
+    rows_per_batch = max(min(limits), 1)
+
+    codes, _ = pd.factorize(df['unique_id'], sort=True)
+    order = np.argsort(codes, kind='stable')
+    series_bounds = np.r_[0, np.cumsum(np.bincount(codes))]
+    # One binary search per batch: the last series boundary that keeps the batch within the bound
+    batch_bounds = [0]
+    while batch_bounds[-1] < len(series_bounds) - 1:
+        start = batch_bounds[-1]
+        end = np.searchsorted(series_bounds, series_bounds[start] + rows_per_batch, side='right') - 1
+        batch_bounds.append(max(end, start + 1))
+    row_bounds = series_bounds[batch_bounds]
+    return [df.iloc[order[start:end]] for start, end in zip(row_bounds[:-1], row_bounds[1:])]
+
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits and unavailable upstreams
+TRANSIENT_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+# httpx/httpcore transport errors, matched by name so neither has to be imported
+_TRANSIENT_ERROR_NAMES = {'TransportError', 'TimeoutException', 'NetworkError', 'RemoteProtocolError'}
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Whether a failed call may succeed when retried: connection failures, timeouts and retryable HTTP statuses.
+
+    Invalid requests, authentication errors and bugs are not transient and are raised at once.
+    """
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    if any(cls.__name__ in _TRANSIENT_ERROR_NAMES for cls in type(exc).__mro__):
+        return True
+    status_code = getattr(exc, 'status_code', None) or getattr(getattr(exc, 'response', None), 'status_code', None)
+    return status_code in TRANSIENT_STATUS_CODES
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces calls at least ``1 / rate`` seconds apart."""
+
+    def __init__(self, rate: Optional[float] = None):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_time)
+            self._next_time = start + self.interval
+        time.sleep(max(start - now, 0.0))
+
+
+class BatchedDispatcher:
+    """Drop-in wrapper around ``NixtlaClient`` that sends a panel as concurrent series batches.
+
+    Exposes ``forecast``, ``cross_validation`` and ``detect_anomalies`` with the client's
+    signatures. Each call splits the panel with ``split_into_batches``, runs the batches
+    on a thread pool, retries batches that failed with a transient error only, and
+    concatenates results in batch order.
+
+    Fine-tuning calls (``finetune_steps > 0``) are sent unsplit by default: every batch
+    would fine-tune its own model on its own series, so results would depend on the
+    batching. Set ``split_finetune=True`` to accept that for panels too large for one request.
+
+    Args:
+        client: A ``NixtlaClient`` or any object with the same methods.
+        max_rows_per_batch: Maximum number of rows per request.
+        max_bytes_per_batch: Maximum estimated bytes per request.
+        max_workers: Maximum number of concurrent requests.
+        max_requests_per_second: Optional cap on the request rate.
+        max_retries: Number of retries per failed batch.
+        backoff_seconds: Initial retry delay, doubled after every failure.
+        split_finetune: Also split fine-tuning calls into batches.
+        retry_on: Predicate of the errors that are retried, default ``is_transient_error``.
+    """
+
+    def __init__(self, client, max_rows_per_batch: Optional[int] = 100_000, max_bytes_per_batch: Optional[int] = None,
+                 max_workers: int = 4, max_requests_per_second: Optional[float] = None, max_retries: int = 3,
+                 backoff_seconds: float = 1.0, split_finetune: bool = False,
+                 retry_on: Callable[[BaseException], bool] = is_transient_error):
+        self.client = client
+        self.max_rows_per_batch = max_rows_per_batch
+        self.max_bytes_per_batch = max_bytes_per_batch
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.split_finetune = split_finetune
+        self.retry_on = retry_on
+        self.rate_limiter = RateLimiter(max_requests_per_second)
+
+    def _call_with_retry(self, method: Callable, batch: pd.DataFrame, kwargs: dict) -> pd.DataFrame:
+        delay = self.backoff_seconds
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.wait()
+            try:
+                return method(df=batch, **kwargs)
+            except Exception as exc:
+                if attempt == self.max_retries or not self.retry_on(exc):
+                    raise
+                time.sleep(delay)
+                delay *= 2
+
+    def _dispatch(self, method_name: str, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        method = getattr(self.client, method_name)
+        if kwargs.get('finetune_steps') and not self.split_finetune:
+            return self._call_with_retry(method, df, kwargs)
+        batches = split_into_batches(df, self.max_rows_per_batch, self.max_bytes_per_batch)
+        if len(batches) <= 1:
+            return self._call_with_retry(method, df, kwargs)
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+            results = list(executor.map(propagate_context(lambda batch: self._call_with_retry(method, batch, kwargs)), batches))
+        return pd.concat(results, ignore_index=True)
+
+    def forecast(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        """Batched ``NixtlaClient.forecast``."""
+        return self._dispatch('forecast', df, **kwargs)
+
+    def cross_validation(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        """Batched ``NixtlaClient.cross_validation``."""
+        return self._dispatch('cross_validation', df, **kwargs)
+
+    def detect_anomalies(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        """Batched ``NixtlaClient.detect_anomalies``."""
+        return self._dispatch('detect_anomalies', df, **kwargs)
+
+
+class _Batch:
+    """Calls collected for one upstream request."""
+
+    def __init__(self):
+        self.items = []
+        self.rows = 0
+        self.full = threading.Event()
+
+
+class MicroBatcher:
+    """Wrapper that merges concurrent small calls with identical parameters into one upstream call.
+
+    The first call of a batch waits up to ``window`` seconds for other calls with the same
+    method and keyword arguments, then sends all their series in one request; a batch
+    that reaches ``max_rows`` rows is sent right away. Series ids are prefixed with the
+    caller's slot so equal ids from different callers do not collide, and every caller
+    gets back only its own rows, with its original ids.
+
+    Fine-tuning calls (``finetune_steps > 0``) and calls with exogenous ``X_df`` are sent
+    on their own: a merged request would fine-tune one model on every caller's series,
+    and each caller's future exogenous values would have to be merged and prefixed too.
+
+    Args:
+        client: A ``NixtlaClient``, ``BatchedDispatcher`` or any object with the same methods.
+        window: Seconds the first call of a batch waits for others.
+        max_rows: Rows that make a batch full.
+    """
+
+    def __init__(self, client, window: float = 0.02, max_rows: int = 100_000):
+        self.client = client
+        self.window = window
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._pending = {}
+        self.requests = 0
+        self.upstream_calls = 0
+
+    def _send(self, method_name: str, items: list, kwargs: dict) -> None:
+        try:
+            for future, result in zip((future for _, future in items), self._call(method_name, items, kwargs)):
+                future.set_result(result)
+        except Exception as exc:
+            # The callers are blocked on their futures, so every error must reach them
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(exc)
+
+    def _call(self, method_name: str, items: list, kwargs: dict) -> List[pd.DataFrame]:
+        """One upstream call for all ``items``, split back into one result per caller."""
+        id_col = kwargs.get('id_col', 'unique_id')
+        frames = [df.assign(**{id_col: f'{slot}|' + df[id_col].astype(str)}) for slot, (df, _) in enumerate(items)]
+        response = getattr(self.client, method_name)(df=pd.concat(frames, ignore_index=True), **kwargs)
+        if not len(response):
+            return [response] * len(items)
+        slot_ids = response[id_col].astype(str).str.split('|', n=1, expand=True)
+        slots = slot_ids[0].astype(int).to_numpy()
+        response = response.assign(**{id_col: slot_ids[1].to_numpy()})
+        order = np.argsort(slots, kind='stable')
+        bounds = np.searchsorted(slots[order], np.arange(len(items) + 1))
+        return [response.iloc[order[bounds[slot]:bounds[slot + 1]]].reset_index(drop=True) for slot in range(len(items))]
+
+    def _submit(self, method_name: str, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        if kwargs.get('finetune_steps') or kwargs.get('X_df') is not None:
+            with self._lock:
+                self.requests += 1
+                self.upstream_calls += 1
+            return getattr(self.client, method_name)(df=df, **kwargs)
+        key = params_fingerprint(method_name, kwargs)
+        future = Future()
+        with self._lock:
+            self.requests += 1
+            batch = self._pending.get(key)
+            is_leader = batch is None
+            if is_leader:
+                batch = self._pending[key] = _Batch()
+            batch.items.append((df, future))
+            batch.rows += len(df)
+            if batch.rows >= self.max_rows:
+                batch.full.set()
+        if is_leader:
+            batch.full.wait(self.window)
+            with self._lock:
+                # Later calls start a new batch from here on
+                del self._pending[key]
+                self.upstream_calls += 1
+            self._send(method_name, batch.items, kwargs)
+        return future.result()
+
+    def stats(self) -> dict:
+        """Calls received and upstream calls made."""
+        with self._lock:
+            return {'requests': self.requests, 'upstream_calls': self.upstream_calls}
+
+    def forecast(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        """Micro-batched ``NixtlaClient.forecast``."""
+        return self._submit('forecast', df, **kwargs)
+
+    def cross_validation(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        """Micro-batched ``NixtlaClient.cross_validation``."""
+        return self._submit('cross_validation', df, **kwargs)
+
+    def detect_anomalies(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        """Micro-batched ``NixtlaClient.detect_anomalies``."""
+        return self._submit('detect_anomalies', df, **kwargs)
@@ -0,0 +1,109 @@
+import threading
+from typing import List, Optional
+import numpy as np
+import pandas as pd
+
+
+def memory_bytes(df: pd.DataFrame) -> int:
+    """Deep in-memory size of a frame, including the strings of object columns."""
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def unify_ids(*frames: pd.DataFrame, id_col: str = 'unique_id') -> List[pd.DataFrame]:
+    """Give the id column of every frame the same categorical dtype, so merges keep it categorical.
+
+    pandas merges two categoricals on their codes only when the categories are equal; any
+    other combination falls back to object. The union of all ids becomes the categories.
+    """
+    categories = pd.Index([])
+    for frame in frames:
+        ids = frame[id_col]
+        values = ids.cat.categories if isinstance(ids.dtype, pd.CategoricalDtype) else pd.Index(ids.unique())
+        categories = categories.union(values.astype(str))
+    dtype = pd.CategoricalDtype(categories)
+    unified = []
+    for frame in frames:
+        ids = frame[id_col]
+        if ids.dtype != dtype:
+            frame = frame.assign(**{id_col: ids.astype(str).astype(dtype)})
+        unified.append(frame)
+    return unified
+
+
+class DtypePolicy:
+    """Compact dtypes applied at load time, with one id dictionary shared by every frame it loads.
+
+    - ``unique_id`` becomes a categorical whose categories are the shared, sorted
+      dictionary of all ids seen so far, so train, test and forecast frames merge on codes.
+    - ``ds`` becomes ``datetime64[ns]`` (int64 nanoseconds).
+    - Other numeric columns (exogenous features) are downcast only when it is lossless:
+      float64 to float32 when every value survives the round trip exactly, integers to
+      the smallest integer dtype that holds them.
+    - The target (``keep_cols``) stays as loaded, so the API and the metrics see the
+      same values as without the policy.
+
+    Every ``apply`` records the memory before and after, available from ``report``.
+
+    Args:
+        keep_cols: Columns never downcast, default ``['y']``.
+    """
+
+    def __init__(self, keep_cols: Optional[List[str]] = None):
+        self.keep_cols = ['y'] if keep_cols is None else keep_cols
+        self.ids = pd.Index([], dtype=object)
+        self._reports = []
+        self._lock = threading.Lock()
+
+    @property
+    def id_dtype(self) -> pd.CategoricalDtype:
+        return pd.CategoricalDtype(self.ids)
+
+    def _extend_ids(self, ids: pd.Series) -> None:
+        values = ids.cat.categories if isinstance(ids.dtype, pd.CategoricalDtype) else pd.Index(ids.unique())
+        with self._lock:
+            new_ids = pd.Index(values.astype(str)).difference(self.ids)
+            if len(new_ids):
+                # ``union`` with an empty index returns the other one unsorted
+                self.ids = self.ids.append(new_ids).sort_values()
+
+    def encode_ids(self, df: pd.DataFrame, id_col: str = 'unique_id') -> pd.DataFrame:
+        """Cast the id column to the shared dictionary, extending it with unseen ids."""
+        self._extend_ids(df[id_col])
+        ids = df[id_col]
+        if isinstance(ids.dtype, pd.CategoricalDtype):
+            # Remap codes only; no per-row string handling
+            ids = ids.cat.rename_categories(ids.cat.categories.astype(str)).cat.set_categories(self.ids)
+        else:
+            ids = pd.Categorical(ids.astype(str), dtype=self.id_dtype)
+        return df.assign(**{id_col: ids})
+
+    def apply(self, df: pd.DataFrame, name: str = '') -> pd.DataFrame:
+        """Apply the policy to a loaded frame and record its memory footprint before and after."""
+        before = memory_bytes(df)
+        if 'unique_id' in df.columns:
+            df = self.encode_ids(df)
+        if 'ds' in df.columns and df['ds'].dtype != 'datetime64[ns]':
+            df = df.assign(ds=pd.to_datetime(df['ds']).astype('datetime64[ns]'))
+        for col in df.columns:
+            if col in self.keep_cols or col in ('unique_id', 'ds'):
+                continue
+            if df[col].dtype == np.float64:
+                values = df[col].to_numpy()
+                compact = values.astype(np.float32)
+                if np.array_equal(compact.astype(np.float64), values, equal_nan=True):
+                    df = df.assign(**{col: compact})
+            elif df[col].dtype == np.int64:
+                df = df.assign(**{col: pd.to_numeric(df[col], downcast='integer')})
+        with self._lock:
+            self._reports.append({'frame': name, 'rows': len(df), 'bytes_before': before, 'bytes_after': memory_bytes(df)})
+        return df
+
+    def report(self) -> pd.DataFrame:
+        """Memory footprint of every frame loaded through the policy."""
+        report = pd.DataFrame(self._reports, columns=['frame', 'rows', 'bytes_before', 'bytes_after'])
+        report['ratio'] = report['bytes_after'] / report['bytes_before'].where(report['bytes_before'] > 0)
+        return report
+
+
+# One policy per process, so every example loader shares the id dictionary
+DTYPE_POLICY = DtypePolicy()
@@ -0,0 +1,117 @@
+import time
+import threading
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+
+def _future_dates(last_ds: pd.Series, prev_ds: pd.Series, h: int, freq: Optional[str]) -> np.ndarray:
+    """Return an array of shape (series, h) with the ``h`` timestamps after ``last_ds``."""
+    last_ds = pd.DatetimeIndex(last_ds)
+    steps = []
+    for step in range(1, h + 1):
+        if freq is None:
+            steps.append(last_ds + (last_ds - pd.DatetimeIndex(prev_ds)) * step)
+        else:
+            steps.append(last_ds + step * pd.tseries.frequencies.to_offset(freq))
+    return np.stack([np.asarray(step_ds) for step_ds in steps], axis=1)
+
+
+class FakeNixtlaClient:
+    """Offline stand-in for ``NixtlaClient`` with a configurable latency model.
+
+    Forecasts are seasonal-naive (last value), so results are deterministic and cheap.
+    Each call sleeps ``latency + latency_per_row * len(df)`` seconds to mimic the API.
+
+    Args:
+        latency: Fixed seconds per call.
+        latency_per_row: Extra seconds per input row.
+        failure_rate: Probability that a call raises ``ConnectionError``, to exercise retries.
+        seed: Seed of the failure draws.
+    """
+
+    def __init__(self, latency: float = 0.0, latency_per_row: float = 0.0, failure_rate: float = 0.0, seed: Optional[int] = None):
+        self.latency = latency
+        self.latency_per_row = latency_per_row
+        self.failure_rate = failure_rate
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.rows_received = 0
+
+    def _simulate_call(self, df: pd.DataFrame) -> None:
+        with self._lock:
+            self.calls += 1
+            self.rows_received += len(df)
+            failed = self._rng.random() < self.failure_rate
+        time.sleep(self.latency + self.latency_per_row * len(df))
+        if failed:
+            raise ConnectionError("Simulated API failure")
+
+    @staticmethod
+    def _sorted(df: pd.DataFrame, time_col: str) -> pd.DataFrame:
+        return df.sort_values(['unique_id', time_col], kind='stable').reset_index(drop=True)
+
+    def forecast(self, df: pd.DataFrame, h: int, freq: Optional[str] = None, time_col: str = 'ds', target_col: str = 'y',
+                 add_history: bool = False, **kwargs) -> pd.DataFrame:
+        """Return last-value forecasts for the next ``h`` periods of every series."""
+        self._simulate_call(df)
+        df = self._sorted(df, time_col)
+        last = df.groupby('unique_id', sort=False, observed=True).tail(2)
+        last_rows = last.groupby('unique_id', sort=False, observed=True).tail(1)
+        prev_rows = last.groupby('unique_id', sort=False, observed=True).head(1)
+        future = _future_dates(last_rows[time_col], prev_rows[time_col], h, freq)
+        fcst_df = pd.DataFrame({
+            'unique_id': np.repeat(last_rows['unique_id'].to_numpy(), h),
+            time_col: future.ravel(),
+            'TimeGPT': np.repeat(last_rows[target_col].to_numpy(dtype=float), h),
+        })
+        if add_history:
+            # Fitted values are the previous observation of each series
+            history = df[['unique_id', time_col]].copy()
+            history['TimeGPT'] = df.groupby('unique_id', sort=False, observed=True)[target_col].shift(1).to_numpy()
+            history = history.dropna(subset=['TimeGPT'])
+            fcst_df = pd.concat([history, fcst_df]).sort_values(['unique_id', time_col], kind='stable').reset_index(drop=True)
+        return fcst_df
+
+    def cross_validation(self, df: pd.DataFrame, h: int, n_windows: int = 1, step_size: Optional[int] = None,
+                         freq: Optional[str] = None, time_col: str = 'ds', target_col: str = 'y', **kwargs) -> pd.DataFrame:
+        """Return last-value forecasts for ``n_windows`` rolling origins of every series."""
+        self._simulate_call(df)
+        df = self._sorted(df, time_col)
+        step_size = step_size or h
+        sizes = df.groupby('unique_id', sort=False, observed=True).size().to_numpy()
+        ends = np.cumsum(sizes)
+        frames = []
+        for window in range(n_windows):
+            # Rows of this window are the h points after the cutoff of every series
+            cutoff_pos = ends - 1 - h - (n_windows - 1 - window) * step_size
+            valid = cutoff_pos >= ends - sizes
+            rows = (cutoff_pos[valid, None] + np.arange(1, h + 1)).ravel()
+            cutoff_rows = np.repeat(cutoff_pos[valid], h)
+            frames.append(pd.DataFrame({
+                'unique_id': df['unique_id'].to_numpy()[rows],
+                time_col: df[time_col].to_numpy()[rows],
+                'cutoff': df[time_col].to_numpy()[cutoff_rows],
+                target_col: df[target_col].to_numpy()[rows],
+                'TimeGPT': df[target_col].to_numpy(dtype=float)[cutoff_rows],
+            }))
+        return pd.concat(frames).sort_values(['unique_id', 'cutoff', time_col], kind='stable').reset_index(drop=True)
+
+    def detect_anomalies(self, df: pd.DataFrame, freq: Optional[str] = None, time_col: str = 'ds', target_col: str = 'y',
+                         level: float = 99, **kwargs) -> pd.DataFrame:
+        """Flag points outside a normal interval around each series' mean."""
+        self._simulate_call(df)
+        df = self._sorted(df, time_col)
+        grouped = df.groupby('unique_id', sort=False, observed=True)[target_col]
+        mean = grouped.transform('mean').to_numpy(dtype=float)
+        std = grouped.transform('std').fillna(0).to_numpy(dtype=float)
+        z = {80: 1.2816, 90: 1.6449, 95: 1.96, 99: 2.5758}.get(int(level), 2.5758)
+        label = int(level)
+        anomalies_df = df[['unique_id', time_col, target_col]].copy()
+        anomalies_df['TimeGPT'] = mean
+        anomalies_df[f'TimeGPT-lo-{label}'] = mean - z * std
+        anomalies_df[f'TimeGPT-hi-{label}'] = mean + z * std
+        values = anomalies_df[target_col].to_numpy(dtype=float)
+        anomalies_df['anomaly'] = ((values < mean - z * std) | (values > mean + z * std)).astype(int)
+        return anomalies_df
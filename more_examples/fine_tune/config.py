@@ -1 +1 @@
-DIRSAVEPLOTPATH = r"C:\Users\yotam\code_projects\TimeGPT_Check\more_examples\fine_tune\save_plot"
\ No newline at end of file
+DIRSAVEPLOTPATH = "more_examples/fine_tune/save_plot"
\ No newline at end of file
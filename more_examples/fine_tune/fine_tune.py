@@ -1,13 +1,26 @@
 import os
+import functools
 import pandas as pd
+from typing import Callable, List, Optional
 from nixtla import NixtlaClient
-from more_examples.config import DATASETTRAINPATH, DATASETTESTPATH
-from more_examples.fine_tune.utils import load_and_prepare_data, mape
+from more_examples.config import DATASETTRAINPATH, DATASETTESTPATH, RESPONSECACHEDIR, CHECKPOINTDIR
+from more_examples.fine_tune.utils import load_and_prepare_data
+from more_examples.metrics import evaluate
 from more_examples.utils import load_environment_variables
+from more_examples.dispatcher import BatchedDispatcher
+from more_examples.response_cache import CachedClient, ResponseCache
+from more_examples.payload_shaping import TrimmedClient
+from more_examples.incremental import IncrementalForecaster
+from more_examples.tracing import Tracer
+from more_examples.pipeline import Pipeline, export_csv
+from more_examples.dataset_store import store_path_for
+from more_examples.panel_index import PanelIndex
+from more_examples.dtype_policy import DTYPE_POLICY, unify_ids
 from more_examples.fine_tune.config import DIRSAVEPLOTPATH
 
 
-def fine_tune_forecast(client: NixtlaClient, df_train: pd.DataFrame, finetune_steps: int = 12, h: int = 1) -> pd.DataFrame:
+def fine_tune_forecast(client: NixtlaClient, df_train: pd.DataFrame, finetune_steps: int = 12, h: int = 1, state_dir: Optional[str] = None,
+                       finetune_loss: str = 'mae', freq: Optional[str] = None) -> pd.DataFrame:
     """Fine-tune a forecast model using Nixtla TimeGPT.
 
     Args:
@@ -15,68 +28,100 @@ def fine_tune_forecast(client: NixtlaClient, df_train: pd.DataFrame, finetune_st
         df_train: DataFrame containing training data.
         finetune_steps: Number of fine-tuning steps, default is 12.
         h: Forecast horizon, default is 1.
+        state_dir: If given, only series whose history changed since the last run
+            in this directory are sent, and the stored forecasts are reused for the rest.
+        finetune_loss: Loss function used for fine-tuning, default is ``'mae'``.
+        freq: Frequency of the data, inferred by the client when not given.
 
     Returns:
         DataFrame containing forecasted results.
     """
+    if state_dir is not None:
+        client = IncrementalForecaster(client, state_dir)
     return client.forecast(
         df=df_train,
         h=h,
         finetune_steps=finetune_steps,
-        finetune_loss='mae',  # Using MAE as the loss function for fine-tuning
+        finetune_loss=finetune_loss,
+        freq=freq,
         time_col='ds',
         target_col='y',
     )
 
 
-def calculate_mape_per_unique_id(df_test: pd.DataFrame, forecast_df: pd.DataFrame) -> pd.DataFrame:
+def filter_short_series(df_train: pd.DataFrame, min_length: int = 36) -> pd.DataFrame:
+    """Keep the series with at least ``min_length`` rows."""
+    return PanelIndex(df_train).filter_min_length(min_length)
+
+
+def calculate_mape_per_unique_id(df_test: pd.DataFrame, forecast_df: pd.DataFrame, on: Optional[List[str]] = None) -> pd.DataFrame:
     """Merge forecast data into the test set and calculate MAPE for each unique_id.
 
     Args:
         df_test: DataFrame containing test data.
         forecast_df: DataFrame containing forecasted data.
+        on: Merge keys, default is ``['unique_id']`` (one test row per series); use
+            ``['unique_id', 'ds']`` when the horizon is longer than one step.
 
     Returns:
         DataFrame with MAPE calculated for each unique_id.
     """
-    df_test = pd.merge(df_test, forecast_df[["unique_id", "TimeGPT"]], on=['unique_id'], how='left')
-    df_test["mape"] = df_test.apply(lambda x: mape(x["y"], x["TimeGPT"]), axis=1)
-
-    # Create a results DataFrame to store MAPE for each unique_id
-    df_res = pd.DataFrame(columns=['unique_id', 'mape'])
-    
-    for unique_id in df_test['unique_id'].unique():
-        df_test_temp = df_test[df_test['unique_id'] == unique_id]
-        mean_mape = df_test_temp['mape'].mean()
-        df_res = pd.concat([df_res, pd.DataFrame({'unique_id': [unique_id], 'mape': [mean_mape]})], ignore_index=True)
-    
+    # Same categorical ids on both sides, so the merge runs on codes and keeps them categorical
+    df_test, forecast_df = unify_ids(df_test, forecast_df)
+    on = on or ['unique_id']
+    df_test = pd.merge(df_test, forecast_df[on + ["TimeGPT"]], on=on, how='left')
+
+    # Average the per-row MAPE for each unique_id in one grouped pass
+    df_res = evaluate(df_test, ["TimeGPT"], metrics=["mape"])
+    df_res = df_res[["unique_id", "TimeGPT"]].rename(columns={"TimeGPT": "mape"})
+
     # Handle NaN values in MAPE by replacing with 100
     df_res["mape"] = df_res["mape"].fillna(100)
     return df_res
 
 
-def main() -> None:
-    """Main function to load data, fine-tune, calculate MAPE, and save results."""
-    # Load environment variables and initialize NixtlaClient
-    api_key = load_environment_variables()
-    nixtla_client = NixtlaClient(api_key=api_key)
-    # Load and prepare train and test datasets
-    df_train = load_and_prepare_data(DATASETTRAINPATH)
-    df_test = load_and_prepare_data(DATASETTESTPATH)
+def build_pipeline(nixtla_client, tracer=None, save_dir: str = DIRSAVEPLOTPATH,
+                   load: Optional[Callable[[str], pd.DataFrame]] = None, checkpoint_dir: str = CHECKPOINTDIR) -> Pipeline:
+    """Stage graph of the fine-tuning experiment, with its results saved under ``save_dir``.
 
+    ``load`` replaces ``load_and_prepare_data`` as the loader of the datasets by path, e.g.
+    ``SharedDatasets.load``; datasets it serves are already in memory, so they are not checkpointed.
+    """
+    pipeline = Pipeline(os.path.join(checkpoint_dir, 'fine_tune'), tracer=tracer)
+    # Load and prepare train and test datasets
+    pipeline.add('load_train', load or load_and_prepare_data, params={'path': DATASETTRAINPATH},
+                 files=[DATASETTRAINPATH, store_path_for(DATASETTRAINPATH)], checkpoint=load is None)
+    pipeline.add('load_test', load or load_and_prepare_data, params={'path': DATASETTESTPATH},
+                 files=[DATASETTESTPATH, store_path_for(DATASETTESTPATH)], checkpoint=load is None)
     # Filter out short time series
-    df_train = df_train.groupby('unique_id').filter(lambda x: len(x) >= 36)
-
+    pipeline.add('filter_short_series', filter_short_series, inputs=['load_train'], params={'min_length': 36})
     # Fine-tune the forecast model
-    timegpt_fcst_finetune_df = fine_tune_forecast(nixtla_client, df_train, finetune_steps=12, h=1)
-
+    pipeline.add('fine_tune_forecast', functools.partial(fine_tune_forecast, nixtla_client), inputs=['filter_short_series'],
+                 params={'finetune_steps': 12, 'h': 1})
     # Calculate MAPE per unique_id
-    df_res = calculate_mape_per_unique_id(df_test, timegpt_fcst_finetune_df)
-
+    pipeline.add('calculate_mape', calculate_mape_per_unique_id, inputs=['load_test', 'fine_tune_forecast'])
     # Save the results
-    os.makedirs(DIRSAVEPLOTPATH, exist_ok=True)
-    df_res.to_csv(os.path.join(DIRSAVEPLOTPATH, 'df_res.csv'), index=False)
+    results_path = os.path.join(save_dir, 'df_res.csv')
+    pipeline.add('save_results', export_csv, inputs=['calculate_mape'], params={'path': results_path}, outputs=[results_path])
+    return pipeline
+
+
+def main() -> None:
+    """Main function to load data, fine-tune, calculate MAPE, and save results."""
+    tracer = Tracer('fine_tune')
+    # Load environment variables and initialize NixtlaClient
+    api_key = load_environment_variables()
+    cached_client = CachedClient(BatchedDispatcher(tracer.client(NixtlaClient(api_key=api_key))), ResponseCache(RESPONSECACHEDIR))
+    nixtla_client = TrimmedClient(cached_client)
+    pipeline = build_pipeline(nixtla_client, tracer)
+    pipeline.run()
+    pipeline.prune()
     print(f"Results saved to {DIRSAVEPLOTPATH}")
+    print(f"Stages: {pipeline.last_run}")
+    print(f"Memory footprint:\n{DTYPE_POLICY.report()}")
+
+    print(f"Response cache: {cached_client.cache.stats()}")
+    print(f"Payload shaping: {nixtla_client.stats()}")
 
 
 if __name__ == "__main__":
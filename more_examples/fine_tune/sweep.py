@@ -0,0 +1,210 @@
+import os
+import json
+import time
+import hashlib
+import argparse
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from nixtla import NixtlaClient
+from more_examples.config import DATASETTRAINPATH, RESPONSECACHEDIR, CHECKPOINTDIR
+from more_examples.fine_tune.config import DIRSAVEPLOTPATH
+from more_examples.fine_tune.utils import load_and_prepare_data
+from more_examples.fine_tune.fine_tune import fine_tune_forecast, filter_short_series, calculate_mape_per_unique_id
+from more_examples.utils import load_environment_variables
+from more_examples.dispatcher import BatchedDispatcher
+from more_examples.response_cache import CachedClient, ResponseCache
+from more_examples.pipeline import export_csv
+from more_examples.panel_index import PanelIndex
+from more_examples.tracing import propagate_context
+
+
+def rung_sizes(n_series: int, n_configs: int, eta: int = 3, min_series: int = 50) -> List[int]:
+    """Series evaluated at every rung: the last rung uses all of them, each earlier one ``eta`` times fewer.
+
+    There are as many rungs as it takes to prune ``n_configs`` down to one, keeping the
+    best ``ceil(n / eta)`` configurations after each rung.
+    """
+    n_rungs, remaining = 1, n_configs
+    while remaining > 1:
+        remaining = -(-remaining // eta)
+        n_rungs += 1
+    return [max(min(min_series, n_series), n_series // eta ** (n_rungs - 1 - rung)) for rung in range(n_rungs)]
+
+
+class FineTuneSweep:
+    """Successive-halving sweep over ``finetune_steps`` and ``finetune_loss`` for every horizon.
+
+    Each horizon is its own bracket, since MAPEs of different horizons are not comparable.
+    At every rung the surviving configurations of all brackets are evaluated concurrently
+    on a nested, growing random subset of series: the last ``h`` points of each series are
+    held out and scored with ``calculate_mape_per_unique_id``. Only the best
+    ``ceil(n / eta)`` configurations of a bracket reach the next rung, and the last rung
+    uses every series. ``finetune_steps=0`` does no fine-tuning, so it is one
+    configuration whatever the loss. With a ``CachedClient``, evaluations without
+    fine-tuning only send the series not sent at an earlier rung; fine-tuned evaluations
+    train on the whole subset, so they are cached per subset and send it in full.
+
+    Every evaluation is appended to ``<sweep_dir>/sweep-<id>.jsonl`` as soon as it
+    finishes, where the id hashes the data, grid and schedule; re-running the same sweep
+    skips the evaluations already recorded.
+
+    Args:
+        client: A ``NixtlaClient`` or a wrapper with the same ``forecast`` method.
+        sweep_dir: Directory of the result files.
+        finetune_steps: Values of ``finetune_steps`` to try.
+        finetune_losses: Values of ``finetune_loss`` to try.
+        horizons: Horizons to sweep, one bracket each.
+        eta: Pruning factor and subset growth factor between rungs.
+        min_series: Series evaluated at the first rung.
+        max_workers: Evaluations run concurrently.
+        seed: Seed of the series order.
+        freq: Frequency of the data, so forecast timestamps match the held-out ones.
+    """
+
+    def __init__(self, client, sweep_dir: str, finetune_steps: Sequence[int] = (0, 6, 12, 24),
+                 finetune_losses: Sequence[str] = ('default', 'mae', 'mse'), horizons: Sequence[int] = (1,),
+                 eta: int = 3, min_series: int = 50, max_workers: int = 4, seed: int = 0, freq: Optional[str] = None):
+        if eta < 2:
+            raise ValueError("eta must be at least 2")
+        self.client = client
+        self.sweep_dir = sweep_dir
+        # The loss only matters when fine-tuning
+        self.configs = [(0, 'default')] if 0 in finetune_steps else []
+        self.configs += list(itertools.product([steps for steps in finetune_steps if steps], finetune_losses))
+        self.horizons = list(horizons)
+        self.eta = eta
+        self.min_series = min_series
+        self.max_workers = max_workers
+        self.seed = seed
+        self.freq = freq
+        self._lock = threading.Lock()
+
+    def _sweep_id(self, df: pd.DataFrame) -> str:
+        data_hash = pd.util.hash_pandas_object(df[['unique_id', 'ds', 'y']], index=False).to_numpy()
+        payload = json.dumps({
+            'data': hashlib.sha256(data_hash.tobytes()).hexdigest(),
+            'configs': self.configs,
+            'horizons': self.horizons,
+            'eta': self.eta,
+            'min_series': self.min_series,
+            'seed': self.seed,
+            'freq': self.freq,
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+    @staticmethod
+    def _key(h: int, steps: int, loss: str, rung: int) -> Tuple:
+        return (int(h), int(steps), str(loss), int(rung))
+
+    def _load(self, path: str) -> dict:
+        records = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    # A line cut short by an interruption is evaluated again
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    records[self._key(record['h'], record['finetune_steps'], record['finetune_loss'], record['rung'])] = record
+        return records
+
+    def _write(self, path: str, record: dict) -> None:
+        with self._lock, open(path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+
+    def run(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Run (or resume) the sweep on a panel and return one row per evaluation.
+
+        Columns are ``h``, ``finetune_steps``, ``finetune_loss``, ``rung``, ``n_series``,
+        ``mape`` (mean over the evaluated series), ``wall_s`` and ``resumed``.
+        """
+        os.makedirs(self.sweep_dir, exist_ok=True)
+        path = os.path.join(self.sweep_dir, f'sweep-{self._sweep_id(df)}.jsonl')
+        records = self._load(path)
+        resumed = set(records)
+
+        index = PanelIndex(df)
+        # Nested subsets: the first n series of one fixed random order
+        rank = np.empty(len(index), dtype=np.int64)
+        rank[np.random.default_rng(self.seed).permutation(len(index))] = np.arange(len(index))
+        row_rank = rank[index.codes]
+        row_size = np.repeat(index.sizes, index.sizes)
+        from_end = index.positions_from_end()
+
+        def evaluate(h: int, steps: int, loss: str, rung: int, n_series: int) -> dict:
+            # Series need at least one training row besides the h held-out ones
+            in_subset = (row_rank < n_series) & (row_size > h)
+            train = index.df[in_subset & (from_end >= h)]
+            holdout = index.df[in_subset & (from_end < h)]
+            start = time.perf_counter()
+            forecast = fine_tune_forecast(self.client, train, finetune_steps=steps, h=h, finetune_loss=loss, freq=self.freq)
+            scores = calculate_mape_per_unique_id(holdout, forecast, on=['unique_id', 'ds'])
+            record = {
+                'h': h, 'finetune_steps': steps, 'finetune_loss': loss, 'rung': rung, 'n_series': n_series,
+                'mape': float(scores['mape'].mean()), 'wall_s': time.perf_counter() - start,
+            }
+            self._write(path, record)
+            return record
+
+        survivors = {h: list(self.configs) for h in self.horizons}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for rung, n_series in enumerate(rung_sizes(len(index), len(self.configs), self.eta, self.min_series)):
+                jobs = [(h, steps, loss) for h in self.horizons for steps, loss in survivors[h]]
+                todo = [job for job in jobs if self._key(*job, rung) not in records]
+                futures = [executor.submit(propagate_context(evaluate), h, steps, loss, rung, n_series) for h, steps, loss in todo]
+                for future in futures:
+                    record = future.result()
+                    records[self._key(record['h'], record['finetune_steps'], record['finetune_loss'], rung)] = record
+                for h in self.horizons:
+                    ranked = sorted(survivors[h], key=lambda config: records[self._key(h, *config, rung)]['mape'])
+                    survivors[h] = ranked[:-(-len(ranked) // self.eta)]
+
+        results = pd.DataFrame(list(records.values()))
+        results['resumed'] = [self._key(h, steps, loss, rung) in resumed for h, steps, loss, rung in
+                              results[['h', 'finetune_steps', 'finetune_loss', 'rung']].itertuples(index=False)]
+        return results.sort_values(['h', 'rung', 'mape'], kind='stable').reset_index(drop=True)
+
+
+def best_configs(results: pd.DataFrame) -> pd.DataFrame:
+    """Best configuration of every horizon: the lowest MAPE at the last rung it reached."""
+    last_rung = results.groupby('h')['rung'].transform('max')
+    final = results[results['rung'] == last_rung]
+    return final.loc[final.groupby('h')['mape'].idxmin()].reset_index(drop=True)
+
+
+def main() -> None:
+    """Sweep fine-tuning settings on a holdout of the training data and save the results."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--finetune-steps', type=int, nargs='+', default=[0, 6, 12, 24])
+    parser.add_argument('--finetune-losses', nargs='+', default=['default', 'mae', 'mse'])
+    parser.add_argument('--horizons', type=int, nargs='+', default=[1])
+    parser.add_argument('--eta', type=int, default=3)
+    parser.add_argument('--min-series', type=int, default=50)
+    parser.add_argument('--max-workers', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--freq', help='Frequency of the data, inferred when not given')
+    parser.add_argument('--min-length', type=int, default=36, help='Shorter series are left out')
+    parser.add_argument('--sweep-dir', default=os.path.join(CHECKPOINTDIR, 'fine_tune_sweep'))
+    args = parser.parse_args()
+
+    api_key = load_environment_variables()
+    nixtla_client = CachedClient(BatchedDispatcher(NixtlaClient(api_key=api_key)), ResponseCache(RESPONSECACHEDIR))
+    df_train = filter_short_series(load_and_prepare_data(DATASETTRAINPATH), min_length=args.min_length)
+
+    sweep = FineTuneSweep(nixtla_client, args.sweep_dir, finetune_steps=args.finetune_steps, finetune_losses=args.finetune_losses,
+                          horizons=args.horizons, eta=args.eta, min_series=args.min_series, max_workers=args.max_workers, seed=args.seed,
+                          freq=args.freq)
+    results = sweep.run(df_train)
+    export_csv(results, os.path.join(DIRSAVEPLOTPATH, 'sweep_results.csv'))
+    print(f"Evaluations: {len(results)} ({int(results['resumed'].sum())} resumed)")
+    print(f"Best configurations:\n{best_configs(results)}")
+    print(f"Response cache: {nixtla_client.cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
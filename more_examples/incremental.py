@@ -0,0 +1,136 @@
+import os
+import json
+from typing import Tuple
+import numpy as np
+import pandas as pd
+from more_examples.dataset_store import read_store, write_store
+from more_examples.response_cache import params_fingerprint
+
+_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _cumulative_hashes(df: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+    """Sort rows by (unique_id, ds) and return per-series sizes and position-weighted hash sums.
+
+    Returns:
+        Tuple of (state frame with ``unique_id``, ``n_rows``, ``last_ds``, ``y_hash``),
+        the wrapping cumulative sum of weighted row hashes and the first row of every series.
+    """
+    codes, uniques = pd.factorize(df['unique_id'], sort=True)
+    ds = pd.to_datetime(df['ds']).to_numpy().astype('datetime64[ns]').view('int64')
+    order = np.lexsort((ds, codes))
+    y = df['y'].to_numpy(dtype=np.float64)[order]
+    sizes = np.bincount(codes, minlength=len(uniques))
+    starts = np.cumsum(sizes) - sizes
+    positions = (np.arange(len(order)) - np.repeat(starts, sizes)).astype(np.uint64)
+    with np.errstate(over='ignore'):
+        row_hashes = pd.util.hash_array(ds[order]) * _MULTIPLIER + pd.util.hash_array(y)
+        cumulative = np.cumsum(row_hashes * ((positions + np.uint64(1)) * _MULTIPLIER))
+    ends = starts + sizes - 1
+    state = pd.DataFrame({
+        'unique_id': uniques,
+        'n_rows': sizes,
+        'last_ds': ds[order][ends].astype('datetime64[ns]') if len(order) else np.array([], dtype='datetime64[ns]'),
+        'y_hash': _prefix_hashes(cumulative, starts, sizes),
+    })
+    return state, cumulative, starts
+
+
+def _prefix_hashes(cumulative: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Hash of the first ``lengths`` rows of every series from the global cumulative sum."""
+    if not len(cumulative):
+        return np.zeros(len(starts), dtype=np.uint64)
+    padded = np.r_[np.uint64(0), cumulative]
+    with np.errstate(over='ignore'):
+        return padded[starts + lengths] - padded[starts]
+
+
+def series_state(df: pd.DataFrame) -> pd.DataFrame:
+    """Fingerprint every series: row count, last timestamp and a rolling hash of (ds, y)."""
+    return _cumulative_hashes(df)[0]
+
+
+def detect_changes(df: pd.DataFrame, previous: pd.DataFrame) -> pd.DataFrame:
+    """Classify every series against the fingerprints of a previous run.
+
+    The prefix of each current series with the previous row count is hashed from the same
+    cumulative sum, so appended series are told apart from modified ones without a loop.
+
+    Args:
+        df: Current panel.
+        previous: Output of ``series_state`` from the previous run.
+
+    Returns:
+        The current ``series_state`` plus a ``status`` column: ``'unchanged'``,
+        ``'appended'``, ``'modified'`` or ``'new'``.
+    """
+    state, cumulative, starts = _cumulative_hashes(df)
+    # Index positions instead of a reindex, which would turn uint64 hashes into floats;
+    # unknown ids (-1) pick the zero sentinel appended at the end
+    positions = pd.Index(previous['unique_id'].astype(str)).get_indexer(state['unique_id'].astype(str))
+    known = positions >= 0
+    prev_rows = np.r_[previous['n_rows'].to_numpy(dtype=np.int64), 0][positions]
+    prev_hash = np.r_[previous['y_hash'].to_numpy(dtype=np.uint64), np.uint64(0)][positions]
+
+    n_rows = state['n_rows'].to_numpy()
+    prefix = _prefix_hashes(cumulative, starts, np.minimum(prev_rows, n_rows))
+    unchanged = known & (prev_rows == n_rows) & (prev_hash == state['y_hash'].to_numpy())
+    appended = known & (prev_rows < n_rows) & (prefix == prev_hash)
+    state['status'] = np.select([~known, unchanged, appended], ['new', 'unchanged', 'appended'], default='modified')
+    return state
+
+
+class IncrementalForecaster:
+    """Client wrapper that re-forecasts only new or changed series and keeps a persisted forecast table.
+
+    The state directory holds the per-series fingerprints, the forecast table and the
+    parameters of the last run. A change of parameters re-forecasts every series.
+
+    Args:
+        client: A ``NixtlaClient`` or any object with the same ``forecast`` method.
+        state_dir: Directory of the persisted state.
+    """
+
+    def __init__(self, client, state_dir: str):
+        self.client = client
+        self.state_dir = state_dir
+        self.last_changes = pd.DataFrame()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.state_dir, name)
+
+    def forecast(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        """Forecast changed series, merge them into the stored table and return it for the current series."""
+        params_key = params_fingerprint('forecast', kwargs)
+        previous = pd.DataFrame({'unique_id': [], 'n_rows': [], 'y_hash': []})
+        table = None
+        if os.path.exists(self._path('params.json')):
+            with open(self._path('params.json')) as f:
+                if json.load(f)['params'] == params_key:
+                    previous = read_store(self._path('state.arrow'))
+                    table = read_store(self._path('forecasts.arrow'))
+
+        changes = detect_changes(df, previous)
+        changed_ids = changes.loc[changes['status'] != 'unchanged', 'unique_id']
+        current_ids = changes['unique_id']
+        frames = []
+        if table is not None:
+            # The stored table may hold ids as strings: match them as strings on both sides,
+            # then restore the ids of the current panel so their dtype is kept
+            positions = pd.Index(current_ids.astype(str)).get_indexer(table['unique_id'].astype(str))
+            keep = (positions >= 0) & ~table['unique_id'].astype(str).isin(changed_ids.astype(str)).to_numpy()
+            kept = table[keep].copy()
+            kept['unique_id'] = current_ids.to_numpy()[positions[keep]]
+            frames.append(kept)
+        if len(changed_ids):
+            frames.append(self.client.forecast(df=df[df['unique_id'].isin(changed_ids)], **kwargs))
+        fcst_df = pd.concat(frames, ignore_index=True)
+        fcst_df = fcst_df.sort_values(['unique_id', 'ds'], kind='stable').reset_index(drop=True)
+
+        os.makedirs(self.state_dir, exist_ok=True)
+        write_store(fcst_df, self._path('forecasts.arrow'))
+        write_store(changes.drop(columns=['status']), self._path('state.arrow'))
+        with open(self._path('params.json'), 'w') as f:
+            json.dump({'params': params_key}, f)
+        self.last_changes = changes
+        return fcst_df
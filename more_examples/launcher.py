@@ -0,0 +1,146 @@
+import os
+import json
+import time
+import argparse
+import importlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+import pandas as pd
+from more_examples.config import DATASETTRAINPATH, DATASETTESTPATH, RESPONSECACHEDIR, CHECKPOINTDIR, RUNDIR
+from more_examples.dataset_store import load_dataset
+from more_examples.dtype_policy import DTYPE_POLICY
+from more_examples.panel_index import PanelIndex
+from more_examples.shared_frames import SharedDatasets
+
+# Experiment name -> module with its stage graph
+EXPERIMENTS = {
+    'fine_tune': 'more_examples.fine_tune.fine_tune',
+    'cross_validation': 'more_examples.cross_validation.cross_validation',
+    'anomaly_detection': 'more_examples.anomaly_detection.anomaly_detection',
+    'hierarchical_forecasting': 'more_examples.Hierarchical_forecasting.hierarchical_forecasting',
+}
+
+
+def load_shared_datasets(paths: List[str]) -> SharedDatasets:
+    """Load every dataset once with the dtype policy, sorted by (``unique_id``, ``ds``), into shared memory.
+
+    Panels are sorted before they are shared, so ``PanelIndex`` in the workers finds them
+    sorted and works on the shared buffers instead of sorting a private copy.
+    """
+    datasets = SharedDatasets()
+    for path in dict.fromkeys(paths):
+        df = load_dataset(path, dtype_policy=DTYPE_POLICY)
+        if 'unique_id' in df.columns and 'ds' in df.columns:
+            df = PanelIndex(df).df
+        datasets.add(path, df)
+    return datasets
+
+
+def _make_client(tracer, cache_dir: str, fake: bool):
+    from more_examples.dispatcher import BatchedDispatcher
+    from more_examples.response_cache import CachedClient, ResponseCache
+    from more_examples.payload_shaping import TrimmedClient
+
+    if fake:
+        from more_examples.fake_client import FakeNixtlaClient
+
+        client = FakeNixtlaClient()
+    else:
+        from nixtla import NixtlaClient
+        from more_examples.utils import load_environment_variables
+
+        client = NixtlaClient(api_key=load_environment_variables())
+    return TrimmedClient(CachedClient(BatchedDispatcher(tracer.client(client)), ResponseCache(cache_dir)))
+
+
+def run_experiment(name: str, datasets: SharedDatasets, run_dir: str, cache_dir: str = RESPONSECACHEDIR,
+                   fake: bool = False, trace: bool = False, checkpoint_dir: str = CHECKPOINTDIR) -> dict:
+    """Worker: run one experiment on the shared datasets, with its outputs under ``<run_dir>/<name>``.
+
+    Returns:
+        Summary of the run: wall time, stage states, response cache and payload shaping counts.
+    """
+    from more_examples.tracing import Tracer
+
+    module = importlib.import_module(EXPERIMENTS[name])
+    save_dir = os.path.join(run_dir, name)
+    tracer = Tracer(name, trace_dir=os.path.join(run_dir, 'traces') if trace else None)
+    nixtla_client = _make_client(tracer, cache_dir, fake)
+    start = time.perf_counter()
+    if name == 'hierarchical_forecasting':
+        # Its training data is the aggregated hierarchy and its evaluation needs the hierarchy's test levels, so it loads its own inputs
+        module.run_experiment(nixtla_client, tracer, report_path=os.path.join(save_dir, 'evaluation_report.csv'))
+        stages = None
+    else:
+        pipeline = module.build_pipeline(nixtla_client, tracer, save_dir=save_dir, load=datasets.load, checkpoint_dir=checkpoint_dir)
+        pipeline.run()
+        pipeline.prune()
+        stages = pipeline.last_run
+    return {
+        'experiment': name,
+        'wall_s': time.perf_counter() - start,
+        'stages': stages,
+        'response_cache': nixtla_client.client.cache.stats(),
+        'payload_shaping': nixtla_client.stats(),
+    }
+
+
+def launch(experiments: List[str], run_dir: str, cache_dir: str = RESPONSECACHEDIR, fake: bool = False,
+           trace: bool = False, max_workers: Optional[int] = None, checkpoint_dir: str = CHECKPOINTDIR) -> Dict[str, dict]:
+    """Load the shared datasets once and run ``experiments`` in parallel worker processes.
+
+    Fine-tuning, cross-validation and anomaly detection read the training and test sets
+    from shared memory; hierarchical forecasting loads its own aggregated inputs.
+    Workers are spawned (as on Windows and macOS), so they share nothing with the launcher
+    but the shared memory segments, which are freed once every worker is done. A failing
+    experiment does not stop the others; its summary holds the error instead.
+
+    Returns:
+        Experiment name -> summary, also written to ``<run_dir>/summary.json``.
+    """
+    unknown = [name for name in experiments if name not in EXPERIMENTS]
+    if unknown:
+        raise ValueError(f"Unknown experiments: {unknown}, available: {list(EXPERIMENTS)}")
+    os.makedirs(run_dir, exist_ok=True)
+    summaries = {}
+    with load_shared_datasets([DATASETTRAINPATH, DATASETTESTPATH]) as datasets:
+        print(f"Shared memory: {datasets.nbytes / 1024 ** 2:.1f} MB for {len(datasets.frames)} datasets")
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=max_workers or len(experiments), mp_context=context) as executor:
+            futures = {name: executor.submit(run_experiment, name, datasets, run_dir, cache_dir, fake, trace, checkpoint_dir) for name in experiments}
+            for name, future in futures.items():
+                try:
+                    summaries[name] = {'status': 'ok', **future.result()}
+                except Exception as exc:
+                    summaries[name] = {'status': 'failed', 'experiment': name, 'error': repr(exc)}
+    with open(os.path.join(run_dir, 'summary.json'), 'w') as f:
+        json.dump(summaries, f, indent=2, default=str)
+    return summaries
+
+
+def main() -> None:
+    """Run the experiments concurrently on one shared-memory copy of the datasets, into one run directory."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--experiments', nargs='+', default=list(EXPERIMENTS), choices=list(EXPERIMENTS))
+    parser.add_argument('--run-dir', help=f"Default is a new timestamped directory under {RUNDIR}")
+    parser.add_argument('--max-workers', type=int, help='Default is one process per experiment')
+    parser.add_argument('--trace', action='store_true', help='Write stage traces to <run dir>/traces')
+    parser.add_argument('--fake', action='store_true', help='Use the offline fake client, with a response cache and checkpoints in the run directory')
+    args = parser.parse_args()
+
+    run_dir = args.run_dir or os.path.join(RUNDIR, time.strftime('%Y%m%dT%H%M%S'))
+    cache_dir = os.path.join(run_dir, 'response_cache') if args.fake else RESPONSECACHEDIR
+    checkpoint_dir = os.path.join(run_dir, 'checkpoints') if args.fake else CHECKPOINTDIR
+    summaries = launch(args.experiments, run_dir, cache_dir=cache_dir, fake=args.fake, trace=args.trace,
+                       max_workers=args.max_workers, checkpoint_dir=checkpoint_dir)
+    print(f"Memory footprint:\n{DTYPE_POLICY.report()}")
+    print(pd.DataFrame(list(summaries.values()), columns=['experiment', 'status', 'wall_s']).to_string(index=False))
+    print(f"Results saved to {run_dir}")
+    failed = [name for name, summary in summaries.items() if summary['status'] != 'ok']
+    if failed:
+        raise SystemExit(f"Failed experiments: {failed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+METRICS = ('mape', 'smape', 'mae', 'rmse', 'mase')
+
+
+def _as_float_arrays(y_true, y_pred) -> Tuple[np.ndarray, np.ndarray]:
+    """Convert inputs to float arrays that broadcast against each other."""
+    y_true = np.asarray(y_true, dtype=np.float64)
+    y_pred = np.asarray(y_pred, dtype=np.float64)
+    if y_pred.ndim == 2 and y_true.ndim == 1:
+        y_true = y_true[:, None]
+    return y_true, y_pred
+
+
+def mape(y_true, y_pred) -> np.ndarray:
+    """Absolute percentage error per element.
+
+    Zero rules: 0 when both values are 0, 100 when only ``y_true`` is 0.
+    ``y_pred`` may be 2-D (rows x models); ``y_true`` is broadcast over columns.
+    """
+    y_true, y_pred = _as_float_arrays(y_true, y_pred)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ape = np.abs((y_true - y_pred) / y_true) * 100
+    zero_true = y_true == 0
+    return np.where(zero_true, np.where(y_pred == 0, 0.0, 100.0), ape)
+
+
+def smape(y_true, y_pred) -> np.ndarray:
+    """Symmetric absolute percentage error per element (0 when both values are 0)."""
+    y_true, y_pred = _as_float_arrays(y_true, y_pred)
+    denom = np.abs(y_true) + np.abs(y_pred)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        err = 200 * np.abs(y_true - y_pred) / denom
+    return np.where(denom == 0, 0.0, err)
+
+
+def absolute_error(y_true, y_pred) -> np.ndarray:
+    """Absolute error per element."""
+    y_true, y_pred = _as_float_arrays(y_true, y_pred)
+    return np.abs(y_true - y_pred)
+
+
+def squared_error(y_true, y_pred) -> np.ndarray:
+    """Squared error per element."""
+    y_true, y_pred = _as_float_arrays(y_true, y_pred)
+    return (y_true - y_pred) ** 2
+
+
+def group_nanmean(values: np.ndarray, codes: np.ndarray, n_groups: int) -> np.ndarray:
+    """Mean of ``values`` per group code, ignoring NaNs, in one bincount pass per column.
+
+    Args:
+        values: 1-D or 2-D (rows x columns) array.
+        codes: Integer group code per row, in ``[0, n_groups)``.
+        n_groups: Number of groups.
+
+    Returns:
+        Array of shape (n_groups,) or (n_groups, columns); NaN for empty groups.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    squeeze = values.ndim == 1
+    if squeeze:
+        values = values[:, None]
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    out = np.empty((n_groups, values.shape[1]), dtype=np.float64)
+    for j in range(values.shape[1]):
+        sums = np.bincount(codes, weights=filled[:, j], minlength=n_groups)
+        counts = np.bincount(codes, weights=valid[:, j], minlength=n_groups)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out[:, j] = sums / counts
+    return out[:, 0] if squeeze else out
+
+
+def mase_scale(df_train: pd.DataFrame, uniques: Iterable, season_length: int = 1, id_col: str = 'unique_id', target_col: str = 'y') -> np.ndarray:
+    """In-sample mean absolute seasonal-naive error per series, aligned to ``uniques``.
+
+    Assumes ``df_train`` rows are ordered by time within each series.
+    """
+    ids = df_train[id_col].to_numpy()
+    y = df_train[target_col].to_numpy(dtype=np.float64)
+    index = pd.Index(uniques)
+    codes = index.get_indexer(ids)
+    # A seasonal difference is only valid when both ends belong to the same series.
+    same_series = codes[season_length:] == codes[:-season_length]
+    diffs = np.abs(y[season_length:] - y[:-season_length])
+    diffs = np.where(same_series, diffs, np.nan)
+    keep = codes[season_length:] >= 0
+    return group_nanmean(diffs[keep], codes[season_length:][keep], len(index))
+
+
+def evaluate(
+    df: pd.DataFrame,
+    models: List[str],
+    metrics: Iterable[str] = METRICS,
+    df_train: Optional[pd.DataFrame] = None,
+    season_length: int = 1,
+    id_col: str = 'unique_id',
+    target_col: str = 'y',
+) -> pd.DataFrame:
+    """Compute metrics for every model and every series in a single grouped pass.
+
+    Args:
+        df: DataFrame with the id column, the target column and one column per model.
+        models: Names of the model columns to evaluate.
+        metrics: Metric names, any of ``METRICS``.
+        df_train: Training data, required only for ``'mase'``.
+        season_length: Seasonal period used by ``'mase'``.
+        id_col: Name of the series identifier column.
+        target_col: Name of the actual values column.
+
+    Returns:
+        Tidy DataFrame with columns ``[id_col, 'metric', *models]``.
+    """
+    codes, uniques = pd.factorize(df[id_col], sort=False)
+    n_groups = len(uniques)
+    y_true = df[target_col].to_numpy(dtype=np.float64)
+    y_pred = df[models].to_numpy(dtype=np.float64)
+
+    cache: Dict[str, np.ndarray] = {}
+
+    def grouped(name: str, kernel) -> np.ndarray:
+        if name not in cache:
+            cache[name] = group_nanmean(kernel(y_true, y_pred), codes, n_groups)
+        return cache[name]
+
+    frames = []
+    for metric in metrics:
+        if metric == 'mape':
+            values = grouped('mape', mape)
+        elif metric == 'smape':
+            values = grouped('smape', smape)
+        elif metric == 'mae':
+            values = grouped('mae', absolute_error)
+        elif metric == 'rmse':
+            values = np.sqrt(grouped('mse', squared_error))
+        elif metric == 'mase':
+            if df_train is None:
+                raise ValueError("df_train is required to compute 'mase'")
+            scale = mase_scale(df_train, uniques, season_length, id_col, target_col)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                values = grouped('mae', absolute_error) / scale[:, None]
+        else:
+            raise ValueError(f"Unknown metric: {metric}")
+        frame = pd.DataFrame(values, columns=models)
+        frame.insert(0, 'metric', metric)
+        frame.insert(0, id_col, uniques)
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,103 @@
+from typing import List, Tuple
+import numpy as np
+import pandas as pd
+
+
+def _time_values(values) -> np.ndarray:
+    """Timestamps as int64 nanoseconds, for ordering and keyed lookups."""
+    return pd.to_datetime(pd.Series(values)).to_numpy(dtype='datetime64[ns]').view('int64')
+
+
+class PanelIndex:
+    """A panel sorted once by (``unique_id``, ``ds``) with the start and end offset of every series.
+
+    Series slicing is O(1), and tail splits, length filters and keyed joins are computed
+    from the offsets with NumPy instead of groupby or per-id masks. A frame that is
+    already sorted (e.g. from the dataset store) is not sorted again.
+
+    Args:
+        df: Panel with ``id_col`` and ``time_col``.
+        id_col: Series identifier column.
+        time_col: Time column.
+    """
+
+    def __init__(self, df: pd.DataFrame, id_col: str = 'unique_id', time_col: str = 'ds'):
+        self.id_col = id_col
+        self.time_col = time_col
+        codes, uniques = pd.factorize(df[id_col], sort=True)
+        times = _time_values(df[time_col])
+        code_steps, time_steps = np.diff(codes), np.diff(times)
+        if not np.all((code_steps > 0) | ((code_steps == 0) & (time_steps >= 0))):
+            order = np.lexsort((times, codes))
+            df, codes, times = df.iloc[order], codes[order], times[order]
+        self.df = df.reset_index(drop=True)
+        self.unique_ids = pd.Index(uniques)
+        self.codes = codes
+        self.times = times
+        self.sizes = np.bincount(codes, minlength=len(uniques))
+        self.starts = np.cumsum(self.sizes) - self.sizes
+        self.ends = self.starts + self.sizes
+
+    def __len__(self) -> int:
+        return len(self.unique_ids)
+
+    def slice(self, unique_id) -> pd.DataFrame:
+        """Rows of one series, as a view of the sorted frame."""
+        position = self.unique_ids.get_loc(unique_id)
+        return self.df.iloc[self.starts[position]:self.ends[position]]
+
+    def select(self, unique_ids) -> pd.DataFrame:
+        """Rows of several series, in the order given, gathered from the offsets; unknown ids are skipped."""
+        positions = self.unique_ids.get_indexer(unique_ids)
+        positions = positions[positions >= 0]
+        sizes = self.sizes[positions]
+        offsets = np.cumsum(sizes) - sizes
+        return self.df.iloc[np.repeat(self.starts[positions] - offsets, sizes) + np.arange(sizes.sum())]
+
+    def positions_from_end(self) -> np.ndarray:
+        """For every row, how many rows of its series come after it (0 for the last row)."""
+        return np.repeat(self.ends, self.sizes) - np.arange(len(self.df)) - 1
+
+    def tail_split(self, n: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Split every series into all but its last ``n`` rows and its last ``n`` rows."""
+        is_test = self.positions_from_end() < n
+        return self.df[~is_test], self.df[is_test]
+
+    def tail(self, n: int) -> pd.DataFrame:
+        """The last ``n`` rows of every series."""
+        return self.df[self.positions_from_end() < n]
+
+    def filter_min_length(self, min_length: int) -> pd.DataFrame:
+        """Rows of the series with at least ``min_length`` rows."""
+        return self.df[np.repeat(self.sizes >= min_length, self.sizes)]
+
+    def lookup(self, unique_ids, times) -> np.ndarray:
+        """Row position of every (``unique_id``, ``ds``) pair in the sorted frame, -1 where absent.
+
+        Series codes and dense time ranks are combined into one monotone int64 key, so all
+        pairs are located with a single ``searchsorted``.
+        """
+        query_codes = self.unique_ids.get_indexer(unique_ids)
+        query_times = _time_values(times)
+        if not len(self.df):
+            return np.full(len(query_codes), -1)
+        all_times = np.unique(self.times)
+        n_times = len(all_times) + 1
+        keys = self.codes.astype(np.int64) * n_times + np.searchsorted(all_times, self.times)
+        query_ranks = np.searchsorted(all_times, query_times)
+        query_keys = query_codes.astype(np.int64) * n_times + query_ranks
+        positions = np.minimum(np.searchsorted(keys, query_keys), len(keys) - 1)
+        # A time missing from the panel gets the rank of the next one, so check it exactly
+        exact_time = all_times[np.minimum(query_ranks, len(all_times) - 1)] == query_times
+        found = (query_codes >= 0) & exact_time & (keys[positions] == query_keys)
+        return np.where(found, positions, -1)
+
+    def join(self, left: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+        """Add ``columns`` of this panel to ``left`` by (``unique_id``, ``ds``), NaN where a row has no match."""
+        positions = self.lookup(left[self.id_col], left[self.time_col])
+        found = positions >= 0
+        result = left.copy()
+        for col in columns:
+            values = self.df[col].to_numpy()[np.maximum(positions, 0)]
+            result[col] = np.where(found, values, np.nan) if not found.all() else values
+        return result
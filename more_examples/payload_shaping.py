@@ -0,0 +1,210 @@
+import re
+import sys
+import threading
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+from more_examples.panel_index import PanelIndex
+from more_examples.response_cache import series_fingerprints
+
+# Points of history the model looks at per frequency family, before any horizon or extra history
+CONTEXT_LENGTHS = {
+    'S': 3600,   # one hour of seconds
+    'T': 2880,   # two days of minutes
+    'H': 1008,   # six weeks of hours
+    'D': 730,    # two years of days
+    'B': 520,    # two years of business days
+    'W': 208,    # four years of weeks
+    'M': 120,    # ten years of months
+    'Q': 40,     # ten years of quarters
+    'Y': 20,     # twenty years
+}
+DEFAULT_CONTEXT_LENGTH = 1000
+
+
+def freq_family(freq: Optional[str]) -> Optional[str]:
+    """Map a pandas frequency alias (``'ME'``, ``'MS'``, ``'W-SUN'``, ``'15min'``, ``'h'``...) to a key of ``CONTEXT_LENGTHS``."""
+    if not freq:
+        return None
+    alias = re.sub(r'^\d+', '', str(freq)).split('-')[0]
+    if alias.lower() in ('min', 't'):
+        return 'T'
+    # Sub-second aliases, matched before upper-casing since 'ms' (milliseconds) would become 'MS' (month start)
+    if alias in ('ms', 'us', 'ns', 'L', 'U', 'N'):
+        return 'S'
+    alias = alias.upper()
+    if alias == 'SM':
+        return 'M'
+    if alias.startswith('B') and len(alias) > 1:
+        # Business variants (BME, BQS, BH...) have the context of their base frequency
+        alias = alias[1:]
+    return {'A': 'Y'}.get(alias[:1], alias[:1])
+
+
+def infer_panel_freq(panel: PanelIndex) -> Optional[str]:
+    """Frequency of the first series with at least three points, or ``None``."""
+    long_enough = np.flatnonzero(panel.sizes >= 3)
+    if not len(long_enough):
+        return None
+    position = long_enough[0]
+    ds = panel.df[panel.time_col].iloc[panel.starts[position]:panel.ends[position]]
+    return pd.infer_freq(pd.DatetimeIndex(ds))
+
+
+def series_bytes(panel: PanelIndex) -> np.ndarray:
+    """In-memory bytes of one row of every series, as ``memory_usage(deep=True)`` counts them.
+
+    The id strings are measured once per series instead of once per row, so estimating
+    the size of a payload does not cost a deep scan of the whole panel.
+    """
+    df = panel.df
+    row_bytes = df.drop(columns=[panel.id_col]).memory_usage(index=False, deep=False).sum() / max(len(df), 1)
+    ids = df[panel.id_col]
+    if ids.dtype != object:
+        id_bytes = np.full(len(panel), ids.memory_usage(index=False, deep=False) / max(len(df), 1))
+    else:
+        # A pointer per row plus the string object it points to
+        id_bytes = 8 + np.fromiter((sys.getsizeof(uid) for uid in panel.unique_ids), dtype=np.float64, count=len(panel))
+    return row_bytes + id_bytes
+
+
+def _expand(response: pd.DataFrame, representative_of: pd.Series, id_dtype=None) -> pd.DataFrame:
+    """Give every id the response rows of its representative, gathered from per-representative offsets.
+
+    The ids are returned with ``id_dtype``, the dtype of the ids the caller sent.
+    """
+    codes, uniques = pd.factorize(response['unique_id'], sort=True)
+    order = np.argsort(codes, kind='stable')
+    sizes = np.bincount(codes, minlength=len(uniques))
+    starts = np.cumsum(sizes) - sizes
+    positions = pd.Index(uniques).astype(str).get_indexer(representative_of.astype(str).to_numpy())
+    # Ids whose representative got no rows back are dropped, as the API would drop them
+    has_rows = positions >= 0
+    target_ids, positions = representative_of.index[has_rows], positions[has_rows]
+    target_sizes = sizes[positions]
+    offsets = np.cumsum(target_sizes) - target_sizes
+    rows = order[np.repeat(starts[positions] - offsets, target_sizes) + np.arange(target_sizes.sum())]
+    expanded = response.iloc[rows].reset_index(drop=True)
+    expanded['unique_id'] = pd.Series(target_ids.to_numpy().repeat(target_sizes), dtype=id_dtype)
+    return expanded
+
+
+class TrimmedClient:
+    """Client wrapper that sends only the history the model uses and every distinct series once.
+
+    Each series is cut to its last ``keep`` points with one vectorized tail slice over the
+    panel, where ``keep`` is the context length of the call's frequency plus what the call
+    needs on top of it:
+
+    - fine-tuning (``finetune_steps > 0``) keeps ``finetune_factor`` contexts and the horizon,
+      so there are windows to train on;
+    - ``cross_validation`` adds the span of its windows;
+    - ``add_history=True`` and ``detect_anomalies`` return in-sample values for everything
+      sent, so they keep ``history_points`` on top of the context, or the full history when
+      ``history_points`` is None (the default).
+
+    Series with identical content (same timestamps and values under different ids) are
+    then sent once, and the response rows are copied to every id. The rows and bytes
+    received and sent for every call are available from ``report`` and ``stats``. With a
+    ``CachedClient``, put this wrapper outermost, so the response cache stores and looks
+    up only what is actually sent.
+
+    Args:
+        client: A ``NixtlaClient`` or any wrapper with the same methods.
+        context_lengths: Overrides of ``CONTEXT_LENGTHS`` per frequency family.
+        default_context_length: Context length of unknown frequencies.
+        finetune_factor: Contexts kept when fine-tuning.
+        history_points: In-sample points wanted by ``add_history`` and ``detect_anomalies``; None keeps all.
+        deduplicate: Send identical series once.
+    """
+
+    def __init__(self, client, context_lengths: Optional[Dict[str, int]] = None, default_context_length: int = DEFAULT_CONTEXT_LENGTH,
+                 finetune_factor: int = 2, history_points: Optional[int] = None, deduplicate: bool = True):
+        self.client = client
+        self.context_lengths = {**CONTEXT_LENGTHS, **(context_lengths or {})}
+        self.default_context_length = default_context_length
+        self.finetune_factor = finetune_factor
+        self.history_points = history_points
+        self.deduplicate = deduplicate
+        self._calls = []
+        self._lock = threading.Lock()
+
+    def fingerprint_config(self) -> dict:
+        """Settings that change what is sent to the API, for the keys of pipeline stages bound to this client."""
+        return {
+            'context_lengths': self.context_lengths,
+            'default_context_length': self.default_context_length,
+            'finetune_factor': self.finetune_factor,
+            'history_points': self.history_points,
+        }
+
+    def keep_points(self, method_name: str, freq: Optional[str], kwargs: dict) -> Optional[int]:
+        """Points kept per series for a call, or None to keep the full history."""
+        context = self.context_lengths.get(freq_family(freq), self.default_context_length)
+        h = kwargs.get('h') or 0
+        if method_name == 'detect_anomalies' or kwargs.get('add_history'):
+            return None if self.history_points is None else context + self.history_points
+        keep = context
+        if kwargs.get('finetune_steps'):
+            keep = self.finetune_factor * context + h
+        if method_name == 'cross_validation':
+            step_size = kwargs.get('step_size') or h
+            keep += h + (kwargs.get('n_windows', 1) - 1) * step_size
+        return keep
+
+    def _shaped_call(self, method_name: str, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        panel = PanelIndex(df)
+        keep = self.keep_points(method_name, kwargs.get('freq') or infer_panel_freq(panel), kwargs)
+        sent = panel.df if keep is None or not len(panel) or panel.sizes.max() <= keep else panel.tail(keep)
+        rows_sent = panel.sizes if keep is None else np.minimum(panel.sizes, keep)
+        n_series = n_distinct = len(panel)
+        representative_of = None
+        if self.deduplicate and n_series > 1:
+            fingerprints = series_fingerprints(sent)
+            is_first = ~fingerprints.duplicated().to_numpy()
+            n_distinct = int(is_first.sum())
+            if n_distinct < n_series:
+                representatives = pd.Series(fingerprints.index[is_first], index=fingerprints.to_numpy()[is_first])
+                representative_of = fingerprints.map(representatives)
+                sent = PanelIndex(sent).select(representatives.to_numpy())
+                is_sent = np.zeros(n_series, dtype=bool)
+                is_sent[panel.unique_ids.get_indexer(representatives.to_numpy())] = True
+                rows_sent = np.where(is_sent, rows_sent, 0)
+
+        response = getattr(self.client, method_name)(df=sent, **kwargs)
+        if representative_of is not None:
+            response = _expand(response, representative_of, id_dtype=df[panel.id_col].dtype)
+
+        row_bytes = series_bytes(panel)
+        bytes_in, bytes_sent = int(row_bytes @ panel.sizes), int(row_bytes @ rows_sent)
+        with self._lock:
+            self._calls.append({
+                'method': method_name, 'keep_points': keep, 'series': n_series, 'distinct_series': n_distinct,
+                'rows_in': len(df), 'rows_sent': len(sent), 'bytes_in': bytes_in, 'bytes_sent': bytes_sent,
+                'bytes_saved': bytes_in - bytes_sent,
+            })
+        return response
+
+    def report(self) -> pd.DataFrame:
+        """One row per call with the series and rows received and sent, and their estimated in-memory bytes."""
+        with self._lock:
+            return pd.DataFrame(self._calls, columns=['method', 'keep_points', 'series', 'distinct_series', 'rows_in',
+                                                      'rows_sent', 'bytes_in', 'bytes_sent', 'bytes_saved'])
+
+    def stats(self) -> dict:
+        """Totals over all calls."""
+        report = self.report()
+        return {'calls': len(report), 'rows_saved': int((report['rows_in'] - report['rows_sent']).sum()),
+                'bytes_saved': int(report['bytes_saved'].sum())}
+
+    def forecast(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        """Trimmed and deduplicated ``NixtlaClient.forecast``."""
+        return self._shaped_call('forecast', df, **kwargs)
+
+    def cross_validation(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        """Trimmed and deduplicated ``NixtlaClient.cross_validation``."""
+        return self._shaped_call('cross_validation', df, **kwargs)
+
+    def detect_anomalies(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        """Trimmed and deduplicated ``NixtlaClient.detect_anomalies``."""
+        return self._shaped_call('detect_anomalies', df, **kwargs)
@@ -0,0 +1,268 @@
+import os
+import json
+import pickle as pkl
+import inspect
+import hashlib
+import functools
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+import pandas as pd
+
+
+def file_fingerprint(path: str) -> str:
+    """Cheap fingerprint of an input file: its path, size and modification time."""
+    if not os.path.exists(path):
+        return f'{path}:missing'
+    stat = os.stat(path)
+    return f'{path}:{stat.st_size}:{stat.st_mtime_ns}'
+
+
+def code_fingerprint(func: Callable) -> str:
+    """Hash of a stage function's source, so editing the function invalidates its checkpoint."""
+    while isinstance(func, functools.partial):
+        func = func.func
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        source = getattr(func, '__qualname__', repr(func))
+    return hashlib.sha256(source.encode()).hexdigest()[:16]
+
+
+def client_fingerprint(client) -> List[dict]:
+    """Identity of a client stack, for the keys of stages bound to it.
+
+    Wrappers (found through their ``client`` attribute) that only cache, batch or trace
+    calls leave the results unchanged and are skipped; a wrapper that changes what is
+    sent declares it with a ``fingerprint_config()`` dict. The innermost client counts
+    with its class and API endpoint, so the fake client and the API never share a key.
+    """
+    layers = []
+    while client is not None:
+        inner = getattr(client, 'client', None)
+        name = f'{type(client).__module__}.{type(client).__qualname__}'
+        if inner is None:
+            layers.append({'class': name, 'base_url': getattr(client, '_client_kwargs', {}).get('base_url')})
+        elif hasattr(client, 'fingerprint_config'):
+            layers.append({'class': name, 'config': client.fingerprint_config()})
+        client = inner
+    return layers
+
+
+def bound_fingerprint(func: Callable) -> list:
+    """Fingerprint of the arguments bound to a stage function with ``functools.partial``.
+
+    Clients count by ``client_fingerprint``, plain values as is, and other objects by
+    their qualified name (their state is not part of the key).
+    """
+    def describe(value):
+        if any(hasattr(value, method) for method in ('forecast', 'detect_anomalies', 'cross_validation')):
+            return client_fingerprint(value)
+        if value is None or isinstance(value, (str, int, float, bool)):
+            return value
+        return getattr(value, '__qualname__', type(value).__qualname__)
+
+    bound = []
+    while isinstance(func, functools.partial):
+        bound.append({
+            'args': [describe(arg) for arg in func.args],
+            'keywords': {name: describe(value) for name, value in sorted(func.keywords.items())},
+        })
+        func = func.func
+    return bound
+
+
+def export_csv(df: pd.DataFrame, path: str) -> None:
+    """Write a stage output to CSV, creating the directory if needed."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    df.to_csv(path, index=False)
+
+
+def _write_checkpoint(value, path: str) -> None:
+    """DataFrames go to Arrow IPC (exact dtypes and order), anything else to pickle."""
+    tmp_path = f'{path}.tmp'
+    if isinstance(value, pd.DataFrame):
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(value, preserve_index=True)
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    else:
+        with open(tmp_path, 'wb') as f:
+            pkl.dump(value, f, protocol=5)
+    os.replace(tmp_path, path)
+
+
+def _read_checkpoint(path: str):
+    if path.endswith('.arrow'):
+        import pyarrow as pa
+
+        with pa.memory_map(path, 'r') as source:
+            return pa.ipc.open_file(source).read_all().to_pandas()
+    with open(path, 'rb') as f:
+        return pkl.load(f)
+
+
+class Stage:
+    """One node of a ``Pipeline``: ``func(*upstream outputs, **params)``."""
+
+    def __init__(self, name: str, func: Callable, inputs: List[str], params: dict, files: List[str], version: str,
+                 checkpoint: bool = True, outputs: Optional[List[str]] = None):
+        self.name = name
+        self.func = func
+        self.inputs = inputs
+        self.params = params
+        self.files = files
+        self.version = version
+        self.checkpoint = checkpoint
+        self.outputs = outputs or []
+
+
+class Pipeline:
+    """Stage graph whose outputs are checkpointed and keyed by a hash of everything they depend on.
+
+    A stage's key combines its name, the source of its function, its parameters, the
+    fingerprints of its input files, an optional ``version`` and the keys of its upstream
+    stages, so a change anywhere invalidates exactly the stages downstream of it. ``run``
+    reuses every stage whose checkpoint exists, loading a checkpoint only when a stage
+    that needs it has to run, and runs the others on a thread pool as soon as their
+    inputs are ready, so independent stages (e.g. plotting and CSV export) overlap.
+
+    Objects such as the API client are bound with ``functools.partial``; a bound client
+    counts in the key by its class and configuration (``client_fingerprint``), so the
+    fake client never reuses checkpoints of the API. Edits to helpers called by a stage
+    are not seen by its source hash; bump ``version`` for those. Stages added with
+    ``checkpoint=False`` (e.g. loads from shared memory, which are cheaper than their
+    checkpoint) are never written and run whenever a stage that needs them runs. Stages
+    that write files (CSV exports, charts) declare them as ``outputs`` and are only
+    cached while those files exist. ``prune`` deletes checkpoints of other keys.
+
+    Args:
+        checkpoint_dir: Directory of the checkpoints.
+        max_workers: Stages run concurrently.
+        tracer: Optional ``Tracer``; every executed stage is traced with its rows in/out.
+    """
+
+    def __init__(self, checkpoint_dir: str, max_workers: int = 4, tracer=None):
+        self.checkpoint_dir = checkpoint_dir
+        self.max_workers = max_workers
+        self.tracer = tracer
+        self.stages: Dict[str, Stage] = {}
+        self.last_run: Dict[str, str] = {}
+
+    def add(self, name: str, func: Callable, inputs: Optional[List[str]] = None, params: Optional[dict] = None,
+            files: Optional[List[str]] = None, version: str = '', checkpoint: bool = True,
+            outputs: Optional[List[str]] = None) -> 'Pipeline':
+        """Add a stage; ``inputs`` name stages added before it, ``files`` are read by it and ``outputs`` written by it."""
+        inputs = inputs or []
+        unknown = [upstream for upstream in inputs if upstream not in self.stages]
+        if unknown:
+            raise ValueError(f"Stage {name} depends on unknown stages: {unknown}")
+        self.stages[name] = Stage(name, func, inputs, params or {}, files or [], version, checkpoint, outputs)
+        return self
+
+    def _keys(self) -> Dict[str, str]:
+        keys = {}
+        for name, stage in self.stages.items():
+            payload = json.dumps({
+                'name': name,
+                'code': code_fingerprint(stage.func),
+                'bound': bound_fingerprint(stage.func),
+                'params': stage.params,
+                'files': [file_fingerprint(path) for path in stage.files],
+                'version': stage.version,
+                'inputs': [keys[upstream] for upstream in stage.inputs],
+            }, sort_keys=True, default=str)
+            keys[name] = hashlib.sha256(payload.encode()).hexdigest()[:24]
+        return keys
+
+    def _checkpoint(self, name: str, key: str) -> Optional[str]:
+        stage = self.stages[name]
+        if not stage.checkpoint or not all(os.path.exists(path) for path in stage.outputs):
+            return None
+        for extension in ('.arrow', '.pkl'):
+            path = os.path.join(self.checkpoint_dir, f'{name}-{key}{extension}')
+            if os.path.exists(path):
+                return path
+        return None
+
+    def prune(self) -> List[str]:
+        """Delete the checkpoints in ``checkpoint_dir`` that no stage of this pipeline would read with its current key.
+
+        Every pipeline has a checkpoint directory of its own, so only files of its stages
+        are expected there; unfinished writes (``.tmp``) are deleted as well.
+
+        Returns:
+            Paths of the deleted files.
+        """
+        if not os.path.isdir(self.checkpoint_dir):
+            return []
+        current = {f'{name}-{key}' for name, key in self._keys().items()}
+        removed = []
+        for file_name in os.listdir(self.checkpoint_dir):
+            stem, extension = os.path.splitext(file_name)
+            if extension in ('.arrow', '.pkl') and stem in current:
+                continue
+            if extension in ('.arrow', '.pkl', '.tmp'):
+                path = os.path.join(self.checkpoint_dir, file_name)
+                os.remove(path)
+                removed.append(path)
+        return removed
+
+    def _execute(self, stage: Stage, key: str, args: list):
+        if self.tracer is not None:
+            frames = [arg for arg in args if isinstance(arg, pd.DataFrame)]
+            with self.tracer.stage(stage.name, rows_in=sum(len(frame) for frame in frames) if frames else None) as traced:
+                output = stage.func(*args, **stage.params)
+                traced.rows_out = output if isinstance(output, pd.DataFrame) else None
+        else:
+            output = stage.func(*args, **stage.params)
+        if not stage.checkpoint:
+            return output
+        extension = '.arrow' if isinstance(output, pd.DataFrame) else '.pkl'
+        _write_checkpoint(output, os.path.join(self.checkpoint_dir, f'{stage.name}-{key}{extension}'))
+        return output
+
+    def run(self, targets: Optional[List[str]] = None) -> dict:
+        """Bring ``targets`` (default: every leaf stage) up to date and return their outputs.
+
+        ``last_run`` records for every needed stage whether it was ``'ran'``, ``'cached'`` or,
+        for a stage without a checkpoint that nothing needed to run, ``'skipped'``.
+        """
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        keys = self._keys()
+        targets = targets or [name for name in self.stages if not any(name in stage.inputs for stage in self.stages.values())]
+
+        # Stages needed for the targets, and which of them have to run
+        needed, stack = set(), list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.stages[name].inputs)
+        to_run = {name for name in needed if self.stages[name].checkpoint and self._checkpoint(name, keys[name]) is None}
+        # Stages without a checkpoint run for the targets and for stages that run; dependents come later, so go backwards
+        for name in reversed([name for name in self.stages if name in needed and not self.stages[name].checkpoint]):
+            if name in targets or any(name in self.stages[dependent].inputs for dependent in to_run):
+                to_run.add(name)
+        # Cached stages are only loaded when a running stage or a target needs their output
+        to_load = {upstream for name in to_run for upstream in self.stages[name].inputs if upstream not in to_run}
+        to_load |= {name for name in targets if name not in to_run}
+        outputs = {name: _read_checkpoint(self._checkpoint(name, keys[name])) for name in to_load}
+        self.last_run = {name: 'ran' if name in to_run else 'cached' if self.stages[name].checkpoint else 'skipped'
+                         for name in self.stages if name in needed}
+
+        pending = dict.fromkeys(name for name in self.stages if name in to_run)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                for name in list(pending):
+                    stage = self.stages[name]
+                    if all(upstream in outputs for upstream in stage.inputs):
+                        args = [outputs[upstream] for upstream in stage.inputs]
+                        running[executor.submit(self._execute, stage, keys[name], args)] = name
+                        del pending[name]
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    outputs[running.pop(future)] = future.result()
+        return {name: outputs[name] for name in targets}
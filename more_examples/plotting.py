@@ -0,0 +1,165 @@
+import os
+import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from more_examples.response_cache import params_fingerprint, series_fingerprints
+from more_examples.panel_index import PanelIndex
+
+MANIFEST_NAME = '.render_manifest.json'
+# Figures and their artists kept per worker process, keyed by layout
+_FIGURES: Dict[Tuple, Tuple] = {}
+
+
+def _figure(layout: Tuple) -> Tuple:
+    """Return the cached (figure, axes, artists) for ``layout``, creating them on first use."""
+    if layout in _FIGURES:
+        return _FIGURES[layout]
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    (nrows, ncols), figsize, lines, markers = layout
+    fig, axes = plt.subplots(nrows, ncols, figsize=figsize, squeeze=False)
+    axes = list(axes.ravel())
+    artists = []
+    for ax in axes:
+        ax_artists = [ax.plot(np.array([], dtype='datetime64[ns]'), [], label=label)[0] for label in lines]
+        ax_artists += [ax.plot(np.array([], dtype='datetime64[ns]'), [], label=label, linestyle='', color='red', marker='*')[0] for label in markers]
+        ax.set_xlabel('Date')
+        ax.set_ylabel('Value')
+        ax.legend()
+        artists.append(ax_artists)
+    _FIGURES[layout] = (fig, axes, artists)
+    return _FIGURES[layout]
+
+
+def _draw(ax, ax_artists: list, ds: np.ndarray, values: List[np.ndarray], title: str) -> None:
+    """Point the reused artists of one axes at a new series and rescale."""
+    for artist, y in zip(ax_artists, values):
+        artist.set_data(ds, y)
+    ax.set_title(title)
+    ax.relim()
+    ax.autoscale_view()
+    ax.set_visible(True)
+
+
+def _render_chunk(layout: Tuple, mode: str, charts: List[Tuple], output_path: Optional[str] = None) -> List[str]:
+    """Worker: render a chunk of charts (``(path, title, ds, values)`` tuples) with one reused figure."""
+    fig, axes, artists = _figure(layout)
+    if mode == 'png':
+        for path, title, ds, values in charts:
+            _draw(axes[0], artists[0], ds, values, title)
+            fig.savefig(path)
+        return [path for path, _, _, _ in charts]
+
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    per_page = len(axes)
+    with PdfPages(output_path) as pdf:
+        for page_start in range(0, len(charts), per_page):
+            page = charts[page_start:page_start + per_page]
+            for ax, ax_artists, (_, title, ds, values) in zip(axes, artists, page):
+                _draw(ax, ax_artists, ds, values, title)
+            for ax in axes[len(page):]:
+                ax.set_visible(False)
+            fig.tight_layout()
+            pdf.savefig(fig)
+    return [output_path]
+
+
+def render_charts(df: pd.DataFrame, save_dir: str, lines: Dict[str, str], markers: Optional[Dict[str, str]] = None,
+                  titles: Optional[pd.Series] = None, title_template: str = '{unique_id}',
+                  filename_template: str = 'forecast_{unique_id}.png', mode: str = 'png', grid: Tuple[int, int] = (3, 2),
+                  pages_per_file: int = 20, max_workers: Optional[int] = None, skip_unchanged: bool = True,
+                  figsize: Tuple[float, float] = (10, 6)) -> List[str]:
+    """Render one chart per ``unique_id`` headlessly, in parallel, skipping unchanged charts.
+
+    The frame is sorted by (unique_id, ds) once and every series is passed to the workers
+    as array slices. Each worker process draws with the Agg backend on a single figure
+    whose artists are updated for every chart. A manifest in ``save_dir`` stores a hash of
+    every chart's data and title, so charts whose inputs did not change are not redrawn.
+
+    Args:
+        df: Frame with ``unique_id``, ``ds`` and the plotted columns.
+        save_dir: Output directory, created if needed.
+        lines: Columns drawn as lines, mapped to their legend labels.
+        markers: Columns drawn as red markers only (NaN rows are not drawn), mapped to labels.
+        titles: Optional per-series titles indexed by ``unique_id``; defaults to ``title_template``.
+        title_template: Title format with a ``{unique_id}`` field.
+        filename_template: PNG file name format with a ``{unique_id}`` field.
+        mode: ``'png'`` for one file per series or ``'pdf'`` for small multiples on multi-page PDFs.
+        grid: Rows and columns of charts per PDF page.
+        pages_per_file: PDF pages per output file; each file is rendered by one worker.
+        max_workers: Worker processes; ``1`` renders in the calling process.
+        skip_unchanged: Whether to skip charts (or PDF files) whose inputs match the manifest.
+        figsize: Figure size in inches.
+
+    Returns:
+        Paths of the files written in this call.
+    """
+    markers = markers or {}
+    columns = list(lines) + list(markers)
+    os.makedirs(save_dir, exist_ok=True)
+
+    panel = PanelIndex(df[['unique_id', 'ds'] + columns])
+    data, unique_ids, sizes, starts = panel.df, panel.unique_ids, panel.sizes, panel.starts
+    ds = panel.times.view('datetime64[ns]')
+    values = [data[col].to_numpy(dtype=np.float64) for col in columns]
+    if titles is None:
+        titles = pd.Series([title_template.format(unique_id=unique_id) for unique_id in unique_ids], index=unique_ids)
+    titles = titles.reindex(unique_ids).astype(str).to_numpy()
+
+    layout = ((1, 1) if mode == 'png' else tuple(grid), tuple(figsize), tuple(lines.values()), tuple(markers.values()))
+    render_key = params_fingerprint('render', {'layout': layout, 'mode': mode})
+    fingerprints = series_fingerprints(data).reindex(unique_ids).to_numpy()
+    chart_keys = [hashlib.sha256(f'{render_key}{fp}{title}'.encode()).hexdigest()[:24] for fp, title in zip(fingerprints, titles)]
+
+    manifest_path = os.path.join(save_dir, MANIFEST_NAME)
+    manifest = {}
+    if skip_unchanged and os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    def chart(i: int, path: str) -> Tuple:
+        rows = slice(starts[i], starts[i] + sizes[i])
+        return path, titles[i], ds[rows], [array[rows] for array in values]
+
+    jobs, outputs = [], {}
+    if mode == 'png':
+        # Hierarchical ids such as 'total/US' contain path separators
+        safe_ids = [str(unique_id).replace('/', '_').replace('\\', '_') for unique_id in unique_ids]
+        paths = [os.path.join(save_dir, filename_template.format(unique_id=safe_id)) for safe_id in safe_ids]
+        pending = [i for i, path in enumerate(paths) if manifest.get(os.path.basename(path)) != chart_keys[i] or not os.path.exists(path)]
+        n_chunks = max(1, min(len(pending), (max_workers or os.cpu_count() or 1) * 4))
+        for chunk in np.array_split(np.asarray(pending, dtype=np.int64), n_chunks):
+            if len(chunk):
+                jobs.append((layout, mode, [chart(i, paths[i]) for i in chunk], None))
+        outputs.update({os.path.basename(paths[i]): chart_keys[i] for i in pending})
+    elif mode == 'pdf':
+        per_file = grid[0] * grid[1] * pages_per_file
+        for part, file_start in enumerate(range(0, len(unique_ids), per_file)):
+            path = os.path.join(save_dir, f'charts_{part:04d}.pdf')
+            indices = range(file_start, min(file_start + per_file, len(unique_ids)))
+            key = hashlib.sha256(''.join(chart_keys[i] for i in indices).encode()).hexdigest()[:24]
+            if manifest.get(os.path.basename(path)) != key or not os.path.exists(path):
+                jobs.append((layout, mode, [chart(i, path) for i in indices], path))
+                outputs[os.path.basename(path)] = key
+    else:
+        raise ValueError(f"Unknown mode: {mode}. Use 'png' or 'pdf'.")
+
+    written = []
+    if max_workers == 1 or len(jobs) <= 1:
+        for job in jobs:
+            written += _render_chunk(*job)
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for paths_done in executor.map(_render_chunk, *zip(*jobs)):
+                written += paths_done
+
+    manifest.update(outputs)
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f)
+    return written
@@ -0,0 +1,127 @@
+import os
+import argparse
+from typing import List, Optional
+import pandas as pd
+from more_examples.preprocess_data.useful_functions import expand_aggregated, aggregate_by_frequency
+
+
+def merge_partials(partials: List[pd.DataFrame]) -> pd.DataFrame:
+    """Merge partial (unique_id, ds) aggregates into one sorted aggregate."""
+    return pd.concat(partials).groupby(level=["unique_id", "ds"], sort=True).sum()
+
+
+def aggregate_csv_in_chunks(
+    path: str,
+    value_cols: Optional[List[str]] = None,
+    chunksize: int = 1_000_000,
+    date_format: str = "%d/%m/%Y",
+) -> pd.DataFrame:
+    """Read a raw CSV in bounded chunks and sum its values per (unique_id, ds).
+
+    Partial aggregates are merged once the rows added since the last merge exceed both
+    one chunk and the merged aggregate itself. Memory grows with the number of distinct
+    (unique_id, ds) keys, not raw rows, and since the threshold grows with the aggregate,
+    every row is re-merged a logarithmic number of times instead of once per chunk.
+    ``unique_id`` is always read as a string so every chunk sorts the same way.
+
+    Args:
+        path: Path to the raw CSV with ``unique_id``, ``ds`` and value columns.
+        value_cols: Columns to sum, default is ``['y']``.
+        chunksize: Number of raw rows read per chunk.
+        date_format: Format of the raw ``ds`` column.
+
+    Returns:
+        DataFrame indexed by a sorted (unique_id, ds) MultiIndex.
+    """
+    value_cols = value_cols or ["y"]
+    partials: List[pd.DataFrame] = []
+    merged_rows = pending_rows = 0
+    reader = pd.read_csv(path, usecols=["unique_id", "ds"] + value_cols, dtype={"unique_id": str}, chunksize=chunksize)
+    for chunk in reader:
+        chunk["ds"] = pd.to_datetime(chunk["ds"], format=date_format)
+        partial = chunk.groupby(["unique_id", "ds"], sort=False)[value_cols].sum()
+        partials.append(partial)
+        pending_rows += len(partial)
+        if pending_rows > max(chunksize, merged_rows):
+            partials = [merge_partials(partials)]
+            merged_rows, pending_rows = len(partials[0]), 0
+    if not partials:
+        empty_index = pd.MultiIndex.from_arrays([[], pd.DatetimeIndex([])], names=["unique_id", "ds"])
+        return pd.DataFrame(columns=value_cols, index=empty_index)
+    return merge_partials(partials)
+
+
+def preprocess_csv_in_chunks(
+    raw_path: str,
+    train_path: str,
+    train_agg_path: str,
+    end_date,
+    freq: str = "D",
+    agg_freq: str = "ME",
+    chunksize: int = 1_000_000,
+    series_batch_size: int = 10_000,
+    date_format: str = "%d/%m/%Y",
+) -> None:
+    """Write the expanded and frequency-aggregated training CSVs from a raw CSV larger than RAM.
+
+    The output matches ``expand_data_with_zeros`` followed by ``aggregate_by_frequency``
+    on the whole raw file, but expanded rows are only materialized for
+    ``series_batch_size`` series at a time and appended to the output files.
+
+    Args:
+        raw_path: Path to the raw transactions CSV.
+        train_path: Output path of the expanded (zero-filled) data.
+        train_agg_path: Output path of the data aggregated to ``agg_freq``.
+        end_date: Last date of every expanded series.
+        freq: Frequency of the expanded data, default is daily.
+        agg_freq: Frequency of the aggregated data, default is month end.
+        chunksize: Number of raw rows read per chunk.
+        series_batch_size: Number of series expanded and written at a time.
+        date_format: Format of the raw ``ds`` column.
+    """
+    end_date = pd.Timestamp(end_date)
+    agg = aggregate_csv_in_chunks(raw_path, chunksize=chunksize, date_format=date_format)
+
+    ids = agg.index.get_level_values("unique_id")
+    unique_ids = ids.unique()
+    for path in (train_path, train_agg_path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    header = True
+    for batch_start in range(0, len(unique_ids), series_batch_size):
+        batch_ids = unique_ids[batch_start:batch_start + series_batch_size]
+        lo, hi = ids.searchsorted(batch_ids[0], side="left"), ids.searchsorted(batch_ids[-1], side="right")
+        expanded = expand_aggregated(agg.iloc[lo:hi], end_date, freq)
+        expanded = expanded[["ds", "unique_id", "y"]]
+        mode = "w" if header else "a"
+        expanded.to_csv(train_path, index=False, header=header, mode=mode)
+        aggregate_by_frequency(expanded, freq=agg_freq).to_csv(train_agg_path, index=False, header=header, mode=mode)
+        header = False
+
+
+def main() -> None:
+    """Preprocess a raw transactions CSV into train.csv and train_agg.csv in bounded memory."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("raw_path")
+    parser.add_argument("output_dir")
+    parser.add_argument("--end-date", required=True)
+    parser.add_argument("--freq", default="D")
+    parser.add_argument("--agg-freq", default="ME")
+    parser.add_argument("--chunksize", type=int, default=1_000_000)
+    parser.add_argument("--series-batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    preprocess_csv_in_chunks(
+        args.raw_path,
+        os.path.join(args.output_dir, "train.csv"),
+        os.path.join(args.output_dir, "train_agg.csv"),
+        end_date=args.end_date,
+        freq=args.freq,
+        agg_freq=args.agg_freq,
+        chunksize=args.chunksize,
+        series_batch_size=args.series_batch_size,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,68 @@
+import numpy as np
 import pandas as pd
 
-def expand_data_with_zeros(df, end_date, freq="D"):
-    new_df = pd.DataFrame()
-    copy_df = df.copy()
-    for unique_id_value in copy_df["unique_id"].unique():
-        subset = copy_df[copy_df["unique_id"] == unique_id_value].copy()
-        subset["ds"] = pd.to_datetime(subset["ds"],format="%d/%m/%Y")
-        subset = subset.groupby("ds").sum().reset_index()  # Aggregate to remove duplicates
-        max_date = subset["ds"].max()
-        full_range = pd.date_range(start=subset["ds"].min(), end=max(max_date, end_date), freq=freq)
-        subset = subset.set_index("ds").reindex(full_range).reset_index()
-        subset = subset.rename(columns={"index": "ds"})
-        subset = subset[subset["ds"] <= end_date]
-        subset["unique_id"] = unique_id_value
-        subset["y"] = subset["y"].fillna(0)
-        new_df = pd.concat([new_df, subset])
-    new_df = new_df.sort_values(by=["unique_id", "ds"])
+
+def _date_grids(starts: pd.DatetimeIndex, end_date: pd.Timestamp, freq: str):
+    """Build one date range per distinct start date, concatenated into a flat array.
+
+    Returns:
+        Tuple of (flat grid values, offset of each start's grid, length of each start's grid).
+    """
+    grids = [pd.date_range(start=start, end=max(start, end_date), freq=freq) for start in starts]
+    grids = [grid[grid <= end_date] for grid in grids]
+    lengths = np.array([len(grid) for grid in grids], dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    values = np.concatenate([grid.values for grid in grids]) if grids else np.array([], dtype="datetime64[ns]")
+    return values, offsets, lengths
+
+
+def expand_aggregated(agg: pd.DataFrame, end_date: pd.Timestamp, freq: str = "D") -> pd.DataFrame:
+    """Reindex (unique_id, ds)-aggregated values onto each series' date grid, filling ``y`` with zeros.
+
+    Args:
+        agg: DataFrame indexed by a sorted (unique_id, ds) MultiIndex without duplicates.
+        end_date: Last date of every expanded series.
+        freq: Frequency of the date grid.
+
+    Returns:
+        Flat DataFrame whose index restarts at 0 for every series.
+    """
+    # Every series starting on the same date shares the same grid
+    id_codes, unique_ids = pd.factorize(agg.index.get_level_values("unique_id"), sort=True)
+    first_rows = np.flatnonzero(np.r_[True, id_codes[1:] != id_codes[:-1]])
+    series_starts = agg.index.get_level_values("ds")[first_rows]
+    start_codes, unique_starts = pd.factorize(series_starts)
+    grid_values, grid_offsets, grid_lengths = _date_grids(pd.DatetimeIndex(unique_starts), end_date, freq)
+
+    lengths = grid_lengths[start_codes]
+    series_offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    positions = np.repeat(grid_offsets[start_codes], lengths) + np.arange(lengths.sum()) - series_offsets
+    full_index = pd.MultiIndex.from_arrays(
+        [np.repeat(unique_ids, lengths), grid_values[positions]], names=["unique_id", "ds"]
+    )
+
+    new_df = agg.reindex(full_index).reset_index()
+    new_df["y"] = new_df["y"].fillna(0)
+    new_df.index = np.arange(len(new_df)) - series_offsets
     return new_df
 
+
+def expand_data_with_zeros(df, end_date, freq="D"):
+    """Aggregate duplicate dates and fill missing dates with zeros for every unique_id.
+
+    Each series is expanded from its first date up to ``end_date`` on the ``freq`` grid.
+    The work is done with one date parse, one groupby and one MultiIndex reindex.
+    """
+    end_date = pd.Timestamp(end_date)
+    df = df.copy()
+    df["ds"] = pd.to_datetime(df["ds"], format="%d/%m/%Y")
+    value_cols = [col for col in df.columns if col not in ("unique_id", "ds")]
+
+    # Aggregate to remove duplicates
+    agg = df.groupby(["unique_id", "ds"], sort=True)[value_cols].sum()
+    new_df = expand_aggregated(agg, end_date, freq)
+    return new_df[["ds"] + [col for col in df.columns if col != "ds"]]
+
+
 def aggregate_by_frequency(df, freq="ME"):
-    return df.groupby(["unique_id", pd.Grouper(key="ds", freq=freq)])["y"].sum().reset_index()
\ No newline at end of file
+    return df.groupby(["unique_id", pd.Grouper(key="ds", freq=freq)])["y"].sum().reset_index()
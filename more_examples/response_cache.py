@@ -0,0 +1,259 @@
+import os
+import json
+import contextlib
+import time
+import uuid
+import sqlite3
+import hashlib
+import threading
+from typing import List, Tuple
+import numpy as np
+import pandas as pd
+
+# Two odd 64-bit multipliers give two independent position-weighted row-hash sums
+_MULTIPLIERS = (np.uint64(0x9E3779B97F4A7C15), np.uint64(0xC2B2AE3D27D4EB4F))
+KEY_COLUMN = '_cache_key'
+_EVICTED_SUFFIX = '.evicted'
+
+
+def series_fingerprints(df: pd.DataFrame, id_col: str = 'unique_id', time_col: str = 'ds') -> pd.Series:
+    """Hash the content of every series, ignoring its id, in one vectorized pass.
+
+    Each row is hashed with ``pd.util.hash_pandas_object`` and the row hashes are
+    combined per series with position-dependent weights, so reordering, editing,
+    appending or removing a row changes the fingerprint.
+
+    Args:
+        df: Panel with one or more rows per series.
+        id_col: Name of the series identifier column.
+        time_col: Name of the time column used to order rows within a series.
+
+    Returns:
+        Series of 32-character hex fingerprints indexed by ``id_col`` in sorted order.
+    """
+    value_cols = sorted(col for col in df.columns if col != id_col)
+    codes, uniques = pd.factorize(df[id_col], sort=True)
+    order = np.lexsort((df[time_col].to_numpy(), codes)) if time_col in df.columns else np.argsort(codes, kind='stable')
+    row_hashes = pd.util.hash_pandas_object(df[value_cols].iloc[order], index=False).to_numpy()
+    sorted_codes = codes[order]
+    sizes = np.bincount(sorted_codes, minlength=len(uniques))
+    starts = np.cumsum(sizes) - sizes
+    positions = (np.arange(len(order)) - np.repeat(starts, sizes)).astype(np.uint64)
+
+    parts = []
+    with np.errstate(over='ignore'):
+        for multiplier in _MULTIPLIERS:
+            weights = (positions + np.uint64(1)) * multiplier
+            sums = np.add.reduceat(row_hashes * weights, starts) if len(order) else np.zeros(0, dtype=np.uint64)
+            parts.append(sums ^ (sizes.astype(np.uint64) * multiplier))
+    hexes = [f'{a:016x}{b:016x}' for a, b in zip(*parts)]
+    return pd.Series(hexes, index=pd.Index(uniques, name=id_col))
+
+
+def params_fingerprint(method: str, params: dict) -> str:
+    """Stable hash of the method name and the call parameters."""
+    payload = json.dumps({'method': method, **params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+class ResponseCache:
+    """On-disk, content-addressed cache of per-series API responses with LRU eviction.
+
+    Results are written as zstd-compressed Arrow IPC segments, one per cache fill, with a
+    SQLite index mapping each key to its row range in a segment. When the total segment
+    size exceeds ``max_bytes``, least recently used segments are evicted.
+
+    Args:
+        cache_dir: Directory of the segments and the index.
+        max_bytes: Size cap of all segments together.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 1024 ** 3):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        # Processes sharing the directory (e.g. launcher workers) wait for each other's writes
+        self._db = sqlite3.connect(os.path.join(cache_dir, 'index.sqlite'), check_same_thread=False, timeout=30)
+        self._db.executescript(
+            'CREATE TABLE IF NOT EXISTS segments (name TEXT PRIMARY KEY, bytes INTEGER, last_access REAL);'
+            'CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, segment TEXT, start INTEGER, length INTEGER);'
+            'CREATE INDEX IF NOT EXISTS entries_segment ON entries (segment);'
+        )
+
+    def _segment_path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, f'{name}.arrow')
+
+    def get(self, keys: List[str]) -> Tuple[pd.DataFrame, List[str]]:
+        """Look up keys and return the cached rows of the hits and the list of missing keys.
+
+        The rows of all hits are returned in one DataFrame with an extra ``KEY_COLUMN``.
+        """
+        import pyarrow as pa
+
+        found = []
+        with self._lock:
+            for batch_start in range(0, len(keys), 500):
+                batch = keys[batch_start:batch_start + 500]
+                found += self._db.execute(
+                    f'SELECT key, segment, start, length FROM entries WHERE key IN ({",".join("?" * len(batch))})', batch
+                ).fetchall()
+            entries = pd.DataFrame(found, columns=['key', 'segment', 'start', 'length'])
+            segments = entries['segment'].unique().tolist()
+            self._db.executemany('UPDATE segments SET last_access = ? WHERE name = ?', [(time.time(), name) for name in segments])
+            self._db.commit()
+
+        frames, evicted = [], set()
+        for name, segment_entries in entries.groupby('segment', sort=False):
+            try:
+                with pa.memory_map(self._segment_path(name), 'r') as source:
+                    table = pa.ipc.open_file(source).read_all()
+            except FileNotFoundError:
+                # Evicted by this or another process since the lookup: its keys are misses
+                evicted.update(segment_entries['key'])
+                continue
+            lengths = segment_entries['length'].to_numpy()
+            starts = segment_entries['start'].to_numpy()
+            # Row positions of every hit in this segment, without a per-key loop
+            rows = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(lengths.sum())
+            frame = table.take(rows).to_pandas()
+            frame[KEY_COLUMN] = np.repeat(segment_entries['key'].to_numpy(), lengths)
+            frames.append(frame)
+        hit_keys = set(entries['key']) - evicted
+        missing = [key for key in keys if key not in hit_keys]
+        with self._lock:
+            self.hits += len(hit_keys)
+            self.misses += len(missing)
+        rows = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=[KEY_COLUMN])
+        return rows, missing
+
+    def put(self, rows: pd.DataFrame, keys: List[str]) -> None:
+        """Store one segment with the rows of ``keys``, grouped by ``KEY_COLUMN``, then evict if over the cap.
+
+        Keys without rows are stored as empty entries so they count as hits later.
+        """
+        import pyarrow as pa
+
+        if not keys:
+            return
+        codes = pd.Categorical(rows[KEY_COLUMN], categories=keys).codes
+        order = np.argsort(codes, kind='stable')
+        lengths = np.bincount(codes[codes >= 0], minlength=len(keys))
+        starts = np.cumsum(lengths) - lengths
+        name = uuid.uuid4().hex
+        segment_rows = rows.iloc[order[codes[order] >= 0]].drop(columns=[KEY_COLUMN])
+        table = pa.Table.from_pandas(segment_rows, preserve_index=False)
+        with pa.OSFile(self._segment_path(name), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema, options=pa.ipc.IpcWriteOptions(compression='zstd')) as writer:
+                writer.write_table(table)
+        size = os.path.getsize(self._segment_path(name))
+
+        with self._lock:
+            self._db.execute('INSERT INTO segments VALUES (?, ?, ?)', (name, size, time.time()))
+            self._db.executemany(
+                'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)',
+                [(key, name, int(start), int(length)) for key, start, length in zip(keys, starts, lengths)],
+            )
+            self._db.commit()
+        self.evict()
+
+    def evict(self) -> None:
+        """Delete least recently used segments until the cache fits in ``max_bytes``.
+
+        A segment is first renamed away atomically, so a concurrent ``get`` either reads
+        the whole file or finds none and counts a miss. A segment that cannot be renamed
+        because another process holds it open (on Windows) is kept for a later eviction.
+        """
+        with self._lock:
+            total = self._db.execute('SELECT COALESCE(SUM(bytes), 0) FROM segments').fetchone()[0]
+            evicted = []
+            for name, size in self._db.execute('SELECT name, bytes FROM segments ORDER BY last_access').fetchall():
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.replace(self._segment_path(name), self._segment_path(name) + _EVICTED_SUFFIX)
+                except FileNotFoundError:
+                    pass  # Already evicted by another process
+                except OSError:
+                    continue
+                self._db.execute('DELETE FROM entries WHERE segment = ?', (name,))
+                self._db.execute('DELETE FROM segments WHERE name = ?', (name,))
+                evicted.append(name)
+                total -= size
+            self._db.commit()
+        for name in evicted:
+            with contextlib.suppress(OSError):
+                os.remove(self._segment_path(name) + _EVICTED_SUFFIX)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the current cache size."""
+        with self._lock:
+            size, segments = self._db.execute('SELECT COALESCE(SUM(bytes), 0), COUNT(*) FROM segments').fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'bytes': size,
+            'segments': segments,
+        }
+
+
+class CachedClient:
+    """Wrapper that serves per-series results from a ``ResponseCache`` and sends only misses.
+
+    Keys combine the content fingerprint of each series with the call parameters
+    (``h``, ``freq``, ``finetune_steps``, ``finetune_loss``, ``n_windows``, ``add_history``
+    and any other keyword argument). Identical series under different ids share an entry.
+    Fine-tuning (``finetune_steps > 0``) trains on the whole panel, so the keys of a
+    fine-tuned call also include the fingerprint of the full panel it was sent: its
+    entries are only reused by a call with the same series and parameters.
+
+    Args:
+        client: A ``NixtlaClient``, ``BatchedDispatcher`` or any object with the same methods.
+        cache: The cache to read from and fill.
+    """
+
+    def __init__(self, client, cache: ResponseCache):
+        self.client = client
+        self.cache = cache
+
+    def _cached_call(self, method_name: str, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        fingerprints = series_fingerprints(df)
+        params = kwargs
+        if kwargs.get('finetune_steps'):
+            panel_key = hashlib.sha256(''.join(np.sort(fingerprints.to_numpy())).encode()).hexdigest()
+            params = {**kwargs, '_panel': panel_key}
+        keys = params_fingerprint(method_name, params) + '-' + fingerprints
+        # One representative id per distinct key is enough to fill the cache
+        representatives = keys.drop_duplicates()
+        rows, missing = self.cache.get(representatives.tolist())
+
+        if missing:
+            missing_keys = representatives[representatives.isin(missing)]
+            response = getattr(self.client, method_name)(df=df[df['unique_id'].isin(missing_keys.index)], **kwargs)
+            response = response.assign(**{KEY_COLUMN: response['unique_id'].map(missing_keys).to_numpy()})
+            self.cache.put(response, missing_keys.tolist())
+            rows = pd.concat([rows, response], ignore_index=True) if len(rows) else response
+
+        if not len(rows):
+            return rows.drop(columns=[KEY_COLUMN])
+        # Attach cached rows to every series with that key, keeping sorted unique_id order
+        mapping = pd.DataFrame({'unique_id': keys.index, KEY_COLUMN: keys.to_numpy()})
+        result = mapping.merge(rows.drop(columns=['unique_id']), on=KEY_COLUMN, how='inner')
+        columns = [col for col in rows.columns if col != KEY_COLUMN]
+        return result[columns]
+
+    def forecast(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        """Cached ``NixtlaClient.forecast``."""
+        return self._cached_call('forecast', df, **kwargs)
+
+    def cross_validation(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        """Cached ``NixtlaClient.cross_validation``."""
+        return self._cached_call('cross_validation', df, **kwargs)
+
+    def detect_anomalies(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        """Cached ``NixtlaClient.detect_anomalies``."""
+        return self._cached_call('detect_anomalies', df, **kwargs)
@@ -0,0 +1,284 @@
+import os
+import json
+import time
+import socket
+import argparse
+import threading
+import http.client
+import socketserver
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from more_examples.config import DATASETTRAINPATH, RESPONSECACHEDIR
+from more_examples.dataset_store import load_dataset
+from more_examples.dispatcher import BatchedDispatcher, MicroBatcher
+from more_examples.dtype_policy import DTYPE_POLICY
+from more_examples.panel_index import PanelIndex
+from more_examples.response_cache import CachedClient, ResponseCache
+
+
+class LatencyRecorder:
+    """Thread-safe record of the latest request latencies of every endpoint."""
+
+    def __init__(self, max_samples: int = 10_000):
+        self._samples = defaultdict(lambda: deque(maxlen=max_samples))
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        with self._lock:
+            self._samples[endpoint].append(seconds)
+
+    def percentiles(self) -> Dict[str, dict]:
+        """Count and p50/p90/p99/max latency in milliseconds per endpoint."""
+        with self._lock:
+            samples = {endpoint: np.asarray(values) * 1000 for endpoint, values in self._samples.items()}
+        stats = {}
+        for endpoint, values in samples.items():
+            p50, p90, p99 = np.percentile(values, [50, 90, 99])
+            stats[endpoint] = {'count': len(values), 'p50_ms': p50, 'p90_ms': p90, 'p99_ms': p99, 'max_ms': values.max()}
+        return stats
+
+
+class ForecastService:
+    """Warm state of the resident forecast service.
+
+    The client, the preloaded datasets (indexed by ``PanelIndex``) and the reconcilers are
+    created once. Calls go through a ``MicroBatcher``, so concurrent small requests with
+    the same parameters become one upstream call, and through a ``CachedClient`` when a
+    cache is given, so series already answered are not sent again.
+
+    Args:
+        client: A ``NixtlaClient``, ``BatchedDispatcher`` or ``FakeNixtlaClient``.
+        datasets: Panels requests can refer to by name.
+        hierarchy: Optional (aggregated training panel, S frame, tags) served by ``reconcile``.
+        reconcile_methods: Reconciliation methods created once for ``reconcile``.
+        cache: Optional response cache in front of the batcher.
+        window: Seconds the batcher waits to collect concurrent requests.
+    """
+
+    def __init__(self, client, datasets: Optional[Dict[str, pd.DataFrame]] = None,
+                 hierarchy: Optional[Tuple[pd.DataFrame, pd.DataFrame, dict]] = None,
+                 reconcile_methods: Optional[List[str]] = None, cache: Optional[ResponseCache] = None,
+                 window: float = 0.02):
+        self.batcher = MicroBatcher(client, window=window)
+        self.client = CachedClient(self.batcher, cache) if cache is not None else self.batcher
+        self.panels = {name: PanelIndex(df) for name, df in (datasets or {}).items()}
+        for panel in self.panels.values():
+            # pandas builds an index's hash table lazily, and not thread-safely; build it before serving
+            panel.unique_ids.get_indexer(panel.unique_ids)
+        self.hierarchy = hierarchy
+        self.reconciler = None
+        if hierarchy is not None:
+            from hierarchicalforecast.core import HierarchicalReconciliation
+            from more_examples.Hierarchical_forecasting.utils import get_reconcilers
+
+            self.reconciler = HierarchicalReconciliation(reconcilers=get_reconcilers(reconcile_methods or ['BottomUp']))
+        self.latency = LatencyRecorder()
+
+    def _panel(self, payload: dict) -> pd.DataFrame:
+        """The request's series: inline ``data`` records, or ``unique_ids`` of a preloaded ``dataset``."""
+        if 'data' in payload:
+            df = pd.DataFrame(payload['data'])
+            df['ds'] = pd.to_datetime(df['ds'])
+            return df
+        panel = self.panels.get(payload.get('dataset'))
+        if panel is None:
+            raise ValueError(f"Unknown dataset {payload.get('dataset')!r}, known: {sorted(self.panels)}")
+        return panel.select(payload['unique_ids']) if 'unique_ids' in payload else panel.df
+
+    def forecast(self, payload: dict) -> pd.DataFrame:
+        """``{"data" | "dataset" [+ "unique_ids"], "params": {h, freq, ...}}`` -> forecasts."""
+        return self.client.forecast(df=self._panel(payload), **payload.get('params', {}))
+
+    def detect_anomalies(self, payload: dict) -> pd.DataFrame:
+        """Same request shape as ``forecast``, answered with ``detect_anomalies``."""
+        return self.client.detect_anomalies(df=self._panel(payload), **payload.get('params', {}))
+
+    def reconcile(self, payload: dict) -> pd.DataFrame:
+        """``{"params": {h, freq, ...}}`` -> reconciled forecasts of the preloaded hierarchy."""
+        if self.hierarchy is None:
+            raise ValueError("The service was started without a hierarchy")
+        from more_examples.Hierarchical_forecasting.utils import split_fitted_and_forecast
+
+        df_train, s_df, tags = self.hierarchy
+        params = {'h': 1, 'freq': 'ME', **payload.get('params', {}), 'add_history': True}
+        timegpt_fcst = self.client.forecast(df=df_train, **params)
+        timegpt_fcst['ds'] = pd.to_datetime(timegpt_fcst['ds'])
+        Y_hat_df, Y_df = split_fitted_and_forecast(timegpt_fcst, df_train)
+        return self.reconciler.reconcile(Y_hat_df=Y_hat_df, Y_df=Y_df, S_df=s_df, tags=tags)
+
+    def stats(self) -> dict:
+        """Latency percentiles per endpoint, batching counts and cache counts."""
+        stats = {'latency': self.latency.percentiles(), 'batching': self.batcher.stats()}
+        if isinstance(self.client, CachedClient):
+            stats['cache'] = self.client.cache.stats()
+        return stats
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    post_routes = {'/forecast': 'forecast', '/detect_anomalies': 'detect_anomalies', '/reconcile': 'reconcile'}
+
+    def address_string(self) -> str:
+        # Unix socket peers have no host/port
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _reply(self, status: int, body: str) -> None:
+        data = body.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        if self.path == '/health':
+            self._reply(200, json.dumps({'status': 'ok'}))
+        elif self.path == '/stats':
+            self._reply(200, json.dumps(self.server.service.stats(), default=float))
+        else:
+            self._reply(404, json.dumps({'error': f'Unknown path {self.path}'}))
+
+    def do_POST(self) -> None:
+        method_name = self.post_routes.get(self.path)
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length) if length else b'{}'
+        if method_name is None:
+            self._reply(404, json.dumps({'error': f'Unknown path {self.path}'}))
+            return
+        service = self.server.service
+        start = time.perf_counter()
+        try:
+            result = getattr(service, method_name)(json.loads(body))
+        except (ValueError, KeyError, TypeError) as exc:
+            self._reply(400, json.dumps({'error': f'{type(exc).__name__}: {exc}'}))
+            return
+        except Exception as exc:
+            self._reply(500, json.dumps({'error': f'{type(exc).__name__}: {exc}'}))
+            return
+        latency = time.perf_counter() - start
+        service.latency.record(self.path, latency)
+        # The frame is serialized by pandas and spliced in, not parsed back into Python objects
+        records = result.to_json(orient='records', date_format='iso', double_precision=15)
+        self._reply(200, f'{{"result": {records}, "latency_ms": {latency * 1000:.3f}}}')
+
+
+class _ThreadingHTTPServer(ThreadingHTTPServer):
+    # Schedulers open many connections at once; the default backlog of 5 refuses them
+    request_queue_size = 128
+
+
+class _ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def make_server(service: ForecastService, host: str = '127.0.0.1', port: int = 8765, socket_path: Optional[str] = None,
+                verbose: bool = False):
+    """Create a threaded HTTP server for ``service`` on ``host:port``, or on a Unix socket if ``socket_path`` is set.
+
+    Call ``serve_forever()`` on the result (e.g. in a thread) and ``shutdown()`` to stop it.
+    """
+    if socket_path is not None:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = _ThreadingUnixHTTPServer(socket_path, _Handler)
+    else:
+        server = _ThreadingHTTPServer((host, port), _Handler)
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def call_service(path: str, payload: Optional[dict] = None, address: Union[str, Tuple[str, int]] = ('127.0.0.1', 8765),
+                 timeout: float = 300) -> dict:
+    """Send one request to a running service; ``address`` is (host, port) or a Unix socket path.
+
+    POSTs ``payload`` as JSON when given, otherwise GETs. Raises ``RuntimeError`` on an
+    error status.
+    """
+    if isinstance(address, str):
+        connection = _UnixHTTPConnection(address, timeout)
+    else:
+        connection = http.client.HTTPConnection(*address, timeout=timeout)
+    try:
+        if payload is None:
+            connection.request('GET', path)
+        else:
+            connection.request('POST', path, body=json.dumps(payload, default=str), headers={'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        body = json.loads(response.read())
+    finally:
+        connection.close()
+    if response.status != 200:
+        raise RuntimeError(f"{path} failed with {response.status}: {body.get('error')}")
+    return body
+
+
+def main() -> None:
+    """Run the resident forecast service."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--socket', help='Serve on this Unix socket instead of TCP')
+    parser.add_argument('--window', type=float, default=0.02, help='Seconds to collect concurrent requests into one call')
+    parser.add_argument('--dataset', action='append', default=[], metavar='NAME=PATH',
+                        help=f'Preload a dataset, default train={DATASETTRAINPATH}')
+    parser.add_argument('--hierarchical', action='store_true', help='Preload the hierarchical example for /reconcile')
+    parser.add_argument('--fake', action='store_true', help='Use the offline fake client instead of the API')
+    parser.add_argument('--fake-latency', type=float, default=0.2)
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    if args.fake:
+        from more_examples.fake_client import FakeNixtlaClient
+
+        client = FakeNixtlaClient(latency=args.fake_latency)
+    else:
+        from nixtla import NixtlaClient
+        from more_examples.utils import load_environment_variables
+
+        client = BatchedDispatcher(NixtlaClient(api_key=load_environment_variables()))
+
+    datasets = dict(spec.split('=', 1) for spec in args.dataset) or {'train': DATASETTRAINPATH}
+    datasets = {name: load_dataset(path, dtype_policy=DTYPE_POLICY) for name, path in datasets.items()}
+    hierarchy, methods = None, None
+    if args.hierarchical:
+        from more_examples.Hierarchical_forecasting.utils import load_data, load_pickle
+        from more_examples.Hierarchical_forecasting.config import DATASETTRAINAGGPATH, DATASETSDFPATH, TAGSPICKELPATH
+
+        hierarchy = (load_data(DATASETTRAINAGGPATH), load_data(DATASETSDFPATH), load_pickle(TAGSPICKELPATH))
+        methods = ['MinTraceOLS', 'MinTraceShrink', 'BottomUp', 'ERMClosed', 'OptimalCombinationWLSStruct']
+
+    service = ForecastService(client, datasets=datasets, hierarchy=hierarchy, reconcile_methods=methods,
+                              cache=None if args.no_cache else ResponseCache(RESPONSECACHEDIR), window=args.window)
+    server = make_server(service, args.host, args.port, args.socket, args.verbose)
+    print(f"Serving on {args.socket or f'http://{args.host}:{args.port}'}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+_ALIGNMENT = 64
+# Segments attached by this process; they stay open for as long as views into them may exist
+_ATTACHED: Dict[str, shared_memory.SharedMemory] = {}
+
+
+def _view(buffer, dtype: str, n_rows: int, offset: int) -> np.ndarray:
+    return np.ndarray(n_rows, dtype=dtype, buffer=buffer, offset=offset)
+
+
+class SharedFrame:
+    """Picklable handle of a DataFrame whose columns live in one shared memory segment.
+
+    ``create`` copies every column once into a new segment: numeric, bool and tz-naive
+    datetime columns as their raw buffers, and categoricals as their codes, with the
+    categories kept in the handle. Object and string columns are stored as categoricals.
+    A handle only carries the segment name, the column layout and the categories, so
+    sending it to a worker costs about as much as the id dictionary. ``frame`` rebuilds
+    the DataFrame in any process from read-only NumPy views of the segment, without
+    copying the data; adding columns to it is fine, writing into its columns raises.
+
+    Args:
+        segment: Name of the shared memory segment.
+        columns: (name, NumPy dtype, byte offset, categories or None) of every column.
+        n_rows: Rows of the frame.
+    """
+
+    def __init__(self, segment: str, columns: List[Tuple[str, str, int, Optional[pd.Index]]], n_rows: int):
+        self.segment = segment
+        self.columns = columns
+        self.n_rows = n_rows
+
+    @classmethod
+    def create(cls, df: pd.DataFrame) -> Tuple['SharedFrame', shared_memory.SharedMemory]:
+        """Copy ``df`` into a new segment and return its handle and the segment, which the caller must unlink."""
+        arrays, columns, size = [], [], 0
+        for name in df.columns:
+            values = df[name]
+            if values.dtype == object or isinstance(values.dtype, pd.StringDtype):
+                values = values.astype('category')
+            categories = None
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                values, categories = values.cat.codes, values.cat.categories
+            array = values.to_numpy()
+            if array.dtype == object:
+                raise TypeError(f"Column {name} of dtype {df[name].dtype} cannot be shared")
+            columns.append((name, array.dtype.str, size, categories))
+            arrays.append(array)
+            size += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+
+        segment = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for (_, dtype, offset, _), array in zip(columns, arrays):
+            _view(segment.buf, dtype, len(df), offset)[:] = array
+        return cls(segment.name, columns, len(df)), segment
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of the column buffers in the segment."""
+        return sum(np.dtype(dtype).itemsize for _, dtype, _, _ in self.columns) * self.n_rows
+
+    def frame(self) -> pd.DataFrame:
+        """Zero-copy DataFrame over the segment, attaching to it on first use in this process."""
+        segment = _ATTACHED.get(self.segment)
+        if segment is None:
+            segment = _ATTACHED[self.segment] = shared_memory.SharedMemory(name=self.segment)
+        data = {}
+        for name, dtype, offset, categories in self.columns:
+            array = _view(segment.buf, dtype, self.n_rows, offset)
+            array.flags.writeable = False
+            if categories is not None:
+                array = pd.Categorical.from_codes(array, dtype=pd.CategoricalDtype(categories), validate=False)
+            data[name] = array
+        return pd.DataFrame(data, copy=False)
+
+
+class SharedDatasets:
+    """Datasets loaded once into shared memory and served by path to worker processes.
+
+    The process that adds the datasets owns their segments and frees them in ``close``
+    (or on leaving the ``with`` block), after the workers are done. Pickling the object
+    only sends the handles, so ``datasets.load`` can be passed to workers as the loader
+    of their pipelines in place of reading the files again.
+    """
+
+    def __init__(self):
+        self.frames: Dict[str, SharedFrame] = {}
+        self._segments: List[shared_memory.SharedMemory] = []
+
+    def add(self, path: str, df: pd.DataFrame) -> SharedFrame:
+        """Copy ``df`` into shared memory, to be served as the dataset at ``path``."""
+        frame, segment = SharedFrame.create(df)
+        self._segments.append(segment)
+        self.frames[path] = frame
+        return frame
+
+    def load(self, path: str) -> pd.DataFrame:
+        """The dataset at ``path`` as a zero-copy, read-only DataFrame."""
+        if path not in self.frames:
+            raise KeyError(f"{path} was not loaded into shared memory")
+        return self.frames[path].frame()
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of all datasets in shared memory."""
+        return sum(frame.nbytes for frame in self.frames.values())
+
+    def close(self) -> None:
+        """Free the segments owned by this process."""
+        for segment in self._segments:
+            segment.close()
+            segment.unlink()
+        self._segments = []
+
+    def __getstate__(self) -> dict:
+        return {'frames': self.frames, '_segments': []}
+
+    def __enter__(self) -> 'SharedDatasets':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,201 @@
+import os
+import sys
+import json
+import time
+import uuid
+import threading
+import contextvars
+from typing import Callable, Optional
+import pandas as pd
+
+# Directory of the JSON traces; tracing is off when unset
+TRACE_ENV = 'TIMEGPT_TRACE_DIR'
+# Set to 1 to also dump a cProfile file per stage
+PROFILE_ENV = 'TIMEGPT_PROFILE'
+# Stages open in the current thread or task, outermost first; API calls are attributed to them
+_CURRENT_STAGES: contextvars.ContextVar = contextvars.ContextVar('timegpt_stages', default=())
+
+
+def _rows(value) -> Optional[int]:
+    """Row count of a DataFrame (or an int as is)."""
+    if value is None or isinstance(value, int):
+        return value
+    return len(value)
+
+
+def _nbytes(df) -> int:
+    """In-memory size of a frame sent to or received from the API."""
+    return int(df.memory_usage(deep=True).sum()) if isinstance(df, pd.DataFrame) else 0
+
+
+def _rss_bytes() -> int:
+    """Current resident set size, from /proc on Linux and the peak from ``getrusage`` elsewhere."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def propagate_context(fn: Callable) -> Callable:
+    """Wrap ``fn`` to run in the caller's context, so API calls made from executor threads count for the caller's stage.
+
+    Every call runs in its own copy of the captured context, so the wrapper can be
+    passed to ``executor.map``/``submit`` and run in several threads at once.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+    return run
+
+
+class _NullStage:
+    """Stand-in used when tracing is off; assignments are ignored."""
+
+    rows_in = rows_out = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """One traced stage; set ``rows_in``/``rows_out`` to a DataFrame or a row count inside the block."""
+
+    def __init__(self, tracer: 'Tracer', name: str, rows_in=None):
+        self.tracer = tracer
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.api_calls = 0
+        self.payload_bytes = 0
+        self.response_bytes = 0
+
+    def _sample_rss(self) -> None:
+        while not self._stop.wait(self.tracer.rss_interval):
+            self.peak_rss = max(self.peak_rss, _rss_bytes())
+
+    def __enter__(self):
+        self._token = _CURRENT_STAGES.set(_CURRENT_STAGES.get() + (self,))
+        self.peak_rss = _rss_bytes()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample_rss, daemon=True)
+        self._sampler.start()
+        self._profiler = None
+        if self.tracer.profile:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._wall, self._cpu = time.perf_counter(), time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall, cpu = time.perf_counter() - self._wall, time.process_time() - self._cpu
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler.dump_stats(os.path.join(self.tracer.trace_dir, f'{self.tracer.run_id}-{self.name}.prof'))
+        self._stop.set()
+        self._sampler.join()
+        self.peak_rss = max(self.peak_rss, _rss_bytes())
+        _CURRENT_STAGES.reset(self._token)
+        self.tracer._write({
+            'run_id': self.tracer.run_id,
+            'pipeline': self.tracer.pipeline,
+            'stage': self.name,
+            'status': 'error' if exc_type else 'ok',
+            'wall_s': wall,
+            'cpu_s': cpu,
+            'peak_rss_mb': self.peak_rss / 1024 ** 2,
+            'rows_in': _rows(self.rows_in),
+            'rows_out': _rows(self.rows_out),
+            'api_calls': self.api_calls,
+            'payload_bytes': self.payload_bytes,
+            'response_bytes': self.response_bytes,
+        })
+        return False
+
+
+class TracedClient:
+    """Client wrapper that adds request and response sizes to the stages open in the calling context.
+
+    A call counts for the stage (and the enclosing stages) of the thread that makes it,
+    not for stages running concurrently in other threads. Code that calls the API from
+    its own thread pool wraps its jobs with ``propagate_context``.
+    """
+
+    def __init__(self, client, tracer: 'Tracer'):
+        self.client = client
+        self.tracer = tracer
+
+    def _traced_call(self, method_name: str, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        response = getattr(self.client, method_name)(df=df, **kwargs)
+        with self.tracer._lock:
+            for stage in _CURRENT_STAGES.get():
+                stage.api_calls += 1
+                stage.payload_bytes += _nbytes(df)
+                stage.response_bytes += _nbytes(response)
+        return response
+
+    def forecast(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        return self._traced_call('forecast', df, **kwargs)
+
+    def cross_validation(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        return self._traced_call('cross_validation', df, **kwargs)
+
+    def detect_anomalies(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        return self._traced_call('detect_anomalies', df, **kwargs)
+
+
+class Tracer:
+    """Stage-level tracing of a pipeline ``main()``, switched on by the ``TIMEGPT_TRACE_DIR`` environment variable.
+
+    Every ``with tracer.stage(name)`` block appends one JSON line to
+    ``<trace dir>/<pipeline>-<run id>.jsonl`` with wall and CPU time, peak RSS (sampled
+    every ``rss_interval`` seconds), rows in/out and the bytes sent to and received from
+    the API by clients wrapped with ``tracer.client``. With ``TIMEGPT_PROFILE=1`` a
+    cProfile dump is also written per stage. When tracing is off, ``stage`` returns a
+    shared no-op object and ``client`` returns the client unchanged.
+
+    Args:
+        pipeline: Name of the pipeline, e.g. ``'fine_tune'``.
+        trace_dir: Overrides the environment variable.
+        profile: Overrides the ``TIMEGPT_PROFILE`` environment variable.
+        rss_interval: Seconds between RSS samples.
+    """
+
+    def __init__(self, pipeline: str, trace_dir: Optional[str] = None, profile: Optional[bool] = None, rss_interval: float = 0.01):
+        self.pipeline = pipeline
+        self.trace_dir = trace_dir or os.environ.get(TRACE_ENV)
+        self.enabled = bool(self.trace_dir)
+        self.profile = self.enabled and (profile if profile is not None else os.environ.get(PROFILE_ENV) == '1')
+        self.rss_interval = rss_interval
+        self.run_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        self._lock = threading.Lock()
+        if self.enabled:
+            os.makedirs(self.trace_dir, exist_ok=True)
+            self.path = os.path.join(self.trace_dir, f'{pipeline}-{self.run_id}.jsonl')
+
+    def stage(self, name: str, rows_in=None):
+        """Context manager tracing one stage."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, rows_in)
+
+    def client(self, client):
+        """Wrap the client that talks to the API so its payload and response sizes are traced."""
+        return TracedClient(client, self) if self.enabled else client
+
+    def _write(self, record: dict) -> None:
+        with self._lock, open(self.path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
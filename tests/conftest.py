@@ -0,0 +1,27 @@
+from typing import Optional, Sequence, Union
+import numpy as np
+import pandas as pd
+
+
+def make_panel(n_series: int = 3, n_rows: Union[int, Sequence[int]] = 12, freq: str = 'ME', seed: Optional[int] = 0,
+               ids: Optional[Sequence] = None, start: str = '2022-01-31') -> pd.DataFrame:
+    """Panel of series in ``ids`` order, each with regular timestamps from ``start``.
+
+    Args:
+        n_series: Number of series, ignored when ``ids`` is given.
+        n_rows: Rows of every series, or one length per series.
+        freq: Frequency of the timestamps.
+        seed: Seed of uniform random ``y`` values; None numbers the rows 0, 1, 2... instead.
+        ids: Series ids, default ``id_0``, ``id_1``... zero-padded so they sort in order.
+    """
+    if ids is None:
+        width = len(str(max(n_series - 1, 0)))
+        ids = [f'id_{i:0{width}d}' for i in range(n_series)]
+    sizes = np.broadcast_to(n_rows, len(ids))
+    dates = pd.date_range(start, periods=int(sizes.max(initial=0)), freq=freq)
+    n_total = int(sizes.sum())
+    return pd.DataFrame({
+        'unique_id': np.repeat(np.asarray(ids), sizes),
+        'ds': np.concatenate([dates[:size] for size in sizes]) if len(sizes) else dates[:0],
+        'y': np.random.default_rng(seed).random(n_total) if seed is not None else np.arange(n_total, dtype=float),
+    })
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+from more_examples.fake_client import FakeNixtlaClient
+from more_examples.anomaly_detection.streaming import StreamingAnomalyDetector
+
+
+def _points(ids, start: str, periods: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'unique_id': np.repeat(ids, periods),
+        'ds': np.tile(pd.date_range(start, periods=periods, freq='D'), len(ids)),
+        'y': rng.normal(10, 1, len(ids) * periods),
+    })
+
+
+def test_points_are_scored_locally_until_a_series_expires():
+    fake = FakeNixtlaClient()
+    detector = StreamingAnomalyDetector(fake, max_points=5, min_rows=10, freq='D')
+    detector.fit(_points(['a', 'b'], '2022-01-01', 30))
+    scored = detector.update(_points(['a', 'b'], '2022-01-31', 2, seed=1).assign(y=[10.0, 13.5, 10.0, 10.0]))
+    assert fake.calls == 1
+    assert scored.set_index(['unique_id', 'ds'])['anomaly'].tolist() == [0, 1, 0, 0]
+
+    detector.update(_points(['a'], '2022-02-02', 3, seed=2))
+    assert fake.calls == 2
+    assert detector.redetections == 2
+
+
+def test_history_is_capped_per_series():
+    fake = FakeNixtlaClient()
+    detector = StreamingAnomalyDetector(fake, max_points=1000, min_rows=5, history_length=20, freq='D')
+    detector.fit(_points(['a'], '2022-01-01', 50))
+    detector.update(_points(['a'], '2022-02-20', 7))
+    history = detector.history()
+    assert len(history) == 20
+    assert history['ds'].is_monotonic_increasing
+    assert history['ds'].iloc[-1] == pd.Timestamp('2022-02-26')
+
+
+def test_new_series_are_buffered_until_min_rows():
+    fake = FakeNixtlaClient()
+    detector = StreamingAnomalyDetector(fake, min_rows=6, freq='D')
+    detector.fit(_points(['a'], '2022-01-01', 30))
+    assert detector.update(_points(['b'], '2022-01-01', 4)).empty
+    scored = detector.update(_points(['b'], '2022-01-05', 2))
+    assert fake.calls == 2
+    assert fake.rows_received == 30 + 6
+    assert list(scored['unique_id']) == ['b', 'b']
@@ -0,0 +1,39 @@
+import sys
+import subprocess
+import numpy as np
+from more_examples.benchmarks.suite import compare, measure
+from more_examples.benchmarks.synthetic import hierarchy_columns, make_panel
+
+
+def test_make_panel_builds_a_sorted_hierarchy():
+    df = make_panel(25, 6, hierarchy_depth=2, branching=5)
+    assert len(df) == 25 * 6 and df['unique_id'].nunique() == 25
+    assert list(df.columns[-2:]) == hierarchy_columns(2)
+    assert df['level_1'].nunique() == 5
+    assert (df['y'] > 0).all()
+
+
+def test_measure_times_and_traces_separate_runs():
+    runs = []
+
+    def stage() -> int:
+        runs.append(np.ones(1_000_000))
+        return 10
+
+    row = measure('stage', stage)
+    assert len(runs) == 2
+    assert row['rows'] == 10 and row['peak_mb'] >= 7
+
+
+def test_measure_sees_child_processes():
+    def stage() -> int:
+        subprocess.run([sys.executable, '-c', 'b = bytearray(200 * 1024 ** 2)'], check=True)
+        return 1
+
+    assert measure('children', stage)['child_peak_mb'] >= 200
+
+
+def test_compare_flags_slower_stages_only():
+    baseline = [{'stage': 'a', 'wall_s': 1.0, 'peak_mb': 10.0}, {'stage': 'b', 'wall_s': 1.0, 'peak_mb': 10.0}]
+    results = [{'stage': 'a', 'wall_s': 2.0, 'peak_mb': 10.0}, {'stage': 'b', 'wall_s': 1.1, 'peak_mb': 10.0}]
+    assert compare(results, baseline, tolerance=0.2, min_seconds=0.05) == ['a: wall 1.000s -> 2.000s']
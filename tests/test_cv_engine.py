@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+from more_examples.fake_client import FakeNixtlaClient
+from more_examples.cross_validation.cv_engine import ClientForecaster, CrossValidationEngine, HistoricAverage, Naive
+from tests.conftest import make_panel
+
+
+class ShuffledStringIdClient:
+    """Returns the fake forecasts with string ids, in reverse order."""
+
+    def __init__(self):
+        self.fake = FakeNixtlaClient()
+
+    def forecast(self, df, **kwargs):
+        fcst_df = self.fake.forecast(df=df, **kwargs)
+        return fcst_df.astype({'unique_id': str}).iloc[::-1].reset_index(drop=True)
+
+
+def test_local_forecasters_match_their_definitions():
+    df = make_panel(ids=['a', 'b'], n_rows=24).sample(frac=1, random_state=0)
+    cv_df = CrossValidationEngine([Naive(), HistoricAverage()]).cross_validation(df, h=3, n_windows=2)
+    assert len(cv_df) == 2 * 2 * 3
+    first = cv_df[(cv_df['unique_id'] == 'a')].iloc[0]
+    history = df[(df['unique_id'] == 'a') & (df['ds'] <= first['cutoff'])].sort_values('ds')['y']
+    assert np.isclose(first['Naive'], history.iloc[-1])
+    assert np.isclose(first['HistoricAverage'], history.mean())
+
+
+def test_client_results_are_joined_by_id_and_date(tmp_path):
+    df = make_panel(ids=[10, 2], n_rows=24).sample(frac=1, random_state=0)
+    engine = CrossValidationEngine([Naive(), ClientForecaster(ShuffledStringIdClient(), freq='ME')], cache_dir=str(tmp_path))
+    cv_df = engine.cross_validation(df, h=2, n_windows=2)
+    # The fake client forecasts the last value, as Naive does
+    np.testing.assert_allclose(cv_df['TimeGPT'], cv_df['Naive'])
+    assert cv_df['unique_id'].dtype == df['unique_id'].dtype
+
+    cached = CrossValidationEngine(engine.forecasters, cache_dir=str(tmp_path)).cross_validation(df, h=2, n_windows=2)
+    pd.testing.assert_frame_equal(cached, cv_df)
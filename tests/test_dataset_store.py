@@ -0,0 +1,46 @@
+import os
+import pandas as pd
+from more_examples.dataset_store import convert_csv_to_store, load_dataset, store_path_for
+from tests.conftest import make_panel
+
+
+def _panel(n_series: int = 3, offset: float = 0.0) -> pd.DataFrame:
+    # Integer ids, written out of order, so the CSV and the store have to agree on layout and dtypes
+    df = make_panel(ids=list(reversed(range(n_series))), n_rows=4, seed=None, start='2023-01-31')
+    return df.assign(ds=df['ds'].dt.strftime('%Y-%m-%d'), y=df['y'] + offset)
+
+
+def test_csv_and_store_return_the_same_frame(tmp_path):
+    csv_path = str(tmp_path / 'train.csv')
+    _panel().to_csv(csv_path, index=False)
+    from_csv = load_dataset(csv_path)
+    convert_csv_to_store(csv_path)
+    from_store = load_dataset(csv_path)
+    pd.testing.assert_frame_equal(from_csv, from_store)
+    assert isinstance(from_store['unique_id'].dtype, pd.CategoricalDtype)
+    assert list(from_store['unique_id'].cat.categories) == ['0', '1', '2']
+
+
+def test_series_subset_is_the_same_from_csv_and_store(tmp_path):
+    csv_path = str(tmp_path / 'train.csv')
+    _panel().to_csv(csv_path, index=False)
+    from_csv = load_dataset(csv_path, unique_ids=[2, 0])
+    convert_csv_to_store(csv_path)
+    from_store = load_dataset(csv_path, unique_ids=[2, 0])
+    pd.testing.assert_frame_equal(from_csv, from_store)
+    assert set(from_store['unique_id']) == {'0', '2'}
+
+
+def test_store_is_rebuilt_when_the_csv_changes(tmp_path):
+    csv_path = str(tmp_path / 'train.csv')
+    _panel().to_csv(csv_path, index=False)
+    convert_csv_to_store(csv_path)
+    assert load_dataset(csv_path)['y'].min() == 0.0
+
+    _panel(n_series=4, offset=100.0).to_csv(csv_path, index=False)
+    stat = os.stat(store_path_for(csv_path))
+    # Same mtime as the store would hide a size-only change; make the edit strictly newer
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    reloaded = load_dataset(csv_path)
+    assert reloaded['y'].min() == 100.0
+    assert reloaded['unique_id'].nunique() == 4
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+from more_examples.dispatcher import BatchedDispatcher, split_into_batches
+from more_examples.fake_client import FakeNixtlaClient
+from tests.conftest import make_panel
+
+
+def test_batches_never_exceed_the_row_bound():
+    batches = split_into_batches(make_panel(5, 99, seed=None), max_rows=100)
+    assert [len(batch) for batch in batches] == [99] * 5
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_greedy_packing_keeps_whole_series_within_the_bound(seed):
+    sizes = np.random.default_rng(seed).integers(1, 150, 60)
+    df = make_panel(len(sizes), sizes, seed=None)
+    batches = split_into_batches(df, max_rows=100)
+    for batch in batches:
+        # Only a single series longer than the bound may exceed it
+        assert len(batch) <= 100 or batch['unique_id'].nunique() == 1
+    ids = [set(batch['unique_id']) for batch in batches]
+    assert sum(len(batch_ids) for batch_ids in ids) == df['unique_id'].nunique()
+    pd.testing.assert_frame_equal(pd.concat(batches).reset_index(drop=True), df)
+    # Greedy: the next series would not have fit into the previous batch
+    for previous, following in zip(batches[:-1], batches[1:]):
+        first_size = (following['unique_id'] == following['unique_id'].iloc[0]).sum()
+        assert len(previous) + first_size > 100
+
+
+def test_fine_tuning_calls_are_sent_unsplit():
+    fake = FakeNixtlaClient()
+    dispatcher = BatchedDispatcher(fake, max_rows_per_batch=50)
+    df = make_panel(10, 40, seed=None)
+    dispatcher.forecast(df=df, h=1, freq='ME', finetune_steps=10)
+    assert fake.calls == 1
+    dispatcher.forecast(df=df, h=1, freq='ME')
+    assert fake.calls == 11
+
+    split = BatchedDispatcher(FakeNixtlaClient(), max_rows_per_batch=50, split_finetune=True)
+    split.forecast(df=df, h=1, freq='ME', finetune_steps=10)
+    assert split.client.calls == 10
+
+
+class _FailingClient:
+    def __init__(self, exc: Exception, failures: int):
+        self.exc = exc
+        self.failures = failures
+        self.calls = 0
+
+    def forecast(self, df, **kwargs):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.exc
+        return FakeNixtlaClient().forecast(df=df, **kwargs)
+
+
+def test_transient_errors_are_retried():
+    client = _FailingClient(ConnectionError('reset'), failures=2)
+    dispatcher = BatchedDispatcher(client, max_retries=3, backoff_seconds=0)
+    assert len(dispatcher.forecast(df=make_panel(1, 5, seed=None), h=1, freq='ME')) == 1
+    assert client.calls == 3
+
+
+def test_other_errors_are_raised_at_once():
+    client = _FailingClient(ValueError('bad freq'), failures=1)
+    dispatcher = BatchedDispatcher(client, max_retries=3, backoff_seconds=0)
+    with pytest.raises(ValueError):
+        dispatcher.forecast(df=make_panel(1, 5, seed=None), h=1, freq='ME')
+    assert client.calls == 1
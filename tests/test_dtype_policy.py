@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+from more_examples.dtype_policy import DtypePolicy, unify_ids
+
+
+def test_target_keeps_its_values_and_lossless_columns_shrink():
+    policy = DtypePolicy()
+    df = pd.DataFrame({
+        'unique_id': ['b', 'a'],
+        'ds': ['2022-01-01', '2022-01-02'],
+        'y': [0.1, 1e-7 + 1],
+        'dummy': [0.0, 1.0],
+        'price': [0.1, 0.2],
+        'count': [1, 2],
+    })
+    out = policy.apply(df, 'frame')
+    assert out['y'].dtype == np.float64 and (out['y'] == df['y']).all()
+    assert out['dummy'].dtype == np.float32
+    assert out['price'].dtype == np.float64
+    assert out['count'].dtype == np.int8
+    assert out['ds'].dtype == 'datetime64[ns]'
+    assert list(out['unique_id'].cat.categories) == ['a', 'b']
+    assert policy.report()['bytes_after'].iloc[0] < policy.report()['bytes_before'].iloc[0]
+
+
+def test_frames_share_the_id_dictionary():
+    policy = DtypePolicy()
+    train = policy.apply(pd.DataFrame({'unique_id': ['a', 'b'], 'y': [1.0, 2.0]}))
+    test = policy.apply(pd.DataFrame({'unique_id': ['c', 'a'], 'y': [3.0, 4.0]}))
+    assert list(test['unique_id'].cat.categories) == ['a', 'b', 'c']
+    merged = pd.merge(*unify_ids(train, test), on='unique_id')
+    assert isinstance(merged['unique_id'].dtype, pd.CategoricalDtype)
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from more_examples.fake_client import FakeNixtlaClient
+from more_examples.Hierarchical_forecasting.evaluation import evaluation_report
+from tests.conftest import make_panel
+
+
+def _train_test(h: int = 3):
+    df = make_panel(ids=['total', 'total/a', 'total/b']).assign(y=lambda df: df['y'] + 1)
+    is_test = df.groupby('unique_id').cumcount() >= 12 - h
+    return df[~is_test].reset_index(drop=True), df[is_test].reset_index(drop=True)
+
+
+def test_report_matches_a_per_series_loop_for_multi_step_forecasts():
+    df_train, df_test = _train_test(h=3)
+    fcst = FakeNixtlaClient().forecast(df=df_train, h=3, freq='ME')
+    Y_rec_df = fcst.assign(Naive=fcst['TimeGPT'] * 1.1)
+    tags = {'Total': np.array(['total']), 'Leaf': np.array(['total/a', 'total/b'])}
+    report = evaluation_report(Y_rec_df, df_test.sample(frac=1, random_state=0), tags=tags, metrics=('mae', 'rmse'))
+
+    merged = fcst.merge(df_test, on=['unique_id', 'ds']).assign(Naive=lambda df: df['TimeGPT'] * 1.1)
+    assert len(merged) == 9
+    for model in ('TimeGPT', 'Naive'):
+        errors = merged[model] - merged['y']
+        series = report.query("scope == 'series' and model == @model")
+        mae = series[series['metric'] == 'mae'].set_index('unique_id')['value']
+        expected = errors.abs().groupby(merged['unique_id']).mean()
+        np.testing.assert_allclose(mae.loc[expected.index].to_numpy(), expected.to_numpy())
+        # One row per forecast step, no cross product of the horizons
+        assert (series['n_obs'] == 3).all()
+
+        leaf = report.query("scope == 'level' and level == 'Leaf' and model == @model and metric == 'rmse'")
+        leaf_errors = errors[merged['unique_id'] != 'total']
+        np.testing.assert_allclose(leaf['value'], np.sqrt((leaf_errors ** 2).mean()))
+        overall = report.query("scope == 'overall' and model == @model and metric == 'mae'")
+        np.testing.assert_allclose(overall['value'], errors.abs().mean())
+        assert overall['n_obs'].item() == 9
+
+
+def test_zero_forecasts_are_left_out_and_unknown_metrics_are_rejected():
+    df_train, df_test = _train_test(h=1)
+    fcst = FakeNixtlaClient().forecast(df=df_train, h=1, freq='ME')
+    fcst.loc[fcst['unique_id'] == 'total/a', 'TimeGPT'] = 0.0
+    report = evaluation_report(fcst, df_test)
+    assert report.query("scope == 'series' and unique_id == 'total/a'")['n_obs'].item() == 0
+    assert report.query("scope == 'overall'")['n_obs'].item() == 2
+    with pytest.raises(ValueError):
+        evaluation_report(fcst, df_test, metrics=('mse',))
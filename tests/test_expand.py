@@ -0,0 +1,18 @@
+import pandas as pd
+from more_examples.preprocess_data.useful_functions import expand_data_with_zeros
+
+
+def test_expand_sums_duplicates_and_fills_gaps_with_zeros():
+    df = pd.DataFrame({
+        'unique_id': ['a', 'a', 'a', 'b'],
+        'ds': ['01/01/2022', '01/01/2022', '03/01/2022', '02/01/2022'],
+        'y': [1.0, 2.0, 5.0, 7.0],
+    })
+    out = expand_data_with_zeros(df, '2022-01-04')
+    a = out[out['unique_id'] == 'a']
+    assert list(a['ds'].dt.day) == [1, 2, 3, 4]
+    assert list(a['y']) == [3.0, 0.0, 5.0, 0.0]
+    b = out[out['unique_id'] == 'b']
+    assert list(b['ds'].dt.day) == [2, 3, 4] and list(b['y']) == [7.0, 0.0, 0.0]
+    # The index restarts for every series, as the original per-series loop produced
+    assert list(b.index) == [0, 1, 2]
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+from more_examples.Hierarchical_forecasting.hierarchy_builder import build_hierarchy
+
+
+def test_levels_sum_the_bottom_series():
+    bottom = pd.DataFrame({
+        'country': ['US', 'US', 'US', 'US', 'MX', 'MX'],
+        'state': ['CA', 'CA', 'TX', 'TX', 'JA', 'JA'],
+        'ds': pd.to_datetime(['2022-01-01', '2022-02-01'] * 3),
+        'y': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+    })
+    # A duplicated (series, date) row is summed into its bottom series
+    bottom = pd.concat([bottom, bottom.iloc[[0]]], ignore_index=True)
+    Y_df, S_df, tags = build_hierarchy(bottom, ['country', 'state'])
+
+    assert list(tags) == ['total', 'country', 'country/state']
+    assert list(tags['country/state']) == ['MX/JA', 'US/CA', 'US/TX']
+    y = Y_df.set_index(['unique_id', 'ds'])['y']
+    assert y[('US/CA', pd.Timestamp('2022-01-01'))] == 2.0
+    assert y[('US', pd.Timestamp('2022-01-01'))] == 5.0
+    assert y[('total', pd.Timestamp('2022-02-01'))] == 12.0
+
+    S = S_df.set_index('unique_id').sparse.to_dense()
+    assert list(S.index) == ['total', 'MX', 'US', 'MX/JA', 'US/CA', 'US/TX']
+    np.testing.assert_array_equal(S.loc['US'], [0, 1, 1])
+    np.testing.assert_array_equal(S.loc[tags['country/state']], np.eye(3))
@@ -0,0 +1,31 @@
+import pandas as pd
+from more_examples.fake_client import FakeNixtlaClient
+from more_examples.incremental import IncrementalForecaster, detect_changes, series_state
+from tests.conftest import make_panel
+
+
+def test_detect_changes_classifies_every_series():
+    previous = series_state(make_panel(ids=['a', 'b', 'c']))
+    current = make_panel(ids=['a', 'b', 'c', 'd'])
+    current.loc[current['unique_id'] == 'b', 'y'] += 1
+    appended = current[current['unique_id'] == 'c'].tail(1).assign(ds=pd.Timestamp('2023-01-31'))
+    status = detect_changes(pd.concat([current, appended]), previous).set_index('unique_id')['status']
+    assert status.to_dict() == {'a': 'unchanged', 'b': 'modified', 'c': 'appended', 'd': 'new'}
+
+
+def test_rerun_keeps_stored_forecasts_of_int_ids(tmp_path):
+    fake = FakeNixtlaClient()
+    forecaster = IncrementalForecaster(fake, str(tmp_path))
+    df = make_panel(ids=[1, 2, 3])
+    first = forecaster.forecast(df, h=2, freq='ME')
+    second = forecaster.forecast(df, h=2, freq='ME')
+    assert fake.calls == 1
+    assert len(second) == len(first) == 6
+    assert second['unique_id'].dtype == df['unique_id'].dtype
+    pd.testing.assert_frame_equal(first, second, check_dtype=False)
+
+    changed = df.copy()
+    changed.loc[changed['unique_id'] == 2, 'y'] += 1
+    third = forecaster.forecast(changed, h=2, freq='ME')
+    assert fake.calls == 2
+    assert sorted(third['unique_id'].unique()) == [1, 2, 3]
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+from more_examples.metrics import evaluate, mape, smape
+
+
+def test_zero_rules():
+    np.testing.assert_allclose(mape([0, 0, 2], [0, 1, 1]), [0, 100, 50])
+    np.testing.assert_allclose(smape([0, 1], [0, 3]), [0, 100])
+
+
+def test_evaluate_matches_a_per_series_loop():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'unique_id': np.repeat(['b', 'a', 'c'], 4),
+        'y': rng.random(12) + 1,
+        'm1': rng.random(12),
+        'm2': rng.random(12),
+    })
+    df_train = pd.DataFrame({'unique_id': np.repeat(['b', 'a', 'c'], 5), 'y': rng.random(15)})
+    out = evaluate(df, ['m1', 'm2'], df_train=df_train).set_index(['unique_id', 'metric'])
+    for uid, group in df.groupby('unique_id'):
+        y = group['y'].to_numpy()
+        train = df_train.loc[df_train['unique_id'] == uid, 'y'].to_numpy()
+        for model in ('m1', 'm2'):
+            errors = y - group[model].to_numpy()
+            expected = {
+                'mape': np.mean(np.abs(errors / y)) * 100,
+                'mae': np.mean(np.abs(errors)),
+                'rmse': np.sqrt(np.mean(errors ** 2)),
+                'mase': np.mean(np.abs(errors)) / np.mean(np.abs(np.diff(train))),
+            }
+            for metric, value in expected.items():
+                assert out.loc[(uid, metric), model] == pytest.approx(value)
+
+
+def test_mase_requires_training_data():
+    df = pd.DataFrame({'unique_id': ['a'], 'y': [1.0], 'm': [1.0]})
+    with pytest.raises(ValueError):
+        evaluate(df, ['m'], metrics=['mase'])
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+from more_examples.panel_index import PanelIndex
+
+
+def _panel() -> pd.DataFrame:
+    df = pd.DataFrame({
+        'unique_id': np.repeat(['b', 'a', 'c'], [3, 4, 2]),
+        'ds': pd.to_datetime(['2022-01-01', '2022-01-02', '2022-01-03'] + [f'2022-01-0{d}' for d in range(1, 5)] + ['2022-01-01', '2022-01-02']),
+        'y': np.arange(9, dtype=float),
+    })
+    return df.sample(frac=1, random_state=0)
+
+
+def test_sorts_once_and_slices_series():
+    index = PanelIndex(_panel())
+    assert list(index.unique_ids) == ['a', 'b', 'c']
+    assert list(index.sizes) == [4, 3, 2]
+    assert list(index.slice('b')['y']) == [0.0, 1.0, 2.0]
+    assert list(index.select(['c', 'x', 'a'])['unique_id']) == ['c', 'c', 'a', 'a', 'a', 'a']
+
+
+def test_tail_split_and_min_length_filter():
+    index = PanelIndex(_panel())
+    train, test = index.tail_split(1)
+    assert list(test['y']) == [6.0, 2.0, 8.0]
+    assert len(train) == 6
+    assert set(index.filter_min_length(3)['unique_id']) == {'a', 'b'}
+
+
+def test_join_matches_a_merge():
+    df = _panel()
+    index = PanelIndex(df)
+    left = pd.DataFrame({'unique_id': ['a', 'b', 'c', 'x'], 'ds': pd.to_datetime(['2022-01-04', '2022-01-05', '2022-01-01', '2022-01-01'])})
+    expected = left.merge(df, on=['unique_id', 'ds'], how='left')
+    pd.testing.assert_frame_equal(index.join(left, ['y']), expected)
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+from more_examples.fake_client import FakeNixtlaClient
+from more_examples.payload_shaping import TrimmedClient, freq_family
+from tests.conftest import make_panel
+
+
+@pytest.mark.parametrize('freq, family', [
+    ('ms', 'S'), ('5ms', 'S'), ('us', 'S'), ('ns', 'S'), ('L', 'S'), ('s', 'S'),
+    ('MS', 'M'), ('ME', 'M'), ('BME', 'M'), ('SM', 'M'), ('15min', 'T'), ('h', 'H'),
+    ('W-SUN', 'W'), ('QS-JAN', 'Q'), ('YE', 'Y'), ('A', 'Y'), (None, None),
+])
+def test_freq_family(freq, family):
+    assert freq_family(freq) == family
+
+
+def test_series_are_trimmed_to_the_context():
+    fake = FakeNixtlaClient()
+    client = TrimmedClient(fake, context_lengths={'M': 12})
+    fcst = client.forecast(df=make_panel(ids=['a'], n_rows=30, seed=None), h=2, freq='ME')
+    assert fake.rows_received == 12
+    assert fcst['TimeGPT'].tolist() == [29.0, 29.0]
+    assert client.stats()['rows_saved'] == 18
+
+
+@pytest.mark.parametrize('ids', [np.array([30, 10, 20]), pd.Categorical(['b', 'a', 'c'])], ids=['int', 'category'])
+def test_identical_series_are_sent_once_and_keep_their_id_dtype(ids):
+    fake = FakeNixtlaClient()
+    # Every series has the same values, so they are all sent as one
+    df = make_panel(ids=np.asarray(ids), n_rows=30).assign(y=np.tile(np.arange(30, dtype=float), 3))
+    df['unique_id'] = df['unique_id'].astype(pd.Series(ids).dtype)
+    fcst = TrimmedClient(fake).forecast(df=df, h=2, freq='ME')
+    assert fake.rows_received == 30
+    assert fcst['unique_id'].dtype == df['unique_id'].dtype
+    assert sorted(fcst['unique_id'].unique().tolist()) == sorted(pd.Series(ids).tolist())
+    assert (fcst['TimeGPT'] == 29.0).all()
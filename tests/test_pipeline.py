@@ -0,0 +1,71 @@
+import os
+import functools
+import pandas as pd
+from more_examples.fake_client import FakeNixtlaClient
+from more_examples.payload_shaping import TrimmedClient
+from more_examples.pipeline import Pipeline, client_fingerprint, export_csv
+from more_examples.response_cache import CachedClient, ResponseCache
+
+
+def load() -> pd.DataFrame:
+    return pd.DataFrame({'unique_id': ['a', 'a'], 'ds': pd.date_range('2022-01-31', periods=2, freq='ME'), 'y': [1.0, 2.0]})
+
+
+def forecast(client, df: pd.DataFrame) -> pd.DataFrame:
+    return client.forecast(df=df, h=1, freq='ME')
+
+
+class OtherClient(FakeNixtlaClient):
+    pass
+
+
+def _pipeline(checkpoint_dir: str, client, out_dir: str) -> Pipeline:
+    pipeline = Pipeline(checkpoint_dir, max_workers=2)
+    pipeline.add('load', load)
+    pipeline.add('forecast', functools.partial(forecast, client), inputs=['load'])
+    path = os.path.join(out_dir, 'forecast.csv')
+    pipeline.add('export', export_csv, inputs=['forecast'], params={'path': path}, outputs=[path])
+    return pipeline
+
+
+def test_rerun_uses_checkpoints(tmp_path):
+    first = _pipeline(str(tmp_path / 'ckpt'), FakeNixtlaClient(), str(tmp_path / 'out'))
+    first.run()
+    assert set(first.last_run.values()) == {'ran'}
+    second = _pipeline(str(tmp_path / 'ckpt'), FakeNixtlaClient(), str(tmp_path / 'out'))
+    second.run()
+    assert second.last_run == {'load': 'cached', 'forecast': 'cached', 'export': 'cached'}
+
+
+def test_clients_of_another_class_do_not_share_checkpoints(tmp_path):
+    _pipeline(str(tmp_path / 'ckpt'), FakeNixtlaClient(), str(tmp_path / 'out')).run()
+    other = _pipeline(str(tmp_path / 'ckpt'), OtherClient(), str(tmp_path / 'out'))
+    other.run()
+    assert other.last_run['load'] == 'cached' and other.last_run['forecast'] == 'ran'
+
+
+def test_client_fingerprint_skips_transparent_wrappers(tmp_path):
+    fake = FakeNixtlaClient()
+    wrapped = CachedClient(fake, ResponseCache(str(tmp_path)))
+    assert client_fingerprint(wrapped) == client_fingerprint(fake)
+    assert client_fingerprint(TrimmedClient(fake)) != client_fingerprint(TrimmedClient(fake, history_points=10))
+
+
+def test_stage_reruns_when_its_output_file_is_gone(tmp_path):
+    _pipeline(str(tmp_path / 'ckpt'), FakeNixtlaClient(), str(tmp_path / 'out')).run()
+    os.remove(tmp_path / 'out' / 'forecast.csv')
+    pipeline = _pipeline(str(tmp_path / 'ckpt'), FakeNixtlaClient(), str(tmp_path / 'out'))
+    pipeline.run()
+    assert pipeline.last_run == {'load': 'cached', 'forecast': 'cached', 'export': 'ran'}
+    assert os.path.exists(tmp_path / 'out' / 'forecast.csv')
+
+
+def test_prune_keeps_only_current_checkpoints(tmp_path):
+    _pipeline(str(tmp_path / 'ckpt'), OtherClient(), str(tmp_path / 'out')).run()
+    pipeline = _pipeline(str(tmp_path / 'ckpt'), FakeNixtlaClient(), str(tmp_path / 'out'))
+    pipeline.run()
+    removed = pipeline.prune()
+    assert len(removed) == 2  # forecast and export of the other client
+    assert len(os.listdir(tmp_path / 'ckpt')) == 3
+    pipeline.run()
+    assert set(pipeline.last_run.values()) == {'cached'}
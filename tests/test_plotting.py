@@ -0,0 +1,30 @@
+import os
+import numpy as np
+import pandas as pd
+from more_examples.plotting import render_charts
+
+
+def _frame(n_series: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'unique_id': np.repeat([f'total/s{i}' for i in range(n_series)], 10),
+        'ds': np.tile(pd.date_range('2022-01-01', periods=10, freq='D'), n_series),
+        'y': rng.random(10 * n_series),
+        'TimeGPT': rng.random(10 * n_series),
+    })
+
+
+def test_png_charts_are_skipped_when_unchanged(tmp_path):
+    df = _frame()
+    lines = {'y': 'Actual', 'TimeGPT': 'Forecast'}
+    written = render_charts(df, str(tmp_path), lines, max_workers=1)
+    assert sorted(os.path.basename(path) for path in written) == [f'forecast_total_s{i}.png' for i in range(3)]
+    assert render_charts(df, str(tmp_path), lines, max_workers=1) == []
+
+    df.loc[df['unique_id'] == 'total/s1', 'y'] += 1
+    assert [os.path.basename(path) for path in render_charts(df, str(tmp_path), lines, max_workers=1)] == ['forecast_total_s1.png']
+
+
+def test_pdf_mode_writes_small_multiples(tmp_path):
+    written = render_charts(_frame(5), str(tmp_path), {'y': 'Actual'}, mode='pdf', grid=(2, 1), pages_per_file=2, max_workers=1)
+    assert [os.path.basename(path) for path in written] == ['charts_0000.pdf', 'charts_0001.pdf']
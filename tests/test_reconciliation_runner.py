@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+from more_examples.fake_client import FakeNixtlaClient
+from more_examples.Hierarchical_forecasting.hierarchy_builder import build_hierarchy
+from more_examples.Hierarchical_forecasting.reconciliation_runner import (
+    ReconciliationRunner, _reconcile_method, _write_shared_inputs, to_sparse_summing_matrix,
+)
+from more_examples.Hierarchical_forecasting.utils import split_fitted_and_forecast
+
+
+@pytest.fixture
+def hierarchy():
+    rng = np.random.default_rng(0)
+    stores = [('north', 'a'), ('north', 'b'), ('south', 'c')]
+    dates = pd.date_range('2022-01-31', periods=24, freq='ME')
+    bottom = pd.DataFrame({
+        'region': np.repeat([region for region, _ in stores], len(dates)),
+        'store': np.repeat([store for _, store in stores], len(dates)),
+        'ds': np.tile(dates, len(stores)),
+        'y': rng.random(len(stores) * len(dates)) + 1,
+    })
+    Y_df, S_df, tags = build_hierarchy(bottom, ['region', 'store'])
+    fcst = FakeNixtlaClient().forecast(df=Y_df, h=2, freq='ME', add_history=True)
+    return fcst, Y_df, S_df, tags
+
+
+def test_runner_reconciles_every_method(hierarchy, tmp_path):
+    fcst, Y_df, S_df, tags = hierarchy
+    runner = ReconciliationRunner(['BottomUp', 'BottomUpSparse'], max_workers=1, cache_dir=str(tmp_path))
+    Y_rec_df = runner.run(fcst, Y_df, S_df, tags)
+    np.testing.assert_allclose(Y_rec_df['TimeGPT/BottomUp'], Y_rec_df['TimeGPT/BottomUpSparse'])
+    total = Y_rec_df[Y_rec_df['unique_id'] == 'total']['TimeGPT/BottomUp'].to_numpy()
+    bottoms = Y_rec_df[Y_rec_df['unique_id'].isin(tags['region/store'])]
+    np.testing.assert_allclose(total, bottoms.groupby('ds')['TimeGPT/BottomUp'].sum().to_numpy())
+
+
+def test_sparse_methods_never_densify_s(hierarchy, tmp_path, monkeypatch):
+    from hierarchicalforecast.utils import SMatrix
+
+    fcst, Y_df, S_df, tags = hierarchy
+    Y_hat_df, Y_fit_df = split_fitted_and_forecast(fcst, Y_df)
+    matrix, row_ids, bottom_ids = to_sparse_summing_matrix(S_df)
+    _write_shared_inputs(str(tmp_path), Y_hat_df, Y_fit_df, matrix, row_ids, bottom_ids, tags)
+
+    def to_dense(self):
+        raise AssertionError('S was made dense')
+
+    monkeypatch.setattr(SMatrix, 'to_dense', to_dense)
+    output = _reconcile_method('MinTraceSparseOLS', str(tmp_path))
+    assert 'TimeGPT/MinTraceSparse_method-ols' in output.columns
+
+
+def test_smatrix_input_is_taken_as_is(hierarchy):
+    from hierarchicalforecast.utils import SMatrix
+
+    _, _, S_df, _ = hierarchy
+    matrix, row_ids, bottom_ids = to_sparse_summing_matrix(S_df)
+    again, again_rows, again_bottoms = to_sparse_summing_matrix(SMatrix(matrix, row_ids, bottom_ids))
+    assert (again != matrix).nnz == 0
+    assert list(again_rows) == list(row_ids) and list(again_bottoms) == list(bottom_ids)
@@ -0,0 +1,85 @@
+import os
+import glob
+import threading
+import numpy as np
+import pandas as pd
+from more_examples.fake_client import FakeNixtlaClient
+from more_examples.response_cache import CachedClient, ResponseCache, KEY_COLUMN
+from tests.conftest import make_panel
+
+
+def _rows(keys):
+    return pd.DataFrame({KEY_COLUMN: keys, 'value': np.arange(len(keys), dtype=float)})
+
+
+def test_second_call_is_served_from_the_cache(tmp_path):
+    fake = FakeNixtlaClient()
+    client = CachedClient(fake, ResponseCache(str(tmp_path)))
+    first = client.forecast(df=make_panel(6), h=2, freq='ME')
+    second = client.forecast(df=make_panel(6), h=2, freq='ME')
+    assert fake.calls == 1
+    pd.testing.assert_frame_equal(first.reset_index(drop=True), second.reset_index(drop=True), check_dtype=False)
+    assert client.cache.stats()['hits'] == 6
+
+
+def test_missing_segment_is_a_miss(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.put(_rows(['a', 'b']), ['a', 'b'])
+    for path in glob.glob(os.path.join(str(tmp_path), '*.arrow')):
+        os.remove(path)
+    rows, missing = cache.get(['a', 'b'])
+    assert missing == ['a', 'b'] and not len(rows)
+
+
+def test_eviction_keeps_the_cache_under_its_cap(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=1)
+    for i in range(5):
+        cache.put(_rows([f'k{i}']), [f'k{i}'])
+    assert cache.stats()['segments'] <= 1
+    assert not glob.glob(os.path.join(str(tmp_path), '*.evicted'))
+    _, missing = cache.get(['k0', 'k1'])
+    assert missing == ['k0', 'k1']
+
+
+def test_concurrent_gets_and_evictions_do_not_fail(tmp_path):
+    writer, reader = ResponseCache(str(tmp_path), max_bytes=4_000), ResponseCache(str(tmp_path), max_bytes=4_000)
+    errors = []
+
+    def write():
+        try:
+            for i in range(60):
+                writer.put(_rows([f'k{i}']), [f'k{i}'])
+        except Exception as exc:
+            errors.append(exc)
+
+    def read():
+        try:
+            for _ in range(200):
+                rows, missing = reader.get([f'k{i}' for i in range(60)])
+                assert len(rows) + len(missing) == 60
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=write), threading.Thread(target=read)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+
+
+def test_fine_tuned_calls_are_keyed_on_the_whole_panel(tmp_path):
+    fake = FakeNixtlaClient()
+    client = CachedClient(fake, ResponseCache(str(tmp_path)))
+    panel = make_panel(6)
+    subset = panel[panel['unique_id'].isin(['id_0', 'id_1'])]
+    client.forecast(df=subset, h=1, freq='ME', finetune_steps=5)
+    client.forecast(df=panel, h=1, freq='ME', finetune_steps=5)
+    assert fake.calls == 2 and fake.rows_received == len(subset) + len(panel)
+    client.forecast(df=panel, h=1, freq='ME', finetune_steps=5)
+    assert fake.calls == 2
+
+    # Without fine-tuning, series sent before are served from the cache
+    client.forecast(df=subset, h=1, freq='ME')
+    client.forecast(df=panel, h=1, freq='ME')
+    assert fake.rows_received == len(subset) + 2 * len(panel)
@@ -0,0 +1,90 @@
+import threading
+import numpy as np
+from more_examples.dispatcher import MicroBatcher
+from more_examples.fake_client import FakeNixtlaClient
+from more_examples.service import ForecastService, call_service, make_server
+from tests.conftest import make_panel
+
+
+def _concurrently(call, args):
+    results = [None] * len(args)
+
+    def run(i):
+        results[i] = call(args[i])
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(args))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_calls_are_merged_and_split_back():
+    fake = FakeNixtlaClient()
+    batcher = MicroBatcher(fake, window=0.5)
+    # Both callers use the same ids; each must get back its own last values
+    panels = [make_panel(ids=['a', 'b'], seed=None), make_panel(ids=['a', 'b'], seed=None).assign(y=lambda df: df['y'] + 100)]
+    results = _concurrently(lambda df: batcher.forecast(df=df, h=2, freq='ME'), panels)
+    assert fake.calls == 1
+    assert batcher.stats() == {'requests': 2, 'upstream_calls': 1}
+    for df, result in zip(panels, results):
+        assert result['unique_id'].tolist() == ['a', 'a', 'b', 'b']
+        expected = df.groupby('unique_id')['y'].last().repeat(2).to_numpy()
+        np.testing.assert_array_equal(result['TimeGPT'].to_numpy(), expected)
+
+
+def test_fine_tuning_calls_are_not_merged():
+    fake = FakeNixtlaClient()
+    batcher = MicroBatcher(fake, window=0.5)
+    _concurrently(lambda df: batcher.forecast(df=df, h=1, freq='ME', finetune_steps=5), [make_panel(ids=['a'], seed=None), make_panel(ids=['b'], seed=None)])
+    assert fake.calls == 2
+    assert batcher.stats() == {'requests': 2, 'upstream_calls': 2}
+
+
+class _IdColClient:
+    """Returns the last row of every series keyed by ``id_col``."""
+
+    def forecast(self, df, h, freq=None, id_col='unique_id', **kwargs):
+        return df.groupby(id_col, as_index=False).tail(1)[[id_col, 'y']]
+
+
+def test_a_custom_id_column_is_prefixed_and_restored():
+    batcher = MicroBatcher(_IdColClient(), window=0.5)
+    panels = [make_panel(ids=['a'], seed=None).rename(columns={'unique_id': 'series'}), make_panel(ids=['a'], seed=None).rename(columns={'unique_id': 'series'}).assign(y=-1.0)]
+    results = _concurrently(lambda df: batcher.forecast(df=df, h=1, freq='ME', id_col='series'), panels)
+    assert batcher.stats()['upstream_calls'] == 1
+    assert [result['series'].tolist() for result in results] == [['a'], ['a']]
+    assert [result['y'].tolist() for result in results] == [[11.0], [-1.0]]
+
+
+def test_service_answers_forecasts_of_preloaded_series_over_http():
+    fake = FakeNixtlaClient()
+    service = ForecastService(fake, datasets={'train': make_panel(ids=['a', 'b', 'c'], seed=None)}, window=0.0)
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        address = server.server_address[:2]
+        body = call_service('/forecast', {'dataset': 'train', 'unique_ids': ['b'], 'params': {'h': 3, 'freq': 'ME'}}, address=address)
+        stats = call_service('/stats', address=address)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert [row['unique_id'] for row in body['result']] == ['b'] * 3
+    assert {row['TimeGPT'] for row in body['result']} == {23.0}
+    assert fake.rows_received == 12
+    assert stats['latency']['/forecast']['count'] == 1
+
+
+def test_a_failed_batch_raises_in_every_caller():
+    batcher = MicroBatcher(FakeNixtlaClient(), window=0.5)
+    panels = [make_panel(ids=['a'], seed=None), make_panel(ids=['b'], seed=None).drop(columns='unique_id')]
+
+    def call(df):
+        try:
+            batcher.forecast(df=df, h=1, freq='ME')
+        except KeyError as exc:
+            return exc
+
+    assert all(isinstance(result, KeyError) for result in _concurrently(call, panels))
@@ -0,0 +1,50 @@
+import os
+import json
+import multiprocessing
+import numpy as np
+import pandas as pd
+import pytest
+from more_examples.config import DATASETTESTPATH, DATASETTRAINPATH
+from more_examples.launcher import launch
+from more_examples.shared_frames import SharedDatasets
+from tests.conftest import make_panel
+
+
+def _load_in_worker(datasets: SharedDatasets) -> pd.DataFrame:
+    return datasets.load('panel').copy()
+
+
+def test_datasets_round_trip_through_a_spawned_worker_as_read_only_views():
+    df = make_panel(n_rows=24).astype({'y': np.float32})
+    df['n'] = np.arange(len(df), dtype=np.int16)
+    with SharedDatasets() as datasets:
+        datasets.add('panel', df)
+        with multiprocessing.get_context('spawn').Pool(1) as pool:
+            from_worker = pool.apply(_load_in_worker, (datasets,))
+        view = datasets.load('panel')
+        with pytest.raises(ValueError):
+            view['y'].to_numpy()[0] = 1.0
+        view['extra'] = 1
+        assert datasets.nbytes == len(df) * (1 + 8 + 4 + 2)
+    for frame in (view.drop(columns='extra'), from_worker):
+        # Strings are shared as categoricals; every other column keeps its dtype
+        assert isinstance(frame['unique_id'].dtype, pd.CategoricalDtype)
+        pd.testing.assert_frame_equal(frame.astype({'unique_id': object}), df)
+    with pytest.raises(KeyError):
+        datasets.load('missing')
+
+
+def test_launcher_runs_experiments_on_the_shared_datasets(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # Anomaly detection keeps series with at least 48 points
+    df = make_panel(n_rows=60)
+    df.to_csv(DATASETTRAINPATH, index=False)
+    df.groupby('unique_id').tail(1).to_csv(DATASETTESTPATH, index=False)
+    run_dir = str(tmp_path / 'run')
+    summaries = launch(['anomaly_detection'], run_dir, cache_dir=str(tmp_path / 'cache'), fake=True,
+                       checkpoint_dir=str(tmp_path / 'checkpoints'))
+    summary = summaries['anomaly_detection']
+    assert summary['status'] == 'ok', summary.get('error')
+    assert os.path.exists(os.path.join(run_dir, 'anomaly_detection', 'anomalies.csv'))
+    with open(os.path.join(run_dir, 'summary.json')) as f:
+        assert json.load(f)['anomaly_detection']['status'] == 'ok'
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+from more_examples.preprocess_data import streaming
+from more_examples.preprocess_data.streaming import aggregate_csv_in_chunks
+
+
+def _write_raw(path, n_rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    # Mostly distinct keys, so the running aggregate keeps growing
+    df = pd.DataFrame({
+        'unique_id': rng.integers(0, n_rows // 2, n_rows).astype(str),
+        'ds': pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 30, n_rows), unit='D'),
+        'y': rng.integers(1, 10, n_rows).astype(float),
+    })
+    df.assign(ds=df['ds'].dt.strftime('%d/%m/%Y')).to_csv(path, index=False)
+    return df
+
+
+def test_matches_in_memory_groupby(tmp_path):
+    raw = _write_raw(tmp_path / 'raw.csv', 5_000)
+    result = aggregate_csv_in_chunks(str(tmp_path / 'raw.csv'), chunksize=400)
+    expected = raw.groupby(['unique_id', 'ds'], sort=True)[['y']].sum()
+    pd.testing.assert_frame_equal(result, expected, check_index_type=False)
+
+
+def test_merges_are_logarithmic_in_the_number_of_chunks(tmp_path, monkeypatch):
+    _write_raw(tmp_path / 'raw.csv', 20_000)
+    merges = []
+    original = streaming.merge_partials
+
+    def counting_merge(partials):
+        merges.append(sum(len(partial) for partial in partials))
+        return original(partials)
+
+    monkeypatch.setattr(streaming, 'merge_partials', counting_merge)
+    aggregate_csv_in_chunks(str(tmp_path / 'raw.csv'), chunksize=500)
+    # 40 chunks; merging at every chunk after the aggregate outgrows one chunk would take ~40
+    assert len(merges) <= 8
+    assert sum(merges[:-1]) < 3 * 20_000
@@ -0,0 +1,37 @@
+from more_examples.fake_client import FakeNixtlaClient
+from more_examples.fine_tune.sweep import FineTuneSweep, best_configs, rung_sizes
+from more_examples.response_cache import CachedClient, ResponseCache
+from tests.conftest import make_panel
+
+
+def test_rungs_grow_to_every_series():
+    assert rung_sizes(900, 9, eta=3, min_series=10) == [100, 300, 900]
+    assert rung_sizes(20, 9, eta=3, min_series=10) == [10, 10, 20]
+
+
+def test_no_fine_tuning_is_a_single_config(tmp_path):
+    sweep = FineTuneSweep(FakeNixtlaClient(), str(tmp_path), finetune_steps=(0, 5), finetune_losses=('mae', 'mse'))
+    assert sweep.configs == [(0, 'default'), (5, 'mae'), (5, 'mse')]
+
+
+def test_sweep_prunes_and_resumes(tmp_path):
+    fake = FakeNixtlaClient()
+    client = CachedClient(fake, ResponseCache(str(tmp_path / 'cache')))
+    kwargs = dict(finetune_steps=(0, 5), finetune_losses=('mae', 'mse'), eta=3, min_series=10, max_workers=2, freq='ME')
+    results = FineTuneSweep(client, str(tmp_path / 'sweep'), **kwargs).run(make_panel(30))
+    assert results.groupby('rung')['n_series'].first().tolist() == [10, 30]
+    assert len(results[results['rung'] == 1]) == 1
+    assert len(best_configs(results)) == 1
+
+    calls = fake.calls
+    again = FineTuneSweep(client, str(tmp_path / 'sweep'), **kwargs).run(make_panel(30))
+    assert again['resumed'].all() and fake.calls == calls
+
+
+def test_fine_tuned_survivors_are_sent_every_series_of_their_rung(tmp_path):
+    fake = FakeNixtlaClient()
+    client = CachedClient(fake, ResponseCache(str(tmp_path / 'cache')))
+    FineTuneSweep(client, str(tmp_path / 'sweep'), finetune_steps=(5,), finetune_losses=('default', 'mae', 'mse'),
+                  eta=3, min_series=10, max_workers=1, freq='ME').run(make_panel(30))
+    # Rung 0: three configs on 10 series; rung 1: the survivor on all 30, none served from rung 0
+    assert fake.rows_received == 3 * 10 * 11 + 30 * 11
@@ -0,0 +1,52 @@
+import json
+import threading
+from more_examples.dispatcher import BatchedDispatcher
+from more_examples.fake_client import FakeNixtlaClient
+from more_examples.tracing import Tracer
+from tests.conftest import make_panel
+
+
+def _records(tracer: Tracer) -> dict:
+    with open(tracer.path) as f:
+        return {record['stage']: record for record in map(json.loads, f)}
+
+
+def test_calls_count_for_the_calling_threads_stage_only(tmp_path):
+    tracer = Tracer('test', trace_dir=str(tmp_path))
+    client = tracer.client(FakeNixtlaClient(latency=0.05))
+    both_open = threading.Barrier(2)
+
+    def run(name: str, n_calls: int) -> None:
+        with tracer.stage(name):
+            both_open.wait()
+            for _ in range(n_calls):
+                client.forecast(df=make_panel(4, 10, seed=None), h=1, freq='ME')
+
+    threads = [threading.Thread(target=run, args=('one', 1)), threading.Thread(target=run, args=('three', 3))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    records = _records(tracer)
+    assert records['one']['api_calls'] == 1 and records['three']['api_calls'] == 3
+
+
+def test_calls_from_executor_threads_count_for_the_enclosing_stages(tmp_path):
+    tracer = Tracer('test', trace_dir=str(tmp_path))
+    client = BatchedDispatcher(tracer.client(FakeNixtlaClient()), max_rows_per_batch=10, max_workers=2)
+    with tracer.stage('outer'):
+        with tracer.stage('inner'):
+            client.forecast(df=make_panel(4, 10, seed=None), h=1, freq='ME')
+        client.forecast(df=make_panel(1, 10, seed=None), h=1, freq='ME')
+    records = _records(tracer)
+    assert records['inner']['api_calls'] == 4
+    assert records['outer']['api_calls'] == 5
+
+
+def test_disabled_tracer_leaves_the_client_unchanged(monkeypatch):
+    monkeypatch.delenv('TIMEGPT_TRACE_DIR', raising=False)
+    client = FakeNixtlaClient()
+    tracer = Tracer('test')
+    assert tracer.client(client) is client
+    with tracer.stage('noop') as stage:
+        stage.rows_out = 3